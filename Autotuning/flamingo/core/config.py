@@ -41,7 +41,8 @@ class FlamingoConfig:
             # Create modern config object
             return cls(
                 variables=variables,
-                variable_values=settings['possValues'],
+                # Copied, as the settings' possible values are read-only
+                variable_values={var: list(values) for var, values in settings['possValues'].items()},
                 test_command=settings.get('test', ''),
                 compile_command=settings.get('compile', ''),
                 clean_command=settings.get('clean', ''),
@@ -6,9 +6,13 @@ This module manages the loading, unloading, and lifecycle of plugins.
 
 import importlib
 import importlib.util
+import os
+import stat as _stat
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Type, Union
+from typing import Dict, Iterator, List, Any, Optional, Set, Type, Union
 import logging
 from dataclasses import dataclass, field
 import json
@@ -30,7 +34,36 @@ from .loader import PluginLoader
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# Directories never searched for plugins (caches, VCS metadata, virtualenvs)
+_SKIP_DIRS = frozenset({'__pycache__', '.git', '.hg', '.tox', 'node_modules', '.venv', 'venv'})
+
+
+def _scan_py_files(path: str) -> Iterator[Path]:
+    """
+    Recursively yield ``.py`` files below a directory.
+    
+    Uses os.scandir so file type checks come from cached directory entries,
+    and prunes hidden directories and those in ``_SKIP_DIRS``.
+    
+    Args:
+        path: Directory to scan
+        
+    Yields:
+        Paths of Python source files
+    """
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIP_DIRS and not entry.name.startswith('.'):
+                        yield from _scan_py_files(entry.path)
+                elif entry.name.endswith('.py') and entry.is_file():
+                    yield Path(entry.path)
+    except OSError as e:
+        logger.debug(f"Skipping unreadable plugin directory {path}: {e}")
+
+
+@dataclass(slots=True)
 class PluginInfo:
     """Information about a loaded plugin."""
     name: str
@@ -71,6 +104,7 @@ class PluginManager:
         # Track loaded plugins
         self._loaded_plugins: Dict[str, PluginInfo] = {}
         self._plugin_instances: Dict[str, Any] = {}
+        self._pluggy_registered: Set[str] = set()
         
         # Plugin type mappings
         self._plugin_types = {
@@ -83,50 +117,72 @@ class PluginManager:
     
     def _get_default_plugin_dirs(self) -> List[Path]:
         """Get default plugin directories."""
+        candidates = [
+            # Built-in plugins directory
+            Path(__file__).parent / "builtin",
+            # User plugins directory
+            Path.home() / ".flamingo" / "plugins",
+            # System plugins directory
+            Path("/usr/local/share/flamingo/plugins"),
+        ]
+        
         dirs = []
+        for candidate in candidates:
+            # One stat per candidate rather than exists() followed by later checks
+            try:
+                st = candidate.stat()
+            except OSError:
+                continue
+            if _stat.S_ISDIR(st.st_mode):
+                dirs.append(candidate)
+        
+        return dirs
+    
+    def _walk_dir(self, plugin_dir: Path) -> List[Path]:
+        """
+        Collect plugin files from a single plugin directory.
+        
+        Args:
+            plugin_dir: Directory to search
+            
+        Returns:
+            List of plugin file paths found in the directory
+        """
+        plugin_files = []
         
-        # Built-in plugins directory
-        builtin_dir = Path(__file__).parent / "builtin"
-        if builtin_dir.exists():
-            dirs.append(builtin_dir)
+        if not plugin_dir.exists():
+            return plugin_files
         
-        # User plugins directory
-        user_dir = Path.home() / ".flamingo" / "plugins"
-        if user_dir.exists():
-            dirs.append(user_dir)
+        # Look for Python files
+        for py_file in _scan_py_files(str(plugin_dir)):
+            if py_file.name.startswith("__"):
+                continue
+            plugin_files.append(py_file)
         
-        # System plugins directory
-        system_dir = Path("/usr/local/share/flamingo/plugins")
-        if system_dir.exists():
-            dirs.append(system_dir)
+        # Look for plugin packages
+        for pkg_dir in plugin_dir.iterdir():
+            if pkg_dir.is_dir() and (pkg_dir / "__init__.py").exists():
+                plugin_files.append(pkg_dir / "__init__.py")
         
-        return dirs
+        return plugin_files
     
     def discover_plugins(self) -> List[Path]:
         """
         Discover all available plugins in the plugin directories.
         
+        Directories are walked concurrently since they share no state; the
+        result keeps the order of ``self.plugin_dirs``. Importing the
+        discovered files stays serial in ``load_plugins``.
+        
         Returns:
             List of plugin file paths
         """
-        plugin_files = []
+        if not self.plugin_dirs:
+            return []
         
-        for plugin_dir in self.plugin_dirs:
-            if not plugin_dir.exists():
-                continue
-            
-            # Look for Python files
-            for py_file in plugin_dir.rglob("*.py"):
-                if py_file.name.startswith("__"):
-                    continue
-                plugin_files.append(py_file)
-            
-            # Look for plugin packages
-            for pkg_dir in plugin_dir.iterdir():
-                if pkg_dir.is_dir() and (pkg_dir / "__init__.py").exists():
-                    plugin_files.append(pkg_dir / "__init__.py")
-        
-        return plugin_files
+        with ThreadPoolExecutor(max_workers=min(8, len(self.plugin_dirs))) as executor:
+            results = executor.map(self._walk_dir, self.plugin_dirs)
+            return list(chain.from_iterable(results))
     
     def load_plugins(self, plugin_names: Optional[List[str]] = None) -> None:
         """
@@ -146,9 +202,11 @@ class PluginManager:
                 
                 self._loaded_plugins[plugin_info.name] = plugin_info
                 
-                # Register with pluggy if it's a hookimpl
+                # Register with pluggy if it's a hookimpl; unload_plugin checks
+                # _pluggy_registered rather than looking for the hookimpls again
                 if hasattr(plugin_info.instance, '__pluggy_hookimpls__'):
                     self.pm.register(plugin_info.instance, name=plugin_info.name)
+                    self._pluggy_registered.add(plugin_info.name)
                 
                 logger.info(f"Loaded plugin: {plugin_info.name} v{plugin_info.version}")
                 
@@ -177,8 +235,9 @@ class PluginManager:
                 plugin_info.instance.cleanup()
             
             # Unregister from pluggy
-            if hasattr(plugin_info.instance, '__pluggy_hookimpls__'):
+            if plugin_name in self._pluggy_registered:
                 self.pm.unregister(plugin_info.instance)
+                self._pluggy_registered.discard(plugin_name)
             
             # Remove from loaded plugins
             del self._loaded_plugins[plugin_name]
@@ -314,8 +373,10 @@ class PluginManager:
             
             source_path = Path(plugin_source)
             
-            # Validate source exists
-            if not source_path.exists():
+            # Validate source exists (single stat covers the type checks below)
+            try:
+                st = source_path.stat()
+            except FileNotFoundError:
                 logger.error(f"Plugin source not found: {source_path}")
                 return False
             
@@ -324,14 +385,14 @@ class PluginManager:
             install_dir.mkdir(parents=True, exist_ok=True)
             
             # Handle different source types
-            if source_path.is_file():
+            if _stat.S_ISREG(st.st_mode):
                 # Single file plugin
                 target_path = install_dir / source_path.name
                 import shutil
                 shutil.copy2(source_path, target_path)
                 logger.info(f"Installed plugin file: {target_path}")
                 
-            elif source_path.is_dir():
+            elif _stat.S_ISDIR(st.st_mode):
                 # Plugin package directory
                 target_dir = install_dir / source_path.name
                 if target_dir.exists():
@@ -393,10 +454,15 @@ class PluginManager:
             
             # Remove plugin file or directory
             import shutil
-            if plugin_path.is_file():
+            try:
+                mode = plugin_path.stat().st_mode
+            except FileNotFoundError:
+                mode = 0
+            
+            if _stat.S_ISREG(mode):
                 plugin_path.unlink()
                 logger.info(f"Removed plugin file: {plugin_path}")
-            elif plugin_path.is_dir():
+            elif _stat.S_ISDIR(mode):
                 shutil.rmtree(plugin_path)
                 logger.info(f"Removed plugin directory: {plugin_path}")
             else:
@@ -0,0 +1,111 @@
+"""
+Tests for the evaluators in tuner/evaluator.py, tuner/evaluator_parallel.py
+and tuner/evaluator_batch.py.
+"""
+
+import pytest
+
+from tuner import output
+from tuner import tune_conf
+from tuner.evaluator import Evaluator
+from tuner.evaluator_batch import BatchEvaluator
+from tuner.evaluator_parallel import ParallelEvaluator
+from tuner.output import WriteNull
+
+
+@pytest.fixture(autouse=True)
+def quiet_output():
+    """Discard the evaluators' progress output, restoring the writers afterwards."""
+    saved = output.get_current_writers()
+    output.output_custom(short_writer=WriteNull(), full_writer=WriteNull())
+    yield
+    output.state.short, output.state.full, output.state.all = saved
+    output._bind_writes()
+
+
+def echo_score(test_id, valuation):
+    """A test command whose score is A + B."""
+    return f"echo {int(valuation['A']) + int(valuation['B'])}"
+
+
+def make_evaluator(cls, compile_mkStr=None, **kwargs):
+    """An evaluator using a custom figure-of-merit from echo_score."""
+    return cls(compile_mkStr, echo_score, True, None, 1, min, **kwargs)
+
+
+VALUATIONS = [{'A': "1", 'B': "1"}, {'A': "2", 'B': "1"}, {'A': "1", 'B': "3"}]
+
+
+def test_parallel_evaluator_instantiates():
+    """ParallelEvaluator is an Evaluator with its own number of jobs."""
+    evaluator = make_evaluator(ParallelEvaluator, jobs=3)
+
+    assert isinstance(evaluator, Evaluator)
+    assert evaluator.jobs == 3
+    assert evaluator.testNum == 0
+
+
+@pytest.mark.parametrize('cls', [Evaluator, ParallelEvaluator])
+def test_evaluate_scores_each_valuation_once(cls, tmp_path):
+    """Each new valuation is compiled and scored once, in order."""
+    compiled = tmp_path / "compiled"
+    evaluator = make_evaluator(cls, lambda i, v: f"echo {i} >> {compiled}")
+
+    evaluator.evaluate(VALUATIONS + VALUATIONS[:1])
+
+    assert [evaluator.score(v) for v in VALUATIONS] == [2.0, 3.0, 4.0]
+    assert sorted(compiled.read_text().split()) == ["1", "2", "3"]
+    assert evaluator.testNum == 3
+    assert evaluator.testsRun == 3
+    assert evaluator.failures == []
+
+
+@pytest.mark.parametrize('cls', [Evaluator, ParallelEvaluator])
+def test_evaluate_records_failed_compilations(cls):
+    """A test which fails to compile is not run and is reported as a failure."""
+    evaluator = make_evaluator(cls, lambda i, v: "false" if v['A'] == "2" else "true")
+
+    evaluator.evaluate(VALUATIONS)
+
+    assert evaluator.score(VALUATIONS[1]) is None
+    assert evaluator.score(VALUATIONS[2]) == 4.0
+    assert evaluator.failures == [("COMPILATION OF TEST 2 FAILED.", VALUATIONS[1])]
+
+
+@pytest.mark.parametrize('cls', [Evaluator, ParallelEvaluator])
+def test_seeded_scores_are_not_numbered_or_logged(cls):
+    """Scores known from earlier runs are used without running, numbering or logging them."""
+
+    class RecordingLog:
+        def __init__(self):
+            self.tests = []
+
+        def writeTest(self, t):
+            self.tests.append(t.testId)
+
+    log_writer = RecordingLog()
+    evaluator = make_evaluator(cls, log_writer=log_writer)
+    evaluator.seed([(VALUATIONS[0], 7.0)])
+
+    evaluator.evaluate(VALUATIONS)
+
+    assert evaluator.score(VALUATIONS[0]) == 7.0
+    assert evaluator.score(VALUATIONS[1]) == 3.0
+    assert sorted(evaluator.log) == [1, 2]
+    assert log_writer.tests == [1, 2]
+    assert evaluator.testsRun == 2
+
+
+@pytest.mark.parametrize('cls', [Evaluator, ParallelEvaluator, BatchEvaluator])
+def test_commands_get_string_values(cls, tmp_path):
+    """Valuations which are not strings are converted before building the commands."""
+    compiled = tmp_path / "compiled"
+    compile_mkStr = tune_conf._create_command_function(
+        f"echo %A% %B% >> {compiled}", 'compile', ('A', 'B'))
+    test_mkStr = tune_conf._create_command_function("expr %A% + %B%", 'test', ('A', 'B'))
+    evaluator = cls(compile_mkStr, test_mkStr, True, None, 1, min)
+
+    evaluator.evaluate([{'A': 16, 'B': 2}])
+
+    assert evaluator.score({'A': 16, 'B': 2}) == 18.0
+    assert compiled.read_text() == "16 2\n"
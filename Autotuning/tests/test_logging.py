@@ -0,0 +1,50 @@
+"""
+Tests for the CSV test log in tuner/logging.py.
+"""
+
+from pathlib import Path
+
+from tuner.evaluator import SingleTest
+from tuner.logging import CSVLogWriter
+
+
+def make_test(test_id, valuation, results, overall):
+    """A SingleTest as the Evaluator logs it."""
+    t = SingleTest(test_id, valuation)
+    t.results = results
+    t.overall = overall
+    return t
+
+
+def test_csv_log_rows_match_header(tmp_path: Path):
+    """Each row, scored or failed, has one column per title."""
+    path = tmp_path / "log.csv"
+    writer = CSVLogWriter(path, ['A', 'B'], 2)
+    writer.writeTest(make_test(1, {'A': "1", 'B': "x"}, [0.5, 0.7], 0.6))
+
+    failed = make_test(2, {'A': "2", 'B': "x"}, [], None)
+    assert writer.close({2: failed})
+
+    assert path.read_text().splitlines() == [
+        "TestNo,A,B,Score_1,Score_2,Score_Overall",
+        "1,1,x,0.5,0.7,0.6",
+        "2,2,x,,,",
+    ]
+
+
+def test_csv_log_writes_each_test_once(tmp_path: Path):
+    """Tests already written are skipped by close(), and reset() starts again."""
+    path = tmp_path / "log.csv"
+    writer = CSVLogWriter(path, ['A'], 1)
+    first = make_test(1, {'A': "1"}, [2.0], 2.0)
+    writer.writeTest(first)
+    writer.writeTest(first)
+
+    writer.reset()
+    second = make_test(1, {'A': "3"}, [4.0], 4.0)
+    assert writer.close({1: second})
+
+    assert path.read_text().splitlines() == [
+        "TestNo,A,Score_1,Score_Overall",
+        "1,3,4.0,4.0",
+    ]
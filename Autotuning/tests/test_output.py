@@ -0,0 +1,456 @@
+"""
+Tests for the output writers in tuner/output.py.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+from tuner import output
+from tuner.output import (AsyncWriter, FileWriter, RawFileWriter, RawStdoutWriter,
+                          TeeFileStdout, WriteMult, WriteNull)
+
+
+class RecordingWriter:
+    """A Python-level writer which records each write() call."""
+
+    def __init__(self, tty: bool = False) -> None:
+        self.writes = []
+        self.flushes = 0
+        self.closed = False
+        self._tty = tty
+
+    def write(self, data: str) -> None:
+        self.writes.append(data)
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+    def isatty(self) -> bool:
+        return self._tty
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.writes)
+
+
+@pytest.fixture(autouse=True)
+def restore_output():
+    """Put the module-level writers back after each test."""
+    saved = output.get_current_writers()
+    yield
+    output.state.short, output.state.full, output.state.all = saved
+    output._bind_writes()
+
+
+def test_file_writer_buffers_until_flush(tmp_path: Path):
+    """Small writes stay in FileWriter's buffer until it is flushed."""
+    path = tmp_path / "log.txt"
+    writer = FileWriter(path, buffer_size=1024)
+
+    writer.write("Test 1:\n")
+    assert path.read_bytes() == b""
+
+    writer.flush()
+    assert path.read_text() == "Test 1:\n"
+    writer.close()
+
+
+def test_file_writer_writes_out_full_buffer(tmp_path: Path):
+    """Writing more than the buffer size reaches the file without a flush."""
+    path = tmp_path / "log.txt"
+    writer = FileWriter(path, buffer_size=16)
+
+    writer.write("x" * 40)
+    assert path.stat().st_size == 40
+    writer.close()
+
+
+def test_file_writer_encodes_utf8(tmp_path: Path):
+    """Text is written as UTF-8, including repeated short strings."""
+    path = tmp_path / "log.txt"
+    with FileWriter(path) as writer:
+        writer.writelines(["│ ", "a", "│ ", "b\n"])
+        writer.write("é" * 100)
+
+    assert path.read_text(encoding='utf-8') == "│ a│ b\n" + "é" * 100
+
+
+def test_file_writer_binary_mode(tmp_path: Path):
+    """In binary modes bytes are written unchanged."""
+    path = tmp_path / "log.bin"
+    with FileWriter(path, 'wb') as writer:
+        writer.write(b"\x00\x01")
+
+    assert path.read_bytes() == b"\x00\x01"
+
+
+def test_file_writer_rejects_writes_after_close(tmp_path: Path):
+    """A closed FileWriter raises on write and ignores flush and close."""
+    writer = FileWriter(tmp_path / "log.txt")
+    writer.close()
+
+    with pytest.raises(RuntimeError):
+        writer.write("late\n")
+    writer.flush()
+    writer.close()
+
+
+def test_file_writer_reports_unopenable_file(tmp_path: Path):
+    """Failing to open the file raises OSError naming the file."""
+    with pytest.raises(OSError, match="missing"):
+        FileWriter(tmp_path / "missing" / "log.txt")
+
+
+def test_write_mult_buffers_until_threshold():
+    """Writes are passed on together once the threshold is reached."""
+    first, second = RecordingWriter(), RecordingWriter()
+    mult = WriteMult(first, second, threshold=10)
+
+    mult.write("abc\n")
+    mult.write("def")
+    assert first.writes == []
+
+    mult.write("ghij")
+    assert first.writes == ["abc\ndefghij"]
+    assert second.writes == ["abc\ndefghij"]
+
+
+def test_write_mult_line_buffered_for_terminals():
+    """Output to a terminal is passed on at the end of each line."""
+    terminal = RecordingWriter(tty=True)
+    mult = WriteMult(terminal)
+
+    assert mult.line_buffered
+    mult.write("Test 1: ")
+    assert terminal.writes == []
+    mult.write("Done.\n")
+    assert terminal.writes == ["Test 1: Done.\n"]
+
+
+def test_write_mult_not_line_buffered_otherwise():
+    """Without a terminal, a newline alone does not pass the data on."""
+    writer = RecordingWriter()
+    mult = WriteMult(writer)
+
+    assert not mult.line_buffered
+    mult.write("Done.\n")
+    assert writer.writes == []
+
+    mult.flush()
+    assert writer.writes == ["Done.\n"]
+    assert writer.flushes == 1
+
+
+def test_write_mult_unbuffered():
+    """A threshold of 0 passes every write on immediately."""
+    writer = RecordingWriter()
+    mult = WriteMult(writer, threshold=0)
+
+    mult.write("a")
+    mult.writelines(["b", "c"])
+    mult.write_any(4)
+    assert writer.writes == ["a", "bc", "4"]
+
+
+def test_write_mult_rejects_unwritable_objects():
+    """Objects without write() are refused up front."""
+    with pytest.raises(TypeError, match="not writable"):
+        WriteMult(RecordingWriter(), object())
+
+
+def test_write_mult_tolerates_failing_writer():
+    """A failing writer is skipped and the others still receive the data."""
+
+    class Failing(RecordingWriter):
+        def write(self, data: str) -> None:
+            raise OSError("disk full")
+
+    after = RecordingWriter()
+    mult = WriteMult(Failing(), after, threshold=0)
+
+    mult.write("data")
+    assert after.writes == ["data"]
+
+    strict = WriteMult(Failing(), threshold=0, tolerate_errors=False)
+    with pytest.raises(OSError):
+        strict.write("data")
+
+
+def test_write_mult_writes_descriptor_backed_writers(tmp_path: Path):
+    """Writers with a UTF-8 file descriptor receive the encoded data directly."""
+    path = tmp_path / "out.txt"
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("before\n")
+        mult = WriteMult(f, threshold=4)
+        mult.write("│ ab")
+        mult.write("cd\n")
+        mult.flush()
+
+    assert path.read_text(encoding='utf-8') == "before\n│ abcd\n"
+
+
+def test_write_mult_close_only_closes_owned_writers():
+    """close() flushes borrowed writers and closes owned ones."""
+    borrowed, owned = RecordingWriter(), RecordingWriter()
+
+    WriteMult(borrowed).close()
+    WriteMult(owned, own=True).close()
+
+    assert not borrowed.closed and borrowed.flushes == 1
+    assert owned.closed
+
+
+def test_write_null_discards_everything():
+    """WriteNull accepts any writes and does nothing."""
+    null = WriteNull()
+    null.write("ignored")
+    null.writelines(["a", "b"])
+    null.flush()
+    null.close()
+
+
+def test_raw_stdout_writer_writes_to_binary_buffer():
+    """RawStdoutWriter encodes into the stream's binary buffer."""
+    stream = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+    stream.write("pending ")
+    writer = RawStdoutWriter(stream)
+
+    writer.writelines(["│", " line\n"])
+    writer.flush()
+
+    assert stream.buffer.getvalue() == "pending │ line\n".encode('utf-8')
+
+
+def test_tee_file_stdout_copies_to_stream(tmp_path: Path):
+    """Tee'd output goes to both the log and the stream; file_only only to the log."""
+    path = tmp_path / "script.txt"
+    out_path = tmp_path / "stdout.txt"
+    with open(out_path, 'w', encoding='utf-8') as stream:
+        tee = TeeFileStdout(path, stream=stream)
+        tee.file_only.write("Test 1:\n")
+        tee.write("Result │ 1\n")
+        tee.file_only.write("detail\n")
+        tee.flush()
+        tee.close()
+
+    assert path.read_text(encoding='utf-8') == "Test 1:\nResult │ 1\ndetail\n"
+    assert out_path.read_text(encoding='utf-8') == "Result │ 1\n"
+
+
+def test_tee_file_stdout_without_descriptor(tmp_path: Path):
+    """Streams without a file descriptor receive the text via write()."""
+    path = tmp_path / "script.txt"
+    stream = RecordingWriter()
+    tee = TeeFileStdout(path, stream=stream)
+
+    tee.write("shown\n")
+    tee.close()
+
+    assert stream.text == "shown\n"
+    assert path.read_text() == "shown\n"
+
+
+def test_tee_file_stdout_batches_copies(tmp_path: Path):
+    """Stdout output is sent in order on flush() or at the threshold, not on each write."""
+    path = tmp_path / "script.txt"
+    out_path = tmp_path / "stdout.txt"
+    with open(out_path, 'w', encoding='utf-8') as stream:
+        tee = TeeFileStdout(path, stream=stream, threshold=32, line_buffered=False)
+        tee.screen_only.write("Test 1: ")
+        tee.write("one\n")
+        tee.file_only.write("detail\n")
+        tee.write("two\n")
+        assert out_path.read_text() == ""
+
+        tee.flush()
+        assert out_path.read_text(encoding='utf-8') == "Test 1: one\ntwo\n"
+
+        tee.write("x" * 40)
+        assert out_path.read_text(encoding='utf-8') == "Test 1: one\ntwo\n" + "x" * 40
+        tee.close()
+
+    assert path.read_text(encoding='utf-8') == "one\ndetail\ntwo\n" + "x" * 40
+
+
+def test_tee_file_stdout_line_buffered(tmp_path: Path):
+    """When line buffered, each complete line is sent straight away."""
+    path = tmp_path / "script.txt"
+    stream = RecordingWriter()
+    tee = TeeFileStdout(path, stream=stream, line_buffered=True)
+
+    tee.write("partial ")
+    assert stream.text == ""
+    tee.write("line\n")
+    assert stream.text == "partial line\n"
+    tee.close()
+
+
+@pytest.mark.parametrize('make', [
+    lambda path, size: FileWriter(path, expected_bytes=size),
+    lambda path, size: TeeFileStdout(path, stream=RecordingWriter(), expected_bytes=size),
+])
+def test_expected_bytes_preallocates_log(tmp_path: Path, make):
+    """The expected size is reserved while writing, and the unused part dropped on close."""
+    path = tmp_path / "log.txt"
+    writer = make(path, 4096)
+    if writer._preallocated:
+        assert path.stat().st_size == 4096
+
+    writer.write("Test 1:\n")
+    writer.flush()
+    writer.close()
+
+    assert path.read_bytes() == b"Test 1:\n"
+
+
+def test_write_functions_follow_current_writers():
+    """write_full and friends are rebound whenever the output is configured."""
+    short, full = RecordingWriter(), RecordingWriter()
+    output.output_custom(short_writer=short, full_writer=full)
+
+    output.write_short("s")
+    output.write_full("f")
+    output.write_all("a")
+
+    assert short.writes == ["s"]
+    assert full.writes == ["f", "a"]
+    assert output.full is full
+
+
+def test_output_context_restores_writers(tmp_path: Path):
+    """output_context closes its log and restores the previous writers."""
+    full = RecordingWriter()
+    output.output_custom(full_writer=full)
+
+    log = tmp_path / "log.txt"
+    with output.output_context('verbose', log):
+        output.write_full("logged\n")
+
+    assert output.state.full is full
+    assert log.read_text() == "logged\n"
+
+
+def test_output_verbose_keeps_stdout_in_order(tmp_path: Path, monkeypatch):
+    """Verbose output reaches stdout in order with direct writes to stdout."""
+    log = tmp_path / "log.txt"
+    out_path = tmp_path / "stdout.txt"
+    with open(out_path, 'w', encoding='utf-8') as stream:
+        monkeypatch.setattr(sys, 'stdout', stream)
+        assert output.output_verbose(log)
+
+        output.write_full("Test 1:\n")
+        stream.write("direct\n")
+        output.write_full("Done.\n")
+        output._close_outputs()
+
+    assert out_path.read_text() == "Test 1:\ndirect\nDone.\n"
+    assert log.read_text() == "Test 1:\nDone.\n"
+
+
+def test_output_production_writes_all_to_log_only(tmp_path: Path, monkeypatch):
+    """In production mode short output goes to stdout and everything else to the log."""
+    log = tmp_path / "log.txt"
+    stdout = RecordingWriter()
+    monkeypatch.setattr(sys, 'stdout', stdout)
+    assert output.output_production(log)
+
+    output.write_short("Test 1: Done.\n")
+    output.write_full("details\n")
+    output.write_all("result\n")
+    output._close_outputs()
+
+    assert stdout.text == "Test 1: Done.\n"
+    assert log.read_text() == "details\nresult\n"
+
+
+def test_output_production_tee_shows_all_on_screen(tmp_path: Path, monkeypatch):
+    """The tee mode used by the tuner shows `all` output on stdout as well."""
+    log = tmp_path / "script.txt"
+    stdout = RecordingWriter()
+    monkeypatch.setattr(sys, 'stdout', stdout)
+    assert output.output_production_tee(log)
+
+    output.write_short("Test 1: Done.\n")
+    output.write_full("details\n")
+    output.write_all("result\n")
+    output._close_outputs()
+
+    assert stdout.text == "Test 1: Done.\nresult\n"
+    assert log.read_text() == "details\nresult\n"
+
+
+def test_async_writer_batches_writes():
+    """Queued writes reach the downstream writer in order, and flush() waits for them."""
+    downstream = RecordingWriter()
+    writer = AsyncWriter(downstream, batch_size=2)
+
+    writer.write("a")
+    writer.writelines(["b", "c"])
+    writer.write("d")
+    writer.flush()
+    assert downstream.text == "abcd"
+    assert downstream.flushes >= 1
+
+    writer.write("e")
+    writer.close()
+    assert downstream.text == "abcde"
+    assert downstream.closed
+    with pytest.raises(RuntimeError):
+        writer.write("f")
+
+
+def test_raw_file_writer_buffers_bytes(tmp_path: Path):
+    """RawFileWriter writes once its buffer is full, and appends in 'a' mode."""
+    path = tmp_path / "log.txt"
+    writer = RawFileWriter(path, buffer_size=12)
+
+    writer.write("abc │ ")
+    assert path.read_bytes() == b""
+    writer.writelines(["de", "f\n"])
+    assert path.read_text(encoding='utf-8') == "abc │ def\n"
+    writer.write("more\n")
+    writer.close()
+    writer.close()
+
+    with RawFileWriter(path, 'a') as writer:
+        writer.write("appended\n")
+    assert path.read_text(encoding='utf-8') == "abc │ def\nmore\nappended\n"
+    with pytest.raises(RuntimeError):
+        writer.write("closed")
+
+
+@pytest.mark.parametrize('mode', ['production', 'production_tee', 'verbose'])
+@pytest.mark.parametrize('raw_io, async_io', [(True, False), (False, True), (True, True)])
+def test_output_modes_with_log_options(tmp_path: Path, monkeypatch, mode, raw_io, async_io):
+    """With raw_io or async_io the log has its own writer, with the same result."""
+    log = tmp_path / "log.txt"
+    stdout = RecordingWriter()
+    monkeypatch.setattr(sys, 'stdout', stdout)
+    assert getattr(output, f"output_{mode}")(log, raw_io=raw_io, async_io=async_io)
+
+    output.write_short("Test 1: Done.\n")
+    output.write_full("details\n")
+    output.write_all("result\n")
+    output._close_outputs()
+
+    assert log.read_text() == "details\nresult\n"
+    assert stdout.text == {
+        'production': "Test 1: Done.\n",
+        'production_tee': "Test 1: Done.\nresult\n",
+        'verbose': "details\nresult\n",
+    }[mode]
+
+
+def test_output_production_reports_unopenable_log(tmp_path: Path):
+    """A log which cannot be opened leaves the output unchanged."""
+    before = output.get_current_writers()
+
+    assert not output.output_production(tmp_path / "missing" / "log.txt")
+    assert not output.output_production_tee(tmp_path / "missing" / "log.txt")
+    assert output.get_current_writers() == before
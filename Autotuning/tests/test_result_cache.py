@@ -0,0 +1,159 @@
+"""
+Tests for the on-disk result cache in tuner/result_cache.py.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from tuner import result_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch):
+    """Keep the cache in a temporary directory."""
+    directory = tmp_path / "cache"
+    monkeypatch.setattr(result_cache, 'CACHE_DIR', directory)
+    monkeypatch.setattr(result_cache, 'HISTORY_FILE', directory / "history.sqlite")
+    return directory
+
+
+def make_settings(**overrides):
+    """A settings dictionary with every setting the cache keys use."""
+    settings = {
+        'vartree': "{A, B}",
+        'possValues': {'A': ("1", "2"), 'B': ("x", "y")},
+        'compile': "make ID=%ID%",
+        'test': "./run",
+        'clean': None,
+        'optimal': 'min',
+        'custom_fom': False,
+        'repeat': 1,
+        'overall': 'avg',
+        'log': "log.csv",
+    }
+    settings.update(overrides)
+    return settings
+
+
+def test_scenario_key_is_stable(tmp_path: Path):
+    """The same settings in the same directory give the same key."""
+    key = result_cache.scenario_key(make_settings(), tmp_path)
+
+    assert key == result_cache.scenario_key(make_settings(), tmp_path)
+    assert key == result_cache.scenario_key(make_settings(log="other.csv"), tmp_path)
+
+
+def test_scenario_key_depends_on_scenario(tmp_path: Path):
+    """Changing the search space, commands or directory changes the key."""
+    key = result_cache.scenario_key(make_settings(), tmp_path)
+
+    assert key != result_cache.scenario_key(make_settings(test="./run2"), tmp_path)
+    assert key != result_cache.scenario_key(
+        make_settings(possValues={'A': ("1",), 'B': ("x", "y")}), tmp_path)
+    assert key != result_cache.scenario_key(make_settings(), tmp_path / "elsewhere")
+
+
+def test_scenario_key_accepts_read_only_values(tmp_path: Path):
+    """Possible values given as a read-only mapping hash like a plain dict."""
+    from types import MappingProxyType
+
+    settings = make_settings()
+    frozen = make_settings(possValues=MappingProxyType(settings['possValues']))
+
+    assert result_cache.scenario_key(frozen, tmp_path) == \
+        result_cache.scenario_key(settings, tmp_path)
+
+
+def test_save_and_load_result():
+    """A saved result is loaded back unchanged."""
+    assert result_cache.save_result("abc", {'A': "1", 'B': "y"}, 0.5, 4)
+
+    assert result_cache.load_result("abc") == {
+        'optimalValuation': {'A': "1", 'B': "y"},
+        'optimalScore': 0.5,
+        'numTests': 4,
+    }
+
+
+def test_load_result_ignores_missing_and_corrupt_files(cache_dir: Path):
+    """Missing, unreadable or incomplete cache files give no result."""
+    assert result_cache.load_result("missing") is None
+
+    cache_dir.mkdir()
+    (cache_dir / "corrupt.json").write_text("{not json")
+    (cache_dir / "partial.json").write_text('{"numTests": 3}')
+
+    assert result_cache.load_result("corrupt") is None
+    assert result_cache.load_result("partial") is None
+
+
+def test_save_result_reports_failure(cache_dir: Path):
+    """A cache directory which cannot be created is reported, not raised."""
+    cache_dir.parent.mkdir(exist_ok=True)
+    cache_dir.write_text("a file in the way")
+
+    assert not result_cache.save_result("abc", {'A': "1"}, 0.5, 1)
+
+
+def test_write_file_atomic_replaces_file(tmp_path: Path):
+    """write_file_atomic creates the directory and leaves no temporary files."""
+    path = tmp_path / "new" / "data.bin"
+    result_cache.write_file_atomic(path, b"first")
+    result_cache.write_file_atomic(path, b"second")
+
+    assert path.read_bytes() == b"second"
+    assert [p.name for p in path.parent.iterdir()] == ["data.bin"]
+
+
+def test_history_key_ignores_search_space(tmp_path: Path):
+    """Scenarios differing only in their search space share a history key."""
+    key = result_cache.history_key(make_settings(), tmp_path)
+
+    assert key == result_cache.history_key(
+        make_settings(vartree="{A, {B}}", possValues={'A': ("3",), 'B': ("z",)}), tmp_path)
+    assert key != result_cache.history_key(make_settings(repeat=3), tmp_path)
+
+
+def test_history_round_trip():
+    """Recorded scores are found again for the same variables and values."""
+    assert result_cache.record_history("setup", [
+        ({'A': "1", 'B': "x"}, 2.0),
+        ({'A': "2", 'B': "y"}, 1),
+    ])
+
+    points = result_cache.load_history("setup", ['A', 'B'], {'A': ("1", "2"), 'B': ("x", "y")})
+
+    assert sorted(points, key=lambda p: p[1]) == [
+        ({'A': "2", 'B': "y"}, 1.0),
+        ({'A': "1", 'B': "x"}, 2.0),
+    ]
+
+
+def test_history_replaces_older_scores():
+    """Recording a valuation again replaces its earlier score."""
+    result_cache.record_history("setup", [({'A': "1"}, 2.0)])
+    result_cache.record_history("setup", [({'A': "1"}, 3.0)])
+
+    assert result_cache.load_history("setup", ['A'], {'A': ("1",)}) == [({'A': "1"}, 3.0)]
+
+
+def test_history_only_returns_current_search_space():
+    """Scores for other setups, variables or values are left out."""
+    result_cache.record_history("setup", [
+        ({'A': "1", 'B': "x"}, 1.0),
+        ({'A': "3", 'B': "x"}, 2.0),
+        ({'A': "1"}, 3.0),
+    ])
+    result_cache.record_history("other", [({'A': "2", 'B': "y"}, 4.0)])
+
+    points = result_cache.load_history("setup", ['B', 'A'], {'A': ("1", "2"), 'B': ("x", "y")})
+
+    assert points == [({'A': "1", 'B': "x"}, 1.0)]
+
+
+def test_history_without_database():
+    """Without a history database there are no earlier scores."""
+    assert result_cache.load_history("setup", ['A'], {'A': ("1",)}) == []
+    assert result_cache.record_history("setup", [])
+    assert not result_cache.HISTORY_FILE.exists()
@@ -0,0 +1,277 @@
+"""
+Tests for the tuner's command line driver in tuner/tune.py.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import pytest
+
+from tuner import output, result_cache
+from tuner.evaluator_parallel import ParallelEvaluator
+from tuner import tune
+from tuner.tune import AutotuningSystem
+
+
+class RecordingWriter:
+    """A writer which records what is written and how often it is flushed."""
+
+    def __init__(self) -> None:
+        self.writes = []
+        self.flushes = 0
+
+    def write(self, data: str) -> None:
+        self.writes.append(data)
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.writes)
+
+
+@pytest.fixture(autouse=True)
+def restore_output():
+    """Put the module-level writers back after each test."""
+    saved = output.get_current_writers()
+    yield
+    output.state.short, output.state.full, output.state.all = saved
+    output._bind_writes()
+
+
+def make_settings(**overrides):
+    """A settings dictionary as returned by tune_conf."""
+    settings = {
+        'vartree': "{A, B}",
+        'possValues': {'A': ("1", "2"), 'B': ("x", "y")},
+        'compile': None,
+        'test': "./run",
+        'clean': None,
+        'optimal': 'min',
+        'custom_fom': False,
+        'repeat': 1,
+        'overall': 'avg',
+        'log': None,
+        'script': None,
+        'importance': None,
+    }
+    settings.update(overrides)
+    return settings
+
+
+def test_cached_result_flushes_output(tmp_path: Path, monkeypatch):
+    """A cache hit still writes out everything the output writers hold."""
+    monkeypatch.setattr(result_cache, 'CACHE_DIR', tmp_path / "cache")
+    settings = make_settings()
+    key = result_cache.scenario_key(settings, tmp_path)
+    assert result_cache.save_result(key, {'A': "2", 'B': "x"}, 1.5, 4)
+
+    stdout = RecordingWriter()
+    full = RecordingWriter()
+    monkeypatch.setattr(sys, 'stdout', stdout)
+    output.output_custom(full_writer=full)
+
+    system = AutotuningSystem()
+    system.settings = settings
+    system._opt_label = "Minimal"
+    system._run_in_working_dir(argparse.Namespace(cache=True), tmp_path)
+
+    assert "using its cached result" in stdout.text
+    assert "A = 2" in stdout.text
+    assert stdout.flushes >= 1
+    assert full.flushes == 1
+
+
+def test_parameter_importance_tests_each_variation_once(monkeypatch):
+    """Importance testing runs the optimum and each single-variable change once."""
+    from tuner import evaluator_batch
+
+    evaluated = []
+    monkeypatch.setattr(evaluator_batch.BatchEvaluator, 'evaluate',
+                        lambda self, valuations: evaluated.extend(valuations))
+    stdout = RecordingWriter()
+    full = RecordingWriter()
+    monkeypatch.setattr(sys, 'stdout', stdout)
+    output.output_custom(full_writer=full)
+
+    system = AutotuningSystem()
+    system.settings = make_settings(
+        possValues={'A': ("1", "2", "1"), 'B': ("x", "y")},
+        compile_mkStr=None, test_mkStr=None, clean_mkStr=None, aggregator=min,
+    )
+    system._vars_list = ['A', 'B']
+    system._run_parameter_importance({'A': "1", 'B': "y"})
+
+    assert evaluated == [
+        {'A': "1", 'B': "y"},
+        {'A': "2", 'B': "y"},
+        {'A': "1", 'B': "x"},
+    ]
+    assert full.writes == ["\n\n", "\n"]
+    assert stdout.text.startswith("Additional tests to check parameter importance:\n")
+
+
+CONFIG = """\
+[variables]
+variables = {{A}, {B}}
+
+[values]
+A = 3, 1, 2
+B = 5, 4
+
+[testing]
+test = expr %A% + %B%
+
+[scoring]
+optimal = min
+
+[output]
+log = log.csv
+"""
+
+
+def run_tuner(tmp_path: Path, monkeypatch, *options: str) -> str:
+    """Run the tuner on CONFIG with the given options, returning what it printed."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(result_cache, 'CACHE_DIR', cache_dir)
+    monkeypatch.setattr(result_cache, 'HISTORY_FILE', cache_dir / "history.sqlite")
+    config = tmp_path / "tune.conf"
+    config.write_text(CONFIG)
+
+    stdout = RecordingWriter()
+    monkeypatch.setattr(sys, 'stdout', stdout)
+    monkeypatch.setattr(sys, 'argv', ["tune", str(config), *options])
+    AutotuningSystem().run()
+    return stdout.text
+
+
+def test_run_finds_optimum(tmp_path: Path, monkeypatch):
+    """A run finds the optimum and writes the log, without using the cache."""
+    text = run_tuner(tmp_path, monkeypatch)
+
+    assert "Minimal valuation:\nA = 1, B = 4\nMinimal Score:\n5.0\n" in text
+    assert (tmp_path / "log.csv").read_text().startswith("TestNo,A,B,Score_1,Score_Overall\n")
+    assert not (tmp_path / "cache").exists()
+
+
+def test_run_restores_stdout_and_closes_script(tmp_path: Path, monkeypatch):
+    """After a run with a script file, stdout and the writers are the caller's again."""
+    saved = output.get_current_writers()
+    monkeypatch.setattr(sys.modules[__name__], 'CONFIG', CONFIG + "script = script.txt\n")
+    monkeypatch.chdir(tmp_path)  # The script file is opened from the current directory
+
+    text = run_tuner(tmp_path, monkeypatch)
+
+    assert isinstance(sys.stdout, RecordingWriter)
+    assert output.get_current_writers() == saved
+    script = (tmp_path / "script.txt").read_text()
+    assert "Minimal valuation:\nA = 1, B = 4\n" in script
+    assert "Minimal valuation:\nA = 1, B = 4\n" in text
+    assert "\0" not in script  # The preallocated space is not left over
+
+
+@pytest.mark.parametrize('options', [["--async-log"], ["--raw-log"], ["--raw-log", "--async-log"]])
+def test_run_with_log_options_writes_script(tmp_path: Path, monkeypatch, options):
+    """--async-log and --raw-log write the same script file with other writers."""
+    monkeypatch.setattr(sys.modules[__name__], 'CONFIG', CONFIG + "script = script.txt\n")
+    monkeypatch.chdir(tmp_path)
+
+    text = run_tuner(tmp_path, monkeypatch, *options)
+
+    script = (tmp_path / "script.txt").read_text()
+    assert "Minimal valuation:\nA = 1, B = 4\n" in script
+    assert "Minimal valuation:\nA = 1, B = 4\n" in text
+    assert not output._ASYNC_WRITERS
+
+
+def test_script_file_size_estimate():
+    """The script file is preallocated for each run of each test, up to a limit."""
+    system = AutotuningSystem()
+    assert system._expected_script_bytes() == 0
+
+    system.settings = make_settings(vartree="{{A}, {B}}", repeat=3)
+    assert system._expected_script_bytes() == 3 * 3 * tune.SCRIPT_BYTES_PER_RUN
+
+    system.settings['possValues'] = {'A': ("1",) * 10 ** 6, 'B': ("x",)}
+    assert system._expected_script_bytes() == tune.SCRIPT_PREALLOCATE_MAX
+
+
+def test_run_with_jobs_matches_serial_run(tmp_path: Path, monkeypatch):
+    """--jobs uses the ParallelEvaluator and tests the same valuations in the same order."""
+    serial = run_tuner(tmp_path, monkeypatch)
+    serial_log = (tmp_path / "log.csv").read_text()
+
+    evaluators = []
+    setup_evaluator = AutotuningSystem.setup_evaluator
+
+    def recording_setup_evaluator(self):
+        setup_evaluator(self)
+        evaluators.append(self.evaluator)
+
+    monkeypatch.setattr(AutotuningSystem, 'setup_evaluator', recording_setup_evaluator)
+    parallel = run_tuner(tmp_path, monkeypatch, "-j", "2")
+
+    assert isinstance(evaluators[0], ParallelEvaluator)
+    assert evaluators[0].jobs == 2
+    assert (tmp_path / "log.csv").read_text() == serial_log
+    assert parallel.split("Minimal valuation:")[1].split("taking")[0] == \
+        serial.split("Minimal valuation:")[1].split("taking")[0]
+
+
+def test_run_with_cache_reuses_result(tmp_path: Path, monkeypatch):
+    """--cache saves the settings and result, and a second run reuses them."""
+    first = run_tuner(tmp_path, monkeypatch, "--cache")
+    cache_dir = tmp_path / "cache"
+
+    assert "cached result" not in first
+    assert len(list(cache_dir.glob("cfg-*.pkl"))) == 1
+    assert result_cache.HISTORY_FILE.exists()
+
+    second = run_tuner(tmp_path, monkeypatch, "--cache")
+    assert "using its cached result" in second
+    assert "A = 1, B = 4" in second
+
+
+def test_jobs_must_be_positive(tmp_path: Path, monkeypatch):
+    """--jobs below 1 is rejected by the argument parser."""
+    with pytest.raises(SystemExit) as exit_info:
+        run_tuner(tmp_path, monkeypatch, "-j", "0")
+    assert exit_info.value.code == 2
+
+
+def test_settings_list_values_only_with_verbose(tmp_path: Path, monkeypatch):
+    """The tree and value lists are shown with --verbose; otherwise only the counts."""
+    quiet = run_tuner(tmp_path, monkeypatch)
+    assert "Number of possible values (use --verbose to list them):\nA = 3\nB = 2\n" in quiet
+    assert "Displayed as a tree:" not in quiet
+
+    verbose = run_tuner(tmp_path, monkeypatch, "--verbose")
+    assert "Displayed as a tree:" in verbose
+    assert "Possible values:\nA = ['3', '1', '2']\nB = ['5', '4']\n" in verbose
+    assert "Number of possible values" not in verbose
+
+
+def test_missing_config_file_is_an_argument_error(tmp_path: Path, monkeypatch, capsys):
+    """A configuration file which does not exist is reported by the argument parser."""
+    monkeypatch.setattr(sys, 'argv', ["tune", str(tmp_path / "missing.conf")])
+
+    with pytest.raises(SystemExit) as exit_info:
+        AutotuningSystem().parse_arguments()
+
+    assert exit_info.value.code == 2
+    assert "config file not found" in capsys.readouterr().err
+
+
+def test_config_file_argument_is_absolute(tmp_path: Path, monkeypatch):
+    """The configuration file is given to the tuner as an absolute path."""
+    (tmp_path / "tune.conf").write_text(CONFIG)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ["tune", "tune.conf", "-j", "3", "--cache"])
+
+    args = AutotuningSystem().parse_arguments()
+
+    assert args.config_file == tmp_path / "tune.conf"
+    assert args.config_file.is_absolute()
+    assert (args.jobs, args.cache, args.verbose) == (3, True, False)
@@ -0,0 +1,238 @@
+"""
+Tests for the configuration file reader in tuner/tune_conf.py.
+"""
+
+import pytest
+
+from tuner import tune_conf
+
+
+def test_command_function_substitutes_placeholders():
+    """%ID% and variable placeholders are replaced; unknown ones are left alone."""
+    make = tune_conf._create_command_function(
+        "make ID=%%ID%% -DA=%A% -DB=%B% %C%", 'compile', ('A', 'B'))
+
+    assert make(3, {'A': "1", 'B': "x"}) == "make ID=3 -DA=1 -DB=x %C%"
+    assert make(4, {'A': "2"}) == "make ID=4 -DA=2 -DB=%B% %C%"
+    assert make.__name__ == "compile_mkStr"
+
+
+def test_configuration_error_shows_built_message():
+    """str(), repr() and args all give the message with its values filled in."""
+    import pickle
+
+    error = tune_conf.ConfigurationError("File '{}' is missing: {}", "a.conf", ['values', 'output'])
+
+    assert str(error) == "File 'a.conf' is missing: values, output"
+    assert error.args == ("File 'a.conf' is missing: values, output",)
+    assert repr(error) == "ConfigurationError(\"File 'a.conf' is missing: values, output\")"
+    assert str(pickle.loads(pickle.dumps(error))) == str(error)
+
+
+CONFIG = """\
+[variables]
+variables = {{A}, {B}}
+
+[values]
+A = 1, 2
+B = x, y
+
+[testing]
+compile = make ID=%%ID%% A=%A%
+test = ./run %B%
+
+[scoring]
+repeat = 3, med
+optimal = max
+
+[output]
+log = log.csv
+"""
+
+
+def write_config(tmp_path, text=CONFIG):
+    """Write a configuration file, returning its path."""
+    path = tmp_path / "tune.conf"
+    path.write_text(text)
+    return path
+
+
+def test_get_settings_returns_dictionary(tmp_path):
+    """get_settings() returns the settings dictionary the tuner has always used."""
+    settings = tune_conf.get_settings(write_config(tmp_path))
+
+    assert isinstance(settings, dict)
+    assert list(settings) == list(tune_conf._SETTING_NAMES)
+    assert dict(settings['possValues']) == {'A': ("1", "2"), 'B': ("x", "y")}
+    assert settings['compile_mkStr'](5, {'A': "2", 'B': "x"}) == "make ID=5 A=2"
+    assert settings['clean'] is None and settings['clean_mkStr'] is None
+    assert (settings['optimal'], settings['custom_fom']) == ('max', True)
+    assert (settings['repeat'], settings['overall']) == (3, 'med')
+    assert (settings['log'], settings['script'], settings['importance']) == ("log.csv", None, None)
+
+
+def test_get_config_returns_autotuning_config(tmp_path):
+    """get_config() gives the same settings as attributes of an AutotuningConfig."""
+    path = write_config(tmp_path)
+    config = tune_conf.get_config(path)
+
+    assert isinstance(config, tune_conf.AutotuningConfig)
+    assert config.variables == ['A', 'B']
+    assert {name: getattr(config, name) for name in tune_conf._SETTING_NAMES} == \
+        tune_conf.get_settings(path)
+
+
+def test_cached_settings_round_trip(tmp_path, monkeypatch):
+    """A settings snapshot is saved, then loaded with its functions rebuilt."""
+    from tuner import result_cache
+
+    monkeypatch.setattr(result_cache, 'CACHE_DIR', tmp_path / "cache")
+    path = write_config(tmp_path)
+
+    parsed = tune_conf.get_cached_settings(path)
+    assert len(list((tmp_path / "cache").glob("cfg-*.pkl"))) == 1
+
+    monkeypatch.setattr(tune_conf, 'get_settings', None)  # Must not parse again
+    loaded = tune_conf.get_cached_settings(path)
+
+    assert loaded.keys() == parsed.keys()
+    assert dict(loaded['possValues']) == dict(parsed['possValues'])
+    assert loaded['test_mkStr'](1, {'A': "1", 'B': "y"}) == "./run y"
+    assert loaded['aggregator'] is tune_conf.med
+
+
+def parse(text, section=None):
+    """Parse the text of a configuration file."""
+    return tune_conf._parse_ini(text.splitlines(keepends=True), "test.conf", section)
+
+
+def test_parse_ini_options_and_comments():
+    """Option names are lower-cased; '=' or ':' separate names and values; comments are skipped."""
+    config = parse("""\
+# A comment
+[Section]
+Name = value = 1
+other: a:b
+; Another comment
+empty =
+""")
+
+    assert config == {'Section': {'name': "value = 1", 'other': "a:b", 'empty': ""}}
+
+
+def test_parse_ini_continuation_lines():
+    """More deeply indented lines continue a value; a blank line within it is kept."""
+    config = parse("""\
+[variables]
+variables = {{A},
+    {B}}
+
+    {C}
+next = 1
+
+""")
+
+    assert config['variables'] == {'variables': "{{A},\n{B}}\n\n{C}", 'next': "1"}
+
+
+@pytest.mark.parametrize('text, message', [
+    ("name = 1\n", "at line 1"),
+    ("[a]\nno separator\n", "at line 2: 'no separator'"),
+    ("[a]\n= 1\n", "at line 2"),
+    ("[a]\n[a]\n", "section \\[a\\] more than once"),
+    ("[a]\nx = 1\nX = 2\n", "option 'x' more than once"),
+])
+def test_parse_ini_errors(text, message):
+    """Lines which cannot be parsed, and repeated sections or options, are errors."""
+    with pytest.raises(tune_conf.ConfigurationError, match=message):
+        parse(text)
+
+
+def test_parse_ini_single_section():
+    """Other sections are skipped, even if they would not parse."""
+    config = parse("[a]\nnot valid\n[b]\nx = 1\n[c]\nalso not valid\n", 'b')
+
+    assert config == {'b': {'x': "1"}}
+
+
+def test_load_section(tmp_path):
+    """load_section() reads one section, and reports a missing one."""
+    path = write_config(tmp_path)
+
+    assert tune_conf.load_section(path, 'output') == {'log': "log.csv"}
+    assert tune_conf.load_section(path, 'scoring') == {'repeat': "3, med", 'optimal': "max"}
+
+    path.write_text("[values]\nA = 1\n")
+    with pytest.raises(tune_conf.ConfigurationError, match="missing required sections: output"):
+        tune_conf.load_section(path, 'output')
+
+
+@pytest.mark.parametrize('old, new, message', [
+    ("[output]\nlog = log.csv\n", "", "missing required sections: output"),
+    ("variables = {{A}, {B}}", "vars = {A}", "option 'variables'"),
+    ("B = x, y", "", "for variables: B"),
+    ("test = ./run %B%", "", "option 'test'"),
+    ("optimal = max", "optimal = fastest", "invalid setting for 'optimal'"),
+    ("repeat = 3, med", "repeat = 0", "invalid setting for 'repeat'"),
+    ("repeat = 3, med", "repeat = three", "invalid setting for 'repeat'"),
+    ("repeat = 3, med", "repeat = 3, mode", "invalid aggregation method"),
+])
+def test_get_settings_errors(tmp_path, old, new, message):
+    """Missing or invalid settings are reported as ConfigurationErrors."""
+    assert old in CONFIG
+    path = write_config(tmp_path, CONFIG.replace(old, new))
+
+    with pytest.raises(tune_conf.ConfigurationError, match=message):
+        tune_conf.get_settings(path)
+
+
+def test_get_settings_missing_file(tmp_path):
+    """A missing configuration file raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError, match="not found"):
+        tune_conf.get_settings(tmp_path / "missing.conf")
+
+
+@pytest.mark.parametrize('setting, optimal, custom_fom, repeat, overall', [
+    ("optimal = MIN_TIME", 'min', False, 1, 'min'),
+    ("repeat = 4", 'min', False, 4, 'min'),
+    ("repeat = 2 , AVG", 'min', False, 2, 'avg'),
+])
+def test_scoring_settings(tmp_path, setting, optimal, custom_fom, repeat, overall):
+    """The scoring settings are read case-insensitively, with their defaults."""
+    path = write_config(tmp_path, CONFIG.replace("repeat = 3, med\noptimal = max", setting))
+    settings = tune_conf.get_settings(path)
+
+    assert (settings['optimal'], settings['custom_fom']) == (optimal, custom_fom)
+    assert (settings['repeat'], settings['overall']) == (repeat, overall)
+    assert settings['aggregator'] is tune_conf._AGGREGATORS[overall]
+
+
+def test_possible_values_are_read_only(tmp_path):
+    """The possible values are a read-only mapping of tuples."""
+    settings = tune_conf.get_settings(write_config(tmp_path))
+
+    with pytest.raises(TypeError):
+        settings['possValues']['A'] = ("3",)
+    assert all(isinstance(values, tuple) for values in settings['possValues'].values())
+
+
+def test_get_config_reparses_changed_file(tmp_path):
+    """The memoised settings are copies, and are replaced when the file changes."""
+    path = write_config(tmp_path)
+    first = tune_conf.get_config(path)
+    first.log = "changed.csv"
+
+    assert tune_conf.get_config(path).log == "log.csv"
+
+    path.write_text(CONFIG.replace("log.csv", "other_log.csv"))
+    assert tune_conf.get_config(path).log == "other_log.csv"
+
+
+def test_load_config_as_dataclass_checks_values_when_used(tmp_path):
+    """load_config_as_dataclass() only reads the possible values when first used."""
+    path = write_config(tmp_path, CONFIG.replace("B = x, y", ""))
+    config = tune_conf.load_config_as_dataclass(path)
+
+    assert config.variables == ['A', 'B']
+    with pytest.raises(tune_conf.ConfigurationError, match="for variables: B"):
+        config.possValues
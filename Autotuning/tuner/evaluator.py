@@ -7,24 +7,36 @@ Defines the Evaluator class.
 This provides a method to actually execute tests which are required by the 
 optimisation algorithm. This class handles compilation, execution and cleaning, 
 and keeps a log of all tests performed.
+
+PYTHON 2 TO 3 CONVERSION NOTES:
+- Replaced print >>output.full/short with output.write_full/write_short()
+- Converted the remaining print statements to print() functions
+- Changed xrange() to range() and exit() to sys.exit()
+- Command output is decoded to text (undecodable bytes are replaced)
+- Updated imports to relative imports
 """
 
 # Running shell commands
 from subprocess import Popen, PIPE, STDOUT
+# Exiting on unusable test output
+import sys
 # Timing commands
 import time
 # Maths
 import math
 # Helpers
-from helpers import avg, med, strVarVals, ordinal
+from .helpers import avg, med, strVarVals, ordinal
 # Control output
-import output
+from . import output
 
 
 
 
 # A class to encapsulate the inforamtion about a single test. Used in the log.
-class SingleTest:
+# There is one of these for every test, so they use slots rather than a dict.
+class SingleTest(object):
+    
+    __slots__ = ('testId', 'valuation', 'results', 'overall')
     
     def __init__(self, testId, valuation):
         self.testId = testId
@@ -37,7 +49,7 @@ class SingleTest:
 class Evaluator:
     
     def __init__(self, compile_mkStr, test_mkStr, custom_fom, clean_mkStr, 
-                 repeat, aggregator, past_evaluator=None):
+                 repeat, aggregator, past_evaluator=None, log_writer=None):
         # The arguments are three "template" functions, which convert a 
         # valuation into a command string to compile/etc that particular test.
         # Any of them may be 'None', meaning that step is not performed.
@@ -46,6 +58,8 @@ class Evaluator:
         # (e.g. min, max, avg, med, ...)
         # past_evaluator is (optionally) another Evaluator which we can use the 
         # results from if it has already run a test we want.
+        # log_writer is (optionally) a CSVLogWriter which each test is written 
+        # to as soon as it has been scored.
         
         self.compile_mkStr = compile_mkStr
         self.test_mkStr    = test_mkStr
@@ -57,20 +71,37 @@ class Evaluator:
         self.aggregator = aggregator
         
         self.past_evaluator = past_evaluator
+        self.log_writer = log_writer
         self.testsRun = 0
         
+        # Tests whose scores are known without running them (see seed())
+        # These are not numbered or logged, as this evaluator did not run them.
+        self.prior = {}
+        
         self.log = {}
         self.failures = []
         self.testNum = 0
         
+        # Maps each logged valuation (as a frozenset of its items) to its testId
+        self.index = {}
+        
         self.output = {'progress': True, 'testing': True}
     
     
     # Creates a new test in the log.
     def _createTest(self, testId, valuation):
-        self.log[testId] = SingleTest(testId, valuation)
+        # The log keeps its own copy, so the index stays valid if the caller 
+        # changes the valuation later.
+        self.log[testId] = SingleTest(testId, dict(valuation))
+        self.index[frozenset(valuation.items())] = testId
         return self.log[testId]
     
+    # Returns a copy of a valuation with every value as a string, the form the 
+    # compile/test/clean command functions take. This is done once per test, 
+    # rather than for each command built from it.
+    def _cmdValuation(self, valuation):
+        return {var: str(val) for var, val in valuation.items()}
+    
     # Adds a new test score to the log.
     def _logTest(self, testId, score):
         if testId in self.log:
@@ -80,19 +111,24 @@ class Evaluator:
     def _logOverall(self, testId, score):
         if testId in self.log:
             self.log[testId].overall = score
+            if self.log_writer is not None:
+                self.log_writer.writeTest(self.log[testId])
     
     
     
     # Given a valuation, returns the matching test from the log.
     def _getTest(self, valuation):
         # Check if it has been run by this evaluator.
-        for t in self.log.values():
-            if t.valuation == valuation:
-                return t
+        key = frozenset(valuation.items())
+        if key in self.index:
+            return self.log[self.index[key]]
         
         # Check if it has been run in the past.
         if self.past_evaluator is not None:
             t = self.past_evaluator._getTest(valuation)
+            if t is not None and t.testId is None:
+                # A seeded test, which is shared rather than logged.
+                return t
             if t is not None:
                 # Create and populate a local test
                 self.testNum += 1
@@ -103,8 +139,20 @@ class Evaluator:
                 
                 return t2
         
-        # It has not been run.
-        return None
+        # Check if its score is already known.
+        # (if not, it has not been run, and this returns None)
+        return self.prior.get(key)
+    
+    
+    # Provides the scores of valuations known from elsewhere (e.g. earlier 
+    # runs), which are then used instead of running those tests.
+    # prior_points is a list of (valuation, score) pairs.
+    # Seeded tests have no testId, and are kept out of the log.
+    def seed(self, prior_points):
+        for valuation, score in prior_points:
+            t = SingleTest(None, dict(valuation))
+            t.overall = score
+            self.prior[frozenset(valuation.items())] = t
     
     
     # Resets all stored data, etc.
@@ -112,8 +160,11 @@ class Evaluator:
     # requiring it to flush all state since its creation.
     def clearData(self):
         self.log = {}
+        self.index = {}
         self.failures = []
         self.testNum = 0
+        if self.log_writer is not None:
+            self.log_writer.reset()
     
     
     # Returns the score of a valuation.
@@ -145,29 +196,30 @@ class Evaluator:
                 self.testsRun += 1
                 
                 self._createTest(self.testNum, valuation)
+                cmdValuation = self._cmdValuation(valuation)
                 
                 
                 if self.output['progress']:
-                    print >>output.full, "Test " + str(self.testNum) + ":"
-                    print >>output.full, strVarVals(valuation, ", ")
+                    output.write_full("Test " + str(self.testNum) + ":\n")
+                    output.write_full(strVarVals(valuation, ", ") + "\n")
                     
-                    print >>output.short, "Test " + str(self.testNum) + ": ",
-                    output.short.flush() 
+                    output.write_short("Test " + str(self.testNum) + ": ")
+                    output.state.short.flush() 
             
                 
                 # First, compile the test, if needed.
                 if self.compile_mkStr is not None:
                     if self.output['progress']:
-                        print >>output.full, "Compiling test " +  str(self.testNum)
+                        output.write_full("Compiling test " +  str(self.testNum) + "\n")
                         
-                        print >>output.short, "Compiling, ",
-                        output.short.flush()
+                        output.write_short("Compiling, ")
+                        output.state.short.flush()
                     
-                    cmdStr = self.compile_mkStr(self.testNum, valuation)
+                    cmdStr = self.compile_mkStr(self.testNum, cmdValuation)
                     
                     # Start the compilation
                     # Collect the output, without printing.
-                    p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT)
+                    p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT, text=True, errors='replace')
                     
                     # Wait for the compilation to finish, this sets the return code.
                     p.wait()
@@ -175,225 +227,239 @@ class Evaluator:
                     # Print the output
                     if self.output['testing']:
                         out = p.stdout.readlines()
-                        print >>output.full, ''.join(out)
+                        output.write_full(''.join(out) + "\n")
                     
                     # Check the retun code.
                     if(p.returncode != 0):
                         self.failures.append(("COMPILATION OF TEST " + str(self.testNum) + " FAILED.", valuation))
                         
                         if self.output['progress']:
-                            print >>output.short, "(FAILED)"
-                            output.short.flush()
+                            output.write_short("(FAILED)\n")
+                            output.state.short.flush()
                         
                         continue # This test cannot be compiled, skip ahead to the next one.
                 
                 
-                # Repeat the tests the number of times specified
-                for i in xrange(1, self.repeat +1):
-                    
-                    # Run the test
-                    if self.custom_fom:
-                        
-                        if self.output['progress']: 
-                            nthRun = ""
-                            if self.repeat > 1:
-                                nthRun = " ("+ordinal(i)+" run)"
-                            print >>output.full, "Running test " +  str(self.testNum) + nthRun
-                            if self.repeat > 1:
-                                print >>output.short, ordinal(i) + " Run, ",
-                                output.short.flush()
-                            else:
-                                print >>output.short, "Running, ",
-                                output.short.flush()
-                        
-                        # Execute the evaluation, the result will be output on the last line.
-                        cmdStr = self.test_mkStr(self.testNum, valuation)
-                        
-                        # Start the evaluation, capture output
-                        p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT)
-                        
-                        # Wait for the evaluation to finish, this sets the return code.
-                        p.wait()
-                        
-                        
-                        # Get the program output.
-                        out = p.stdout.readlines()
-                        
-                        if self.output['testing']: 
-                            print >>output.full, ''.join(out)
-                        
-                        
-                        # Check the retun code.
-                        if(p.returncode != 0):
-                            self.failures.append(("EVALUATION OF TEST " + str(self.testNum) + " FAILED.", valuation))
-                            
-                            if self.output['progress']:
-                                print >>output.short, "(FAILED)"
-                                output.short.flush()
-                            
-                            continue # This test cannot be run, skip ahead to the next one (poss just the next repetition).
-                        
-                        
-                        if len(out) == 0:
-                            print >>output.short, ""
-                            print "The test did not produce any output."
-                            print "When using a custom figure-of-merit, the 'test' command must output the score as the final line of output."
-                            exit() # Should probably throw some exception to be caught by the main program.
-                        
-                        # Take the last line of output to be the FOM.
-                        # Add this score to the log.
-                        try:
-                            self._logTest(self.testNum, float(out[-1]))
-                        except ValueError:
-                            # The final line could not be interpretd as a float.
-                            print >>output.short, ""
-                            print "The final line of output could not be interpreted as a score."
-                            print "When using a custom figure-of-merit, the 'test' command must output the score as the final line of output."
-                            print "This should be an integer or float, with no other text on the line."
-                            print "Score could not be read from the following line: "
-                            print out[-1]
-                            exit() # Should probably throw some exception to be caught by the main program.
-                        
-                        if self.output['progress'] and self.repeat > 1:
-                            print >>output.full, "Result of test " + str(self.testNum) + ", " + ordinal(i) + " run: " + str(float(out[-1]))
-                        
-                        
-                        
-                        
-                        
-                    else: # Not using a custom FOM, so we'll do the timing
-                        
-                        if self.output['progress']: 
-                            nthRun = ""
-                            if self.repeat > 1:
-                                nthRun = " ("+ordinal(i)+" run)"
-                            print >>output.full, "Running test " +  str(self.testNum) + nthRun
-                            if self.repeat > 1:
-                                print >>output.short, ordinal(i) + " Run, ",
-                                output.short.flush()
-                            else:
-                                print >>output.short, "Running, ",
-                                output.short.flush()
-                        
-                        # Execute test, the result will be the time taken.
-                        cmdStr = self.test_mkStr(self.testNum, valuation)
-                        
-                        start = time.time()
-                        
-                        # Start the test
-                        # Collect the output, without printing.
-                        p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT)
-                        
-                        # Wait for the test to finish, this sets the return code.
-                        p.wait()
-                        
-                        stop = time.time()
-                        
-                        # Print the output
-                        if self.output['testing']:
-                            out = p.stdout.readlines()
-                            print >>output.full, ''.join(out)
-                        
-                        # Check the retun code.
-                        if(p.returncode != 0):
-                            self.failures.append(("RUNNING OF TEST " + str(self.testNum) + " FAILED.", valuation))
-                            
-                            if self.output['progress']:
-                                print >>output.short, "(FAILED)",
-                                output.short.flush()
-
-                            
-                            continue # This test cannot be run, skip ahead to the next one (poss just the next repetition).
-                        
-                        
-                        # Take the difference between the start and stop times as the FOM.
-                        # Add this score to the log.
-                        self._logTest(self.testNum, stop - start)
-                        
-                        if self.output['progress'] and self.repeat > 1:
-                            print >>output.full, "Result of test " + str(self.testNum) + ", " + ordinal(i) + " run: " + str(stop - start)
-                        
-                        
-                        
-                    
-                    
-                # End of for loop running the test multiple times
+                self._runTest(valuation, cmdValuation)
                 
-                # Add the overall score to the test log.
-                scores = self._getTest(valuation).results
                 
-                if len(scores) > 0: # Then some tests ran successfully
-                    
+            # End of if stsement checking if test is fresh
+            
+        # End of for loop running multiple tests.
+        
+    # End of evaluate()
+    
+    
+    
+    
+    # Runs (and then cleans) a single test, which has already been created 
+    # and compiled, as test number self.testNum.
+    # cmdValuation is the valuation as given to the command functions 
+    # (see _cmdValuation()).
+    # The scores are saved to the test log.
+    def _runTest(self, valuation, cmdValuation):
+        
+        # Repeat the tests the number of times specified
+        for i in range(1, self.repeat +1):
+            
+            # Run the test
+            if self.custom_fom:
+                
+                if self.output['progress']: 
+                    nthRun = ""
                     if self.repeat > 1:
-                        overall = self.aggregator(scores)
-                    else: # self.repeat == 1 and len(scores) == 1
-                        overall = scores[0]
-                    
-                    self._logOverall(self.testNum, overall)
-                    
-                    if self.output['progress']: 
-                        if self.repeat > 1:
-                            stats = self._test_stats(scores)
-                            
-                            print >>output.full, "Results of test " + str(self.testNum) + ":"
-                            print >>output.full, "Average Result: " + str(stats['avg'])
-                            print >>output.full, "Minimum Result: " + str(stats['min'])
-                            print >>output.full, "Maximum Result: " + str(stats['max'])
-                            print >>output.full, "Median Result:  " + str(stats['med'])
-                            print >>output.full, "Variance:       " + str(stats['variance'])
-                            print >>output.full, "Std. Deviation: " + str(stats['std_dev'])
-                            print >>output.full, "Coeff. of Var.: " + str(stats['cv'])
-                        else:
-                            print >>output.full, "Result of test " + str(self.testNum) + ": " + str(overall)
+                        nthRun = " ("+ordinal(i)+" run)"
+                    output.write_full("Running test " +  str(self.testNum) + nthRun + "\n")
+                    if self.repeat > 1:
+                        output.write_short(ordinal(i) + " Run, ")
+                        output.state.short.flush()
+                    else:
+                        output.write_short("Running, ")
+                        output.state.short.flush()
+                
+                # Execute the evaluation, the result will be output on the last line.
+                cmdStr = self.test_mkStr(self.testNum, cmdValuation)
+                
+                # Start the evaluation, capture output
+                p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT, text=True, errors='replace')
+                
+                # Wait for the evaluation to finish, this sets the return code.
+                p.wait()
+                
+                
+                # Get the program output.
+                out = p.stdout.readlines()
+                
+                if self.output['testing']: 
+                    output.write_full(''.join(out) + "\n")
+                
+                
+                # Check the retun code.
+                if(p.returncode != 0):
+                    self.failures.append(("EVALUATION OF TEST " + str(self.testNum) + " FAILED.", valuation))
                     
+                    if self.output['progress']:
+                        output.write_short("(FAILED)\n")
+                        output.state.short.flush()
                     
+                    continue # This test cannot be run, skip ahead to the next one (poss just the next repetition).
+                
+                
+                if len(out) == 0:
+                    output.write_short("\n")
+                    print("The test did not produce any output.")
+                    print("When using a custom figure-of-merit, the 'test' command must output the score as the final line of output.")
+                    sys.exit() # Should probably throw some exception to be caught by the main program.
+                
+                # Take the last line of output to be the FOM.
+                # Add this score to the log.
+                try:
+                    self._logTest(self.testNum, float(out[-1]))
+                except ValueError:
+                    # The final line could not be interpretd as a float.
+                    output.write_short("\n")
+                    print("The final line of output could not be interpreted as a score.")
+                    print("When using a custom figure-of-merit, the 'test' command must output the score as the final line of output.")
+                    print("This should be an integer or float, with no other text on the line.")
+                    print("Score could not be read from the following line: ")
+                    print(out[-1])
+                    sys.exit() # Should probably throw some exception to be caught by the main program.
+                
+                if self.output['progress'] and self.repeat > 1:
+                    output.write_full("Result of test " + str(self.testNum) + ", " + ordinal(i) + " run: " + str(float(out[-1])) + "\n")
+                
+                
+                
+                
+                
+            else: # Not using a custom FOM, so we'll do the timing
+                
+                if self.output['progress']: 
+                    nthRun = ""
+                    if self.repeat > 1:
+                        nthRun = " ("+ordinal(i)+" run)"
+                    output.write_full("Running test " +  str(self.testNum) + nthRun + "\n")
+                    if self.repeat > 1:
+                        output.write_short(ordinal(i) + " Run, ")
+                        output.state.short.flush()
+                    else:
+                        output.write_short("Running, ")
+                        output.state.short.flush()
+                
+                # Execute test, the result will be the time taken.
+                cmdStr = self.test_mkStr(self.testNum, cmdValuation)
+                
+                start = time.time()
+                
+                # Start the test
+                # Collect the output, without printing.
+                p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT, text=True, errors='replace')
+                
+                # Wait for the test to finish, this sets the return code.
+                p.wait()
                 
+                stop = time.time()
                 
-                # Run the cleanup, if needed
-                if self.clean_mkStr is not None:
+                # Print the output
+                if self.output['testing']:
+                    out = p.stdout.readlines()
+                    output.write_full(''.join(out) + "\n")
+                
+                # Check the retun code.
+                if(p.returncode != 0):
+                    self.failures.append(("RUNNING OF TEST " + str(self.testNum) + " FAILED.", valuation))
+                    
                     if self.output['progress']:
-                        print >>output.full, "Cleaning test " +  str(self.testNum)
-                        print >>output.short, "Cleaning, ",
-                        output.short.flush()
+                        output.write_short("(FAILED)")
+                        output.state.short.flush()
 
                     
-                    cmdStr = self.clean_mkStr(self.testNum, valuation)
-                    
-                    # Start the cleanup
-                    # Collect the output, without printing.
-                    p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT)
-                    
-                    # Wait for the cleanup to finish, this sets the return code.
-                    p.wait()
-                    
-                    # Print the output
-                    if self.output['testing']:
-                        out = p.stdout.readlines()
-                        print >>output.full, ''.join(out)
-                    
-                    # Check the retun code.
-                    if(p.returncode != 0):
-                        self.failures.append(("CLEANUP OF TEST " + str(self.testNum) + " FAILED.\n(test was still used)", valuation))
-                        
-                        if self.output['progress']:
-                            print >>output.short, "(FAILED) ",
-                            output.short.flush()
-                        
-                        # Need not 'continue', as we still got a result.
-                    
+                    continue # This test cannot be run, skip ahead to the next one (poss just the next repetition).
                 
                 
-                if self.output['progress']: 
-                    print >>output.full, ""
-                    print >>output.short, "Done. "
-                    output.short.flush()
+                # Take the difference between the start and stop times as the FOM.
+                # Add this score to the log.
+                self._logTest(self.testNum, stop - start)
+                
+                if self.output['progress'] and self.repeat > 1:
+                    output.write_full("Result of test " + str(self.testNum) + ", " + ordinal(i) + " run: " + str(stop - start) + "\n")
+                
                 
                 
-            # End of if stsement checking if test is fresh
             
-        # End of for loop running multiple tests.
+            
+        # End of for loop running the test multiple times
         
-    # End of evaluate()
+        # Add the overall score to the test log.
+        scores = self._getTest(valuation).results
+        
+        if len(scores) > 0: # Then some tests ran successfully
+            
+            if self.repeat > 1:
+                overall = self.aggregator(scores)
+            else: # self.repeat == 1 and len(scores) == 1
+                overall = scores[0]
+            
+            self._logOverall(self.testNum, overall)
+            
+            if self.output['progress']: 
+                if self.repeat > 1:
+                    stats = self._test_stats(scores)
+                    
+                    output.write_full("Results of test " + str(self.testNum) + ":\n")
+                    output.write_full("Average Result: " + str(stats['avg']) + "\n")
+                    output.write_full("Minimum Result: " + str(stats['min']) + "\n")
+                    output.write_full("Maximum Result: " + str(stats['max']) + "\n")
+                    output.write_full("Median Result:  " + str(stats['med']) + "\n")
+                    output.write_full("Variance:       " + str(stats['variance']) + "\n")
+                    output.write_full("Std. Deviation: " + str(stats['std_dev']) + "\n")
+                    output.write_full("Coeff. of Var.: " + str(stats['cv']) + "\n")
+                else:
+                    output.write_full("Result of test " + str(self.testNum) + ": " + str(overall) + "\n")
+            
+            
+        
+        
+        # Run the cleanup, if needed
+        if self.clean_mkStr is not None:
+            if self.output['progress']:
+                output.write_full("Cleaning test " +  str(self.testNum) + "\n")
+                output.write_short("Cleaning, ")
+                output.state.short.flush()
+
+            
+            cmdStr = self.clean_mkStr(self.testNum, cmdValuation)
+            
+            # Start the cleanup
+            # Collect the output, without printing.
+            p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT, text=True, errors='replace')
+            
+            # Wait for the cleanup to finish, this sets the return code.
+            p.wait()
+            
+            # Print the output
+            if self.output['testing']:
+                out = p.stdout.readlines()
+                output.write_full(''.join(out) + "\n")
+            
+            # Check the retun code.
+            if(p.returncode != 0):
+                self.failures.append(("CLEANUP OF TEST " + str(self.testNum) + " FAILED.\n(test was still used)", valuation))
+                
+                if self.output['progress']:
+                    output.write_short("(FAILED) ")
+                    output.state.short.flush()
+                
+                # Need not 'continue', as we still got a result.
+            
+        
+        
+        if self.output['progress']: 
+            output.write_full("\n")
+            output.write_short("Done. \n")
+            output.state.short.flush()
+        
+    # End of _runTest()
     
     
     
@@ -435,6 +501,6 @@ class Evaluator:
 
 
 if __name__ == "__main__":
-    print __doc__
+    print(__doc__)
 
 
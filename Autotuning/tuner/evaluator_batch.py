@@ -12,20 +12,30 @@ It is different from Evaluator because it first compiles all valuations,
 creating a 'pool' of tests, which are run. Evaluator compiles and runs tests 
 one at a time. BatchEvaluator is the sequential version of what 
 ParallelEvaluator will be.
+
+PYTHON 2 TO 3 CONVERSION NOTES:
+- Replaced print >>output.full/short with output.write_full/write_short()
+- Converted the remaining print statements to print() functions
+- Changed exit() to sys.exit()
+- Command output is decoded to text (undecodable bytes are replaced)
+- Fixed the per-run result messages, which used an undefined run counter
+- Updated imports to relative imports
 """
 
 # Running shell commands
 from subprocess import Popen, PIPE, STDOUT
+# Exiting on unusable test output
+import sys
 # Timing commands
 import time
 # Maths
 import math
 # Helpers
-from helpers import avg, med, strVarVals, ordinal
+from .helpers import avg, med, strVarVals, ordinal
 # Control output
-import output
+from . import output
 # The main Evaluator Definition
-from evaluator import SingleTest, Evaluator
+from .evaluator import SingleTest, Evaluator
 
 
 
@@ -45,6 +55,9 @@ class BatchEvaluator(Evaluator):
         # First, ignore any tests which have already been performed.
         valuations_to_test = [v for v in valuations_list if self._getTest(v) is None]
         
+        # The valuations as given to the command functions (see _cmdValuation())
+        cmd_valuations = [self._cmdValuation(v) for v in valuations_to_test]
+        
         
         # Set up all the tests.
         for idx, valuation in enumerate(valuations_to_test):
@@ -54,8 +67,8 @@ class BatchEvaluator(Evaluator):
         if self.output['progress']:
             for idx, valuation in enumerate(valuations_to_test):
                 test_num = self.testNum + idx + 1
-                print >>output.full, "Test " + str(test_num) + ":"
-                print >>output.full, strVarVals(valuation, ", ")
+                output.write_full("Test " + str(test_num) + ":\n")
+                output.write_full(strVarVals(valuation, ", ") + "\n")
         
         
         
@@ -65,16 +78,16 @@ class BatchEvaluator(Evaluator):
                 test_num = self.testNum + idx + 1
                 
                 if self.output['progress']:
-                    print >>output.full, "Compiling test " +  str(test_num)
+                    output.write_full("Compiling test " +  str(test_num) + "\n")
                     
-                    print >>output.short, "Compiling test " +  str(test_num),
-                    output.short.flush()
+                    output.write_short("Compiling test " +  str(test_num))
+                    output.state.short.flush()
                 
-                cmdStr = self.compile_mkStr(test_num, valuation)
+                cmdStr = self.compile_mkStr(test_num, cmd_valuations[idx])
                 
                 # Start the compilation
                 # Collect the output, without printing.
-                p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT)
+                p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT, text=True, errors='replace')
                 
                 # Wait for the compilation to finish, this sets the return code.
                 p.wait()
@@ -82,48 +95,48 @@ class BatchEvaluator(Evaluator):
                 # Print the output
                 if self.output['testing']:
                     out = p.stdout.readlines()
-                    print >>output.full, ''.join(out)
+                    output.write_full(''.join(out) + "\n")
                 
                 # Check the retun code.
                 if(p.returncode != 0):
                     self.failures.append(("COMPILATION OF TEST " + str(test_num) + " FAILED.", valuation))
                     
                     if self.output['progress']:
-                        print >>output.short, "(FAILED)"
-                        output.short.flush()
+                        output.write_short(" (FAILED)\n")
+                        output.state.short.flush()
                         
                 else:
                     if self.output['progress']:
-                        print >>output.short
-                        output.short.flush()
+                        output.write_short("\n")
+                        output.state.short.flush()
         
         # Finished compilation
         
         
         
         # Create a pool of tests to be run.
-        # This is a list of (test_num, valuation, run_num) pairs
+        # This is a list of (test_num, valuation, cmd_valuation, run_num) tuples
         test_pool = []
         for idx, valuation in enumerate(valuations_to_test):
             test_num = self.testNum + idx + 1
-            test_pool += [(test_num, valuation, i) for i in range(1,self.repeat+1)]
+            test_pool += [(test_num, valuation, cmd_valuations[idx], i) for i in range(1,self.repeat+1)]
 
         
         
         
         # Run all the tests.
-        for (test_num, valuation, run_num) in test_pool:
+        for (test_num, valuation, cmd_valuation, run_num) in test_pool:
             
             if self.output['progress']: 
                 nthRun = ""
                 if self.repeat > 1:
                     nthRun = " ("+ordinal(run_num)+" run)"
-                print >>output.full, "Running test " +  str(test_num) + nthRun
-                print >>output.short, "Running test " +  str(test_num) + nthRun,
+                output.write_full("Running test " +  str(test_num) + nthRun + "\n")
+                output.write_short("Running test " +  str(test_num) + nthRun)
                 
             
             # The command required to execute the test
-            cmdStr = self.test_mkStr(test_num, valuation)
+            cmdStr = self.test_mkStr(test_num, cmd_valuation)
             
             
             
@@ -131,7 +144,7 @@ class BatchEvaluator(Evaluator):
             if self.custom_fom:
                 
                 # Start the evaluation, capture output
-                p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT)
+                p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT, text=True, errors='replace')
                 
                 # Wait for the evaluation to finish, this sets the return code.
                 p.wait()
@@ -141,7 +154,7 @@ class BatchEvaluator(Evaluator):
                 out = p.stdout.readlines()
                 
                 if self.output['testing']: 
-                    print >>output.full, ''.join(out)
+                    output.write_full(''.join(out) + "\n")
                 
                 
                 # Check the retun code.
@@ -149,21 +162,21 @@ class BatchEvaluator(Evaluator):
                     self.failures.append(("EVALUATION OF TEST " + str(test_num) + " FAILED.", valuation))
                     
                     if self.output['progress']:
-                        print >>output.short, "(FAILED)"
-                        output.short.flush()
+                        output.write_short(" (FAILED)\n")
+                        output.state.short.flush()
                     
                     continue # This test cannot be run, skip ahead to the next one (poss just the next repetition).
                 else:
                     if self.output['progress']:
-                        print >>output.short 
-                        output.short.flush()
+                        output.write_short("\n")
+                        output.state.short.flush()
                 
                 
                 
                 if len(out) == 0:
-                    print "The test did not produce any output."
-                    print "When using a custom figure-of-merit, the 'test' command must output the score as the final line of output."
-                    exit() # Should probably throw some exception to be caught by the main program.
+                    print("The test did not produce any output.")
+                    print("When using a custom figure-of-merit, the 'test' command must output the score as the final line of output.")
+                    sys.exit() # Should probably throw some exception to be caught by the main program.
                 
                 # Take the last line of output to be the FOM.
                 # Add this score to the log.
@@ -171,15 +184,15 @@ class BatchEvaluator(Evaluator):
                     self._logTest(test_num, float(out[-1]))
                 except ValueError:
                     # The final line could not be interpretd as a float.
-                    print "The final line of output could not be interpreted as a score."
-                    print "When using a custom figure-of-merit, the 'test' command must output the score as the final line of output."
-                    print "This should be an integer or float, with no other text on the line."
-                    print "Score could not be read from the following line: "
-                    print out[-1]
-                    exit() # Should probably throw some exception to be caught by the main program.
+                    print("The final line of output could not be interpreted as a score.")
+                    print("When using a custom figure-of-merit, the 'test' command must output the score as the final line of output.")
+                    print("This should be an integer or float, with no other text on the line.")
+                    print("Score could not be read from the following line: ")
+                    print(out[-1])
+                    sys.exit() # Should probably throw some exception to be caught by the main program.
                 
                 if self.output['progress'] and self.repeat > 1:
-                    print >>output.full, "Result of test " + str(test_num) + ", " + ordinal(i) + " run: " + str(float(out[-1]))
+                    output.write_full("Result of test " + str(test_num) + ", " + ordinal(run_num) + " run: " + str(float(out[-1])) + "\n")
                 
                 
                 
@@ -191,7 +204,7 @@ class BatchEvaluator(Evaluator):
                 
                 # Start the test
                 # Collect the output, without printing.
-                p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT)
+                p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT, text=True, errors='replace')
                 
                 # Wait for the test to finish, this sets the return code.
                 p.wait()
@@ -201,21 +214,21 @@ class BatchEvaluator(Evaluator):
                 # Print the output
                 if self.output['testing']:
                     out = p.stdout.readlines()
-                    print >>output.full, ''.join(out)
+                    output.write_full(''.join(out) + "\n")
                 
                 # Check the retun code.
                 if(p.returncode != 0):
                     self.failures.append(("RUNNING OF TEST " + str(test_num) + " FAILED.", valuation))
                     
                     if self.output['progress']:
-                        print >>output.short, "(FAILED)",
-                        output.short.flush()
+                        output.write_short(" (FAILED)")
+                        output.state.short.flush()
                     
                     continue # This test cannot be run, skip ahead to the next one (poss just the next repetition).
                 else:
                     if self.output['progress']:
-                        print >>output.short
-                        output.short.flush()
+                        output.write_short("\n")
+                        output.state.short.flush()
                 
                 
                 # Take the difference between the start and stop times as the FOM.
@@ -223,7 +236,7 @@ class BatchEvaluator(Evaluator):
                 self._logTest(test_num, stop - start)
                 
                 if self.output['progress'] and self.repeat > 1:
-                    print >>output.full, "Result of test " + str(test_num) + ", " + ordinal(i) + " run: " + str(stop - start)
+                    output.write_full("Result of test " + str(test_num) + ", " + ordinal(run_num) + " run: " + str(stop - start) + "\n")
                 
                 
             
@@ -250,16 +263,16 @@ class BatchEvaluator(Evaluator):
                     if self.repeat > 1:
                         stats = self._test_stats(scores)
                         
-                        print >>output.full, "Results of test " + str(test_num) + ":"
-                        print >>output.full, "Average Result: " + str(stats['avg'])
-                        print >>output.full, "Minimum Result: " + str(stats['min'])
-                        print >>output.full, "Maximum Result: " + str(stats['max'])
-                        print >>output.full, "Median Result:  " + str(stats['med'])
-                        print >>output.full, "Variance:       " + str(stats['variance'])
-                        print >>output.full, "Std. Deviation: " + str(stats['std_dev'])
-                        print >>output.full, "Coeff. of Var.: " + str(stats['cv'])
+                        output.write_full("Results of test " + str(test_num) + ":\n")
+                        output.write_full("Average Result: " + str(stats['avg']) + "\n")
+                        output.write_full("Minimum Result: " + str(stats['min']) + "\n")
+                        output.write_full("Maximum Result: " + str(stats['max']) + "\n")
+                        output.write_full("Median Result:  " + str(stats['med']) + "\n")
+                        output.write_full("Variance:       " + str(stats['variance']) + "\n")
+                        output.write_full("Std. Deviation: " + str(stats['std_dev']) + "\n")
+                        output.write_full("Coeff. of Var.: " + str(stats['cv']) + "\n")
                     else:
-                        print >>output.full, "Result of test " + str(test_num) + ": " + str(overall)
+                        output.write_full("Result of test " + str(test_num) + ": " + str(overall) + "\n")
                 
                 
         # Finished processing the scores
@@ -271,16 +284,16 @@ class BatchEvaluator(Evaluator):
                 test_num = self.testNum + idx + 1
                 
                 if self.output['progress']:
-                    print >>output.full, "Cleaning test " +  str(test_num)
-                    print >>output.short, "Cleaning test " +  str(test_num),
-                    output.short.flush()
+                    output.write_full("Cleaning test " +  str(test_num) + "\n")
+                    output.write_short("Cleaning test " +  str(test_num))
+                    output.state.short.flush()
 
                 
-                cmdStr = self.clean_mkStr(test_num, valuation)
+                cmdStr = self.clean_mkStr(test_num, cmd_valuations[idx])
                 
                 # Start the cleanup
                 # Collect the output, without printing.
-                p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT)
+                p = Popen(cmdStr, shell=True, stdout=PIPE, stderr=STDOUT, text=True, errors='replace')
                 
                 # Wait for the cleanup to finish, this sets the return code.
                 p.wait()
@@ -288,20 +301,20 @@ class BatchEvaluator(Evaluator):
                 # Print the output
                 if self.output['testing']:
                     out = p.stdout.readlines()
-                    print >>output.full, ''.join(out)
+                    output.write_full(''.join(out) + "\n")
                 
                 # Check the retun code.
                 if(p.returncode != 0):
                     self.failures.append(("CLEANUP OF TEST " + str(test_num) + " FAILED.\n(test was still used)", valuation))
                     
                     if self.output['progress']:
-                        print >>output.short, "(FAILED)"
-                        output.short.flush()
+                        output.write_short(" (FAILED)\n")
+                        output.state.short.flush()
                     
                 else:
                     if self.output['progress']:
-                        print >>output.short
-                        output.short.flush()
+                        output.write_short("\n")
+                        output.state.short.flush()
         
         
         
@@ -328,6 +341,6 @@ class BatchEvaluator(Evaluator):
 
 
 if __name__ == "__main__":
-    print __doc__
+    print(__doc__)
 
 
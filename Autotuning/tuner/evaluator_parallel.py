@@ -0,0 +1,117 @@
+"""
+Autotuning System
+
+evaluator_parallel.py
+
+Defines the ParallelEvaluator class.
+This is the Evaluator used when the tuner is given --jobs. It compiles tests
+in parallel, several at a time, while the tests which have already been
+compiled are run. The tests themselves are still run one at a time and in
+order, as they would otherwise compete for the same device.
+"""
+
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from .evaluator import Evaluator
+from .helpers import strVarVals
+from . import output
+
+
+class ParallelEvaluator(Evaluator):
+    """
+    Evaluator which compiles up to `jobs` tests at once.
+
+    All new tests in a batch are numbered and queued for compilation up
+    front; each test is then run (and cleaned) as soon as its own compilation
+    has finished, while later tests are still compiling. Running and cleaning
+    are inherited from Evaluator.
+
+    When the tuner times the tests itself (no custom figure-of-merit), the
+    compilations running alongside a test may affect its time.
+    """
+
+    def __init__(self, *args: Any, jobs: int = 2, **kwargs: Any) -> None:
+        """
+        Initialize the evaluator.
+
+        Args:
+            *args, **kwargs: As for Evaluator
+            jobs: Maximum number of compilations run at once
+        """
+        Evaluator.__init__(self, *args, **kwargs)
+        self.jobs = jobs
+
+    def _compile(self, test_id: int, cmd_valuation: Dict[str, str]) -> Tuple[int, str]:
+        """Compile a test, returning the return code and the compiler output."""
+        # Started from a worker thread rather than a process pool: subprocess
+        # spawns with vfork/posix_spawn, so the size of the tuner process does
+        # not slow this down, and a separate server process would only add a hop.
+        result = subprocess.run(
+            self.compile_mkStr(test_id, cmd_valuation),
+            shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        return result.returncode, result.stdout.decode(errors='replace')
+
+    def evaluate(self, valuations_list: List[Dict[str, Any]]) -> None:
+        """
+        Evaluate a list of valuations, saving the scores to the test log.
+
+        Args:
+            valuations_list: Valuations to test; any already tested are skipped
+        """
+        # Only tests which have not already been performed are needed, once each
+        new_valuations = []
+        seen = set()
+        for valuation in valuations_list:
+            key = frozenset(valuation.items())
+            if key not in seen and self._getTest(valuation) is None:
+                seen.add(key)
+                new_valuations.append(valuation)
+
+        tests = [(self.testNum + idx + 1, valuation, self._cmdValuation(valuation))
+                 for idx, valuation in enumerate(new_valuations)]
+
+        pool = ThreadPoolExecutor(max_workers=self.jobs)
+        try:
+            if self.compile_mkStr is not None:
+                compiles = [pool.submit(self._compile, test_id, cmd_valuation)
+                            for test_id, valuation, cmd_valuation in tests]
+            else:
+                compiles = [None] * len(tests)
+
+            for (test_id, valuation, cmd_valuation), compiled in zip(tests, compiles):
+                self.testNum = test_id
+                self.testsRun += 1
+                self._createTest(test_id, valuation)
+
+                if self.output['progress']:
+                    output.write_full(f"Test {test_id}:\n{strVarVals(valuation, ', ')}\n")
+                    output.write_short(f"Test {test_id}: ")
+                    output.state.short.flush()
+
+                if compiled is not None:
+                    if self.output['progress']:
+                        output.write_full(f"Compiling test {test_id}\n")
+                        output.write_short("Compiling, ")
+                        output.state.short.flush()
+
+                    returncode, compiler_output = compiled.result()
+
+                    if self.output['testing']:
+                        output.write_full(compiler_output + "\n")
+
+                    if returncode != 0:
+                        self.failures.append((f"COMPILATION OF TEST {test_id} FAILED.", valuation))
+
+                        if self.output['progress']:
+                            output.write_short("(FAILED)\n")
+                            output.state.short.flush()
+
+                        continue  # This test cannot be compiled, skip ahead to the next one.
+
+                self._runTest(valuation, cmd_valuation)
+        finally:
+            # Compilations not yet started are not needed if testing stopped early
+            pool.shutdown(wait=True, cancel_futures=True)
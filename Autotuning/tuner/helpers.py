@@ -14,7 +14,7 @@ PYTHON 2 TO 3 CONVERSION NOTES:
 - Modernized to use f-strings where appropriate
 """
 
-from typing import List, Dict, Any, Union, TypeVar, Iterable
+from typing import List, Dict, Any, Union, TypeVar, Iterable, Iterator, Tuple
 import statistics
 from itertools import product
 
@@ -46,6 +46,23 @@ def strVarVals(var_dict: Dict[str, Any], sep: str = "\n") -> str:
     return sep.join([f"{var} = {val}" for var, val in sorted(var_dict.items())])
 
 
+def _ordinal_uncached(n: int) -> str:
+    """Build the ordinal string for n without consulting the cache."""
+    # Handle special cases for 11th, 12th, 13th
+    if 10 <= n % 100 < 20:
+        return f"{n}th"
+    else:
+        suffix_map = {1: 'st', 2: 'nd', 3: 'rd'}
+        suffix = suffix_map.get(n % 10, 'th')
+        return f"{n}{suffix}"
+
+
+# Ordinals for small n are requested repeatedly (run numbers, rankings), so
+# they are built once up front and served by list index.
+_ORDINAL_CACHE_SIZE = 1024
+_ORDINAL_CACHE = [_ordinal_uncached(i) for i in range(_ORDINAL_CACHE_SIZE)]
+
+
 def ordinal(n: int) -> str:
     """
     Return the ordinal string representation of a number.
@@ -53,6 +70,8 @@ def ordinal(n: int) -> str:
     PYTHON 2 CONVERSION: Original function was correct, just added type hints.
     Enhanced with validation and better documentation.
     
+    Values in the range 0-1023 are served from a prebuilt table.
+    
     Args:
         n: Integer to convert to ordinal form
         
@@ -71,13 +90,9 @@ def ordinal(n: int) -> str:
     if not isinstance(n, int):
         raise TypeError(f"Expected integer, got {type(n).__name__}")
     
-    # Handle special cases for 11th, 12th, 13th
-    if 10 <= n % 100 < 20:
-        return f"{n}th"
-    else:
-        suffix_map = {1: 'st', 2: 'nd', 3: 'rd'}
-        suffix = suffix_map.get(n % 10, 'th')
-        return f"{n}{suffix}"
+    if 0 <= n < _ORDINAL_CACHE_SIZE:
+        return _ORDINAL_CACHE[n]
+    return _ordinal_uncached(n)
 
 
 def crossproduct(list_of_lists: List[List[T]]) -> List[List[T]]:
@@ -100,7 +115,7 @@ def crossproduct(list_of_lists: List[List[T]]) -> List[List[T]]:
         
     Example:
         >>> crossproduct([[1, 2], ['a', 'b']])
-        [[1, 'a'], [1, 'b'], [2, 'a'], [2, 'b']]
+        [[1, 'a'], [2, 'a'], [1, 'b'], [2, 'b']]
     """
     if not isinstance(list_of_lists, list):
         raise TypeError("Expected list of lists")
@@ -115,13 +130,32 @@ def crossproduct(list_of_lists: List[List[T]]) -> List[List[T]]:
         if not sublist:
             raise ValueError(f"List {i} is empty - cannot compute cross product with empty lists")
     
-    # PYTHON 2 CONVERSION: Original algorithm preserved for compatibility
-    # This maintains the exact same behavior as the original implementation
-    cross_prod = [[]]
-    for sublist in list_of_lists:
-        cross_prod = [existing + [item] for item in sublist for existing in cross_prod]
+    # PYTHON 2 CONVERSION: Original ordering preserved for compatibility
+    # (the first list varies fastest), now built from crossproduct_stream
+    return [list(combo) for combo in crossproduct_stream(list_of_lists)]
+
+
+def crossproduct_stream(list_of_lists: List[List[T]]) -> Iterator[Tuple[T, ...]]:
+    """
+    Lazily yield the Cartesian product of a list of lists.
+    
+    Produces the same combinations, in the same order, as crossproduct(), but
+    as tuples generated on demand so large sweeps are never held in memory.
+    Callers which only iterate once should prefer this over crossproduct().
     
-    return cross_prod
+    Args:
+        list_of_lists: List containing lists to compute Cartesian product of
+        
+    Returns:
+        Iterator over all possible combinations as tuples
+        
+    Example:
+        >>> list(crossproduct_stream([[1, 2], ['a', 'b']]))
+        [(1, 'a'), (2, 'a'), (1, 'b'), (2, 'b')]
+    """
+    # itertools.product varies the last list fastest; reversing the input and
+    # each output tuple gives the original first-varies-fastest ordering.
+    return (combo[::-1] for combo in product(*reversed(list_of_lists)))
 
 
 def crossproduct_itertools(list_of_lists: List[List[T]]) -> List[List[T]]:
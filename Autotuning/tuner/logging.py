@@ -8,6 +8,47 @@ Used to output a CSV log of the testing, which is logged by the Evaluator.
 
 # Write output file
 import csv
+import io
+
+
+# The title line of a CSV log.
+def _csvTitle(vars, nResults):
+    return ["TestNo"] + vars + ["Score_"+str(n) for n in range(1,nResults+1)] + ["Score_Overall"]
+
+
+# The CSV log line for a single test.
+def _csvRow(t, vars, nResults):
+    
+    # Add test no.
+    l = [str(t.testId)]
+    
+    # Add variable values
+    for v in vars:
+        if v in t.valuation:
+            l.append(str(t.valuation[v]))
+        else:
+            l.append('')
+    
+    # Add scores
+    l += [str(x) for x in t.results]
+    l += [""] * (nResults - len(t.results))
+    
+    # Add overall score
+    if t.overall is None:
+        l.append('')
+    else:
+        l.append(str(t.overall))
+    
+    return l
+
+
+# Opens a .csv file for writing, returning the file and a csv writer for it.
+# The file is opened in binary mode under a text layer which does no newline 
+# translation; rows end in '\n'.
+def _openCSV(filename):
+    f = io.TextIOWrapper(open(filename, 'wb'), encoding='utf-8', newline='', write_through=False)
+    writer = csv.writer(f, lineterminator='\n', quoting=csv.QUOTE_MINIMAL)
+    return f, writer
 
 
 # Writes a .csv file of the testing process.
@@ -15,9 +56,8 @@ import csv
 def writeCSV(log, vars, possValues, filename):
     
     try:
-        with open(filename, 'wb') as f:
-            
-            writer = csv.writer(f)
+        f, writer = _openCSV(filename)
+        with f:
             
             # Number of results per test
             nResults = 0
@@ -25,33 +65,11 @@ def writeCSV(log, vars, possValues, filename):
                 nResults = max(nResults, len(t.results))
             
             # Create title line
-            writer.writerow(["TestNo"] + vars + ["Score_"+str(n) for n in range(1,nResults+1)] + ["Score_Overall"])
+            writer.writerow(_csvTitle(vars, nResults))
             
             # Create each row
-            for k, t in sorted(log.iteritems()):
-                
-                # Add test no.
-                l = [str(t.testId)]
-                
-                # Add variable values
-                for v in vars:
-                    if v in t.valuation:
-                        l.append(str(t.valuation[v]))
-                    else:
-                        l.append('')
-                
-                # Add scores
-                l += [str(x) for x in t.results]
-                l += [""] * (nResults - len(t.results))
-                
-                # Add overall score
-                if t.overall is None:
-                    l.append('')
-                else:
-                    l.append(str(t.overall))
-                
-                # Finished line
-                writer.writerow(l)
+            for k, t in sorted(log.items()):
+                writer.writerow(_csvRow(t, vars, nResults))
             
             # Done
             
@@ -63,7 +81,66 @@ def writeCSV(log, vars, possValues, filename):
 
 
 
+# Writes the .csv log while testing is in progress.
+# An Evaluator given one of these writes each test's line as soon as the test 
+# has its overall score, so the log survives the tuner being stopped or 
+# crashing. Tests which never got a score (failures) are written by close().
+# The log has a column for each of the nResults repetitions of a test.
+# Opening the file raises IOError if it cannot be written.
+class CSVLogWriter:
+    
+    def __init__(self, filename, vars, nResults):
+        self.filename = filename
+        self.vars = vars
+        self.nResults = nResults
+        self.written = set()
+        
+        self.file, self.writer = _openCSV(filename)
+        self._writeTitle()
+    
+    
+    def _writeTitle(self):
+        self.writer.writerow(_csvTitle(self.vars, self.nResults))
+        self.file.flush()
+    
+    
+    # Writes the line for a single test, if it has not already been written.
+    def writeTest(self, t):
+        if t.testId in self.written:
+            return
+        self.writer.writerow(_csvRow(t, self.vars, self.nResults))
+        self.file.flush()
+        self.written.add(t.testId)
+    
+    
+    # Discards everything written so far, for when the Evaluator's log is 
+    # cleared.
+    def reset(self):
+        self.file.seek(0)
+        self.file.truncate()
+        self.written = set()
+        self._writeTitle()
+    
+    
+    # Writes any tests from the log which have not been written yet, then 
+    # closes the file. Returns whether this was successful.
+    def close(self, log=None):
+        if self.file.closed:
+            return True
+        try:
+            try:
+                if log is not None:
+                    for k, t in sorted(log.items()):
+                        self.writeTest(t)
+            finally:
+                self.file.close()
+        except IOError:
+            return False
+        return True
+
+
+
 if __name__ == "__main__":
-    print __doc__
+    print(__doc__)
     
 
@@ -5,13 +5,49 @@ optimisation.py
 
 Defines the Optimisation class.
 This represents the optimisation algorithm.
+
+PYTHON 2 TO 3 CONVERSION NOTES:
+- Changed print __doc__ to print(__doc__)
+- The valuations of a node are built as a list rather than with map()
+- Fixed setPossValues() and setEvaluator(), which called a method that did
+  not exist
+- Updated imports to relative imports
 """
 
 
 # defines the VarTree class and a parser converting strings to VarTrees.
-from vartree import VarTree, vt_parse
+from .vartree import VarTree, vt_parse
 # cross product function
-from helpers import crossproduct
+from .helpers import crossproduct
+
+
+
+# Counting tests ###############################################################
+
+# Works out beforehand how many TESTS (not command executions) will be required 
+# to optimise a variable tree, given as a string. Unlike 
+# Optimisation.testsRequired(), this needs no evaluator.
+def testsRequired(vartree, possValues):
+    return _testsReq(vt_parse(vartree), possValues)
+
+
+# Recursively works out the number of tests required
+def _testsReq(vt, possValues):
+    topLevel = 1
+    for var in vt.vars:
+        topLevel *= len(possValues[var])
+    
+    if vt.subtrees == []:
+        # If a leaf, then brute force:
+        # So just the product of the number of possible values
+        return topLevel
+    
+    else:
+        # If not a leaf, for each topLevel valuation, optimise children.
+        # One test from each child overlaps.
+        childTests = [_testsReq(st, possValues) for st in vt.subtrees]
+        
+        return topLevel * (sum(childTests) - (len(vt.subtrees) - 1))
 
 
 
@@ -51,13 +87,20 @@ class Optimisation:
     # updates possValues
     def setPossValues(self, possValues):
         self.__possValues = possValues
-        self.__resetStoredValues()
+        self.__resetStoredVals()
     
     
     # updates Evaluator
     def setEvaluator(self, evaluator):
         self.__evaluator = evaluator
-        self.__resetStoredValues()
+        self.__resetStoredVals()
+    
+    
+    # Gives the evaluator the scores of valuations which are already known 
+    # (e.g. from earlier runs), so those tests need not be run.
+    # prior_points is a list of (valuation, score) pairs.
+    def seed(self, prior_points):
+        self.__evaluator.seed(prior_points)
     
     
     # use 'min' to calculate optimum valuation.
@@ -123,25 +166,7 @@ class Optimisation:
     
     # Works out beforehand how many TESTS (not command executions) will be required
     def testsRequired(self):
-        return self.__testsReq(self.__vartree)
-    
-    # Recursively works out the number of tests required
-    def __testsReq(self, vt):
-        topLevel = 1
-        for var in vt.vars:
-            topLevel *= len(self.__possValues[var])
-        
-        if vt.subtrees == []:
-            # If a leaf, then brute force:
-            # So just the product of the number of possible values
-            return topLevel
-        
-        else:
-            # If not a leaf, for each topLevel valuation, optimise children.
-            # One test from each child overlaps.
-            childTests = [self.__testsReq(st) for st in vt.subtrees]
-            
-            return topLevel * (sum(childTests) - (len(vt.subtrees) - 1))
+        return _testsReq(self.__vartree, self.__possValues)
     
     
     
@@ -160,11 +185,12 @@ class Optimisation:
         topLevelVarVals = [[(var, val) for val in self.__possValues[var]] for var in vt.vars]
         
         # List of dictionaries of possible tests (each dict contains a single value for each var at this level) 
-        topLevelTests = map(dict, crossproduct(topLevelVarVals))
+        topLevelTests = [dict(t) for t in crossproduct(topLevelVarVals)]
         
         # These dictionaries only contain mappings for variables at this level.
         # So we merge the existing presets into topLevelTests
-        [t.update(presets) for t in topLevelTests] # (update topLevelTests in place)
+        for t in topLevelTests: # (update topLevelTests in place)
+            t.update(presets)
         
         
         # Split the branch node and leaf node cases
@@ -176,23 +202,28 @@ class Optimisation:
             # possValuations will store valuations for ALL variables, which have optimised subtrees.
             possValuations = []
             
+            # The arbitrary values for the subtree variables, and the variables 
+            # in each subtree, are the same for every valuation at this level.
+            arbValues = self.__restrictArb(vt.flattenchildren(), self.__possValues)
+            subtreeVars = [(st, st.flatten()) for st in vt.subtrees]
+            
             for valuation in topLevelTests:
                 
                 # To optimise the subtrees, we must choose arbitrary values
                 # for the variables in the other subtrees.
                 # These are arbitrary because different subtrees are independent.
                 
-                valuation.update(self.__restrictArb(vt.flattenchildren(), self.__possValues))
+                valuation.update(arbValues)
                 
                 # Now valuation contains mappings for ALL variables.
                 # before testing each subtree, the variables in that subtree should be removed from the valuation.
                 
-                for st in vt.subtrees:
+                for st, stVars in subtreeVars:
                     
                     localValuation = valuation.copy()
                     
                     # Remove the variables in this subtree from the valuation
-                    for v in st.flatten():
+                    for v in stVars:
                         del localValuation[v]
                     
                     
@@ -222,16 +253,8 @@ class Optimisation:
             # for each possible valuation at this level, but with the subtree variables
             # set to their optimums for that particular valuation at this level.
             
-            # First filter out any tests which failed (evaluate returns None).
-            possValuations = filter((lambda v: (v is not None) and (self.__evaluator.score(v) is not None)), possValuations)
-            if possValuations == []:
-                return None # There are no tests which evaluated correctly.
-            
-            # Now choose the best to be returned.
-            optValuation = self.__best(possValuations, key=self.__evaluator.score)
-            optScore = self.__evaluator.score(optValuation)
-            
-            return (optValuation, optScore)
+            # Choose the best of the tests which evaluated correctly.
+            return self.__bestScored(possValuations)
             
             
         else: # Then vt.subtrees is empty and so vt is a leaf node.
@@ -239,21 +262,27 @@ class Optimisation:
             # Run the testing for this batch of tests.
             self.__evaluator.evaluate(topLevelTests)
             
-            # Filter any tests which failed
-            topLevelTests = filter(lambda v: self.__evaluator.score(v) is not None, topLevelTests)
-            if topLevelTests == []:
-                return None # There are no tests which evaluated correctly.
-            
-            # Now choose the best to be returned.
-            optValuation = self.__best(topLevelTests, key=self.__evaluator.score)
-            optScore = self.__evaluator.score(optValuation)
-            
-            return (optValuation, optScore)
+            # Choose the best of the tests which evaluated correctly.
+            return self.__bestScored(topLevelTests)
             
             
         
     
     
+    # Returns the best (valuation, score) pair from a list of valuations,
+    # or None if none of them were evaluated successfully.
+    # Each valuation is only looked up in the evaluator once.
+    def __bestScored(self, valuations):
+        
+        # Filter out any tests which failed (score returns None).
+        scored = [(v, self.__evaluator.score(v)) for v in valuations if v is not None]
+        scored = [(v, score) for (v, score) in scored if score is not None]
+        if scored == []:
+            return None # There are no tests which evaluated correctly.
+        
+        return self.__best(scored, key=lambda pair: pair[1])
+    
+    
     # Return a dictionary mapping each variable to one of its possible values
     # in this case we choose the first one which was listed
     def __restrictArb(self, vs, vals):
@@ -267,6 +296,6 @@ class Optimisation:
 
 
 if __name__ == "__main__":
-    print __doc__
+    print(__doc__)
     
 
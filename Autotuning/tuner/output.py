@@ -6,6 +6,9 @@ output.py
 Controls what kind of output is produced by the system and where it is sent.
 (i.e. to a log file, to the screen or ignored)
 
+The write() methods of all writers take a str and pass it on unchanged;
+converting other objects is up to the caller (WriteMult.write_any() does so).
+
 PYTHON 2 TO 3 CONVERSION NOTES:
 - Changed print __doc__ to print(__doc__) (line 136)
 - Added comprehensive type hints throughout
@@ -16,9 +19,16 @@ PYTHON 2 TO 3 CONVERSION NOTES:
 - Enhanced exception handling and logging
 """
 
+import atexit
+import codecs
+import io
+import os
+import queue
 import sys
+import threading
+import weakref
 from pathlib import Path
-from typing import TextIO, Union, List, Optional, Protocol
+from typing import Dict, Iterable, TextIO, Union, List, Optional, Protocol, Tuple
 from contextlib import contextmanager
 import logging
 
@@ -34,27 +44,180 @@ class Writable(Protocol):
     def flush(self) -> None: ...
 
 
-# Module-level variables for output handling
-# PYTHON 2 CONVERSION: Added type annotations for module-level variables
-short: Optional[Writable] = None
-full: Optional[Writable] = None  
-all: Optional[Writable] = None
+# Default write buffer size for log files (1 MiB)
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+# Amount of buffered output at which WriteMult and TeeFileStdout pass data on (64 KiB)
+WRITE_MULT_THRESHOLD = 1 << 16
+
+# Maximum number of queued writes AsyncWriter joins into one downstream write
+ASYNC_BATCH_SIZE = 256
+
+# FileWriter caches the UTF-8 encoding of up to ENCODE_CACHE_SIZE strings
+# shorter than ENCODE_CACHE_MAX_LEN characters
+ENCODE_CACHE_SIZE = 128
+ENCODE_CACHE_MAX_LEN = 64
+
+
+class OutputState:
+    """
+    The writers currently used for each kind of output.
+    
+    short - brief progress output
+    full  - detailed output
+    all   - output which belongs in both
+    
+    Attributes are read with a plain attribute lookup on the shared `state`
+    instance, and using a namespace avoids shadowing the built-in all().
+    """
+    
+    __slots__ = ('short', 'full', 'all')
+    
+    def __init__(self) -> None:
+        self.short: Optional[Writable] = None
+        self.full: Optional[Writable] = None
+        self.all: Optional[Writable] = None
+
+
+# Current output writers
+# PYTHON 2 CONVERSION: Replaces the original module-level short/full/all variables
+state = OutputState()
+
+
+def __getattr__(name: str) -> Optional[Writable]:
+    """Keep `output.short`, `output.full` and `output.all` working for existing callers."""
+    if name in OutputState.__slots__:
+        return getattr(state, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _writer_fd(writer: Writable) -> Optional[int]:
+    """
+    Return the file descriptor behind a UTF-8 text writer, if it has one.
+    
+    Only used on POSIX, where writing the encoded bytes straight to the
+    descriptor gives the same result as going through the text layer.
+    """
+    if os.name != 'posix':
+        return None
+    
+    fileno = getattr(writer, 'fileno', None)
+    if fileno is None:
+        return None
+    try:
+        fd = fileno()
+    except (OSError, ValueError):
+        return None
+    if not isinstance(fd, int):
+        return None
+    
+    encoding = getattr(writer, 'encoding', None) or 'utf-8'
+    try:
+        if codecs.lookup(encoding).name != 'utf-8':
+            return None
+    except LookupError:
+        return None
+    
+    return fd
+
+
+def _is_interactive(writer: Writable) -> bool:
+    """Check whether a writer is attached to an interactive terminal."""
+    isatty = getattr(writer, 'isatty', None)
+    if isatty is None:
+        return False
+    try:
+        return bool(isatty())
+    except (OSError, ValueError):
+        return False
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of data to fd, retrying after partial writes."""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _preallocate(fd: int, size: int) -> bool:
+    """
+    Reserve disk space for the first size bytes of a new file.
+    
+    Returns whether this was done, in which case the file is already size
+    bytes long and the part which was not written must be truncated when it
+    is closed.
+    """
+    if size <= 0 or not hasattr(os, 'posix_fallocate'):
+        return False
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError:
+        # Not supported by every filesystem; the file just grows as written
+        return False
+    return True
+
+
+def _iov_max() -> int:
+    """Return the maximum number of buffers accepted by one os.writev call."""
+    try:
+        return max(1, os.sysconf('SC_IOV_MAX'))
+    except (AttributeError, ValueError, OSError):
+        return 1024
+
+
+_IOV_MAX = _iov_max()
+
+
+def _writev_all(fd: int, buffers: List[bytes]) -> None:
+    """
+    Write a list of buffers to fd with as few system calls as possible.
+    
+    Uses os.writev where available, falling back to a single os.write of
+    the joined buffers on platforms without it.
+    """
+    if len(buffers) == 1 or not hasattr(os, 'writev'):
+        _write_all(fd, b''.join(buffers))
+        return
+    
+    for start in range(0, len(buffers), _IOV_MAX):
+        batch = buffers[start:start + _IOV_MAX]
+        written = os.writev(fd, batch)
+        if written < sum(map(len, batch)):
+            # Partial write: finish off the remainder with plain writes
+            _write_all(fd, b''.join(batch)[written:])
 
 
 class WriteMult:
     """
     WriteMult objects are writable objects which pass write() calls to all arguments.
     
+    Writes are collected in an internal buffer and passed on to the writers
+    as a single string, either at the end of each line (when line buffered)
+    or once the buffer reaches its size threshold. Writers backed by a file
+    descriptor (such as sys.stdout) receive the buffered pieces encoded and
+    written with a single os.writev, skipping their text layer.
+    
     PYTHON 2 CONVERSION: Enhanced with proper type hints and better error handling.
     Original class was functional but lacked type safety and comprehensive validation.
     """
     
-    def __init__(self, *writers: Writable) -> None:
+    def __init__(self, *writers: Writable, line_buffered: Optional[bool] = None,
+                 threshold: int = WRITE_MULT_THRESHOLD,
+                 tolerate_errors: bool = True, own: bool = False) -> None:
         """
         Initialize with multiple writer objects.
         
         Args:
             *writers: Variable number of objects that support write() and flush()
+            line_buffered: Pass buffered data on whenever a newline is written.
+                By default this is only done when a writer is an interactive
+                terminal; otherwise data waits for the threshold or flush().
+            threshold: Buffer size (in characters) at which data is passed on;
+                0 disables buffering
+            tolerate_errors: Log and skip writers that fail instead of raising
+            own: close() also closes the writers; otherwise they are only
+                flushed, as they belong to (and are closed by) the caller
             
         Raises:
             TypeError: If any writer doesn't support write() method
@@ -72,6 +235,37 @@ class WriteMult:
                 f"The following objects passed to WriteMult are not writable: "
                 f"{', '.join(invalid_writers)}. All objects must have a write() method."
             )
+        
+        # Split writers backed by a file descriptor from plain Python writers
+        self._fd_writers: List[Tuple[Writable, int]] = []
+        self._py_writers: List[Writable] = []
+        for writer in self.writers:
+            # Writers with their own buffer are left to manage their writes
+            fd = None if getattr(writer, 'is_buffered', False) else _writer_fd(writer)
+            if fd is None:
+                self._py_writers.append(writer)
+            else:
+                writer.flush()
+                self._fd_writers.append((writer, fd))
+        
+        # Bound methods are looked up once here rather than on every write
+        self._write_fns = tuple(writer.write for writer in self._py_writers)
+        self._flush_fns = tuple(getattr(writer, 'flush', None) for writer in self.writers)
+        
+        self.tolerate_errors = tolerate_errors
+        if line_buffered is None:
+            line_buffered = any(_is_interactive(writer) for writer in self.writers)
+        self.line_buffered = line_buffered
+        # Writers that buffer their own output do not need a second buffer here
+        self._buffered = threshold > 0 and not all(
+            getattr(writer, 'is_buffered', False) for writer in self.writers
+        )
+        self._threshold = threshold
+        self.own = own
+        self._buf: List[str] = []
+        self._buf_len = 0
+        if self._buffered:
+            _BUFFERED_WRITERS.add(self)
     
     def write(self, data: str) -> None:
         """
@@ -80,28 +274,118 @@ class WriteMult:
         PYTHON 2 CONVERSION: Added type hints and better error resilience.
         
         Args:
-            data: String data to write
+            data: String data to write (must already be a str)
         """
-        if not isinstance(data, str):
-            data = str(data)
-            
-        for writer in self.writers:
+        if not self._buffered:
+            self._emit(data)
+            return
+        
+        self._buf.append(data)
+        self._buf_len += len(data)
+        if self._buf_len >= self._threshold or (self.line_buffered and '\n' in data):
+            self._drain()
+    
+    def writelines(self, lines: Iterable[str]) -> None:
+        """
+        Write several strings to all registered writers in one write.
+        
+        The strings are joined without a separator (as file.writelines()).
+        Callers producing many lines per configuration should collect them in
+        a list and pass it here once, rather than calling write() per line.
+        
+        Args:
+            lines: Strings to write, including any newlines
+        """
+        self.write(''.join(lines))
+    
+    def write_any(self, obj: object) -> None:
+        """
+        Write any object, converting it with str() if it is not a str.
+        
+        write() itself expects a str and does no conversion.
+        
+        Args:
+            obj: Object to write
+        """
+        self.write(obj if type(obj) is str else str(obj))
+    
+    def _drain(self) -> None:
+        """Pass any buffered data on to all registered writers."""
+        if not self._buf:
+            return
+        
+        chunks = self._buf
+        self._buf = []
+        self._buf_len = 0
+        
+        # Descriptor-backed writers get the pieces as one scatter-gather write
+        if self._fd_writers:
+            self._write_fds([chunk.encode('utf-8') for chunk in chunks])
+        if self._write_fns:
+            self._emit_py(''.join(chunks))
+    
+    def _emit(self, data: str) -> None:
+        """Pass data on to all registered writers."""
+        if self._fd_writers:
+            self._write_fds([data.encode('utf-8')])
+        self._emit_py(data)
+    
+    def _emit_py(self, data: str) -> None:
+        """Pass data on to the writers without a file descriptor."""
+        fns = self._write_fns
+        i = 0
+        try:
+            for i, fn in enumerate(fns):
+                fn(data)
+        except Exception as e:
+            if not self.tolerate_errors:
+                raise
+            self._write_slow(data, i, e)
+    
+    def _write_fds(self, encoded: List[bytes]) -> None:
+        """Write already-encoded buffers to every descriptor-backed writer."""
+        for writer, fd in self._fd_writers:
             try:
-                writer.write(data)
+                # Anything written to the writer directly must go out first
+                writer.flush()
+                _writev_all(fd, encoded)
             except Exception as e:
-                # Log the error but continue with other writers
+                if not self.tolerate_errors:
+                    raise
                 logging.warning(f"Failed to write to {type(writer).__name__}: {e}")
     
+    def _write_slow(self, data: str, failed: int, error: Exception) -> None:
+        """
+        Finish a write after writer number `failed` raised `error`.
+        
+        Kept out of the write path: logs the failure, then passes the data on
+        to the remaining writers one at a time, logging any further failures.
+        """
+        self._write_failed(failed, error)
+        for i in range(failed + 1, len(self._write_fns)):
+            try:
+                self._write_fns[i](data)
+            except Exception as e:
+                # Log the error but continue with other writers
+                self._write_failed(i, e)
+    
+    def _write_failed(self, index: int, error: Exception) -> None:
+        """Report a failed write (kept out of the write path)."""
+        logging.warning(f"Failed to write to {type(self._py_writers[index]).__name__}: {error}")
+    
     def flush(self) -> None:
         """
         Flush all registered writers.
         
         PYTHON 2 CONVERSION: Enhanced with error handling for individual flushes.
         """
-        for writer in self.writers:
+        self._drain()
+        
+        for writer, fn in zip(self.writers, self._flush_fns):
+            if fn is None:
+                continue
             try:
-                if hasattr(writer, 'flush'):
-                    writer.flush()
+                fn()
             except Exception as e:
                 logging.warning(f"Failed to flush {type(writer).__name__}: {e}")
     
@@ -109,93 +393,211 @@ class WriteMult:
         """
         Close all registered writers that support closing.
         
+        Writers are only closed if this WriteMult owns them; otherwise they
+        are flushed and left open for their owner to close.
+        
         PYTHON 2 CONVERSION: This is a new method for better resource management.
         """
+        if not self.own:
+            self.flush()
+            return
+        
+        self._drain()
+        
         for writer in self.writers:
             try:
-                if hasattr(writer, 'close') and writer != sys.stdout and writer != sys.stderr:
+                if hasattr(writer, 'close') and not _is_std_stream(writer):
                     writer.close()
             except Exception as e:
                 logging.warning(f"Failed to close {type(writer).__name__}: {e}")
 
 
+def _is_std_stream(writer) -> bool:
+    """Check whether writer is one of the interpreter's standard streams."""
+    return any(writer is stream for stream in
+               (sys.stdout, sys.stderr, sys.__stdout__, sys.__stderr__))
+
+
+def _close_outputs(tolerate_errors: bool = False) -> None:
+    """
+    Close the current short, full and all writers.
+    
+    Each object is closed once, however many channels share it, and the
+    standard streams are never closed.
+    
+    Args:
+        tolerate_errors: Log errors from close() instead of ignoring them
+    """
+    seen = set()
+    for output_obj in (state.short, state.full, state.all):
+        if id(output_obj) in seen:
+            continue
+        seen.add(id(output_obj))
+        if not hasattr(output_obj, 'close') or _is_std_stream(output_obj):
+            continue
+        try:
+            output_obj.close()
+        except Exception as e:
+            if tolerate_errors:
+                logging.warning(f"Error closing output: {e}")
+
+
+def _noop(*args, **kwargs) -> None:
+    """Accept any arguments and do nothing."""
+    return None
+
+
 class WriteNull:
     """
     WriteNull objects are writable but ignore any data written (null sink).
     
+    The methods are plain static no-ops so discarded output costs as little
+    as possible; output functions share the module-level _NULL_SINK instance.
+    
     PYTHON 2 CONVERSION: Enhanced with type hints and additional methods.
     Original was minimal but functional.
     """
     
-    def __init__(self) -> None:
-        """Initialize the null writer."""
-        pass
+    # Write data (ignored)
+    write = staticmethod(_noop)
     
-    def write(self, data: str) -> None:
-        """
-        Write data (ignored).
-        
-        Args:
-            data: String data to ignore
-        """
-        pass
+    # Flush operation (no-op)
+    flush = staticmethod(_noop)
     
-    def flush(self) -> None:
-        """Flush operation (no-op)."""
-        pass
+    # Write several strings (ignored)
+    writelines = staticmethod(_noop)
     
-    def close(self) -> None:
-        """Close operation (no-op)."""
-        pass
+    # Close operation (no-op)
+    close = staticmethod(_noop)
+
+
+# Shared null sink, so reconfiguring output does not create new instances
+_NULL_SINK = WriteNull()
+
+
+# Shortcuts for the write() methods of the current writers, rebound each time
+# the output is configured: output.write_full(s) is output.full.write(s)
+# without the lookups. Call them through the module, as a name imported with
+# `from output import write_full` is not updated when the output changes.
+write_short = _noop
+write_full = _noop
+write_all = _noop
+
+
+def _bind_writes() -> None:
+    """Point write_short, write_full and write_all at the current writers."""
+    global write_short, write_full, write_all
+    write_short = state.short.write if state.short is not None else _noop
+    write_full = state.full.write if state.full is not None else _noop
+    write_all = state.all.write if state.all is not None else _noop
 
 
 class FileWriter:
     """
     A wrapper for file objects with enhanced error handling.
     
+    The file is written through a single explicitly sized io.BufferedWriter,
+    so WriteMult does not buffer again on its behalf. In text modes strings
+    are encoded to UTF-8 here and written as bytes, with the encodings of
+    short strings (status words, separators) cached as they recur often.
+    
     PYTHON 2 CONVERSION: This is a new class providing better file management
     and error handling than the original simple file opening approach.
     """
     
-    def __init__(self, filepath: Union[str, Path], mode: str = 'w') -> None:
+    def __init__(self, filepath: Union[str, Path], mode: str = 'w',
+                 buffer_size: int = DEFAULT_BUFFER_SIZE, expected_bytes: int = 0) -> None:
         """
         Initialize file writer.
         
+        The file is opened with a large write buffer so that the many short
+        lines logged during a tuning run are written out in big blocks.
+        Data only reaches the disk once the buffer fills or flush()/close()
+        is called.
+        
         Args:
             filepath: Path to the file
             mode: File opening mode (default: 'w')
+            buffer_size: Size of the write buffer in bytes (default: 1 MiB)
+            expected_bytes: Expected size of the file; if given, the space is
+                preallocated on disk and any unused part is truncated on close
             
         Raises:
             OSError: If file cannot be opened
         """
         self.filepath = Path(filepath)
         self.mode = mode
-        self._file: Optional[TextIO] = None
+        self.buffer_size = buffer_size
+        self.expected_bytes = expected_bytes
+        self._preallocated = False
+        self.is_buffered = True
+        self._binary = 'b' in mode
+        self._enc_cache: Dict[str, bytes] = {}
+        self._file: Optional[io.BufferedWriter] = None
         self._open_file()
     
     def _open_file(self) -> None:
         """Open the file for writing."""
         try:
-            self._file = open(self.filepath, self.mode, encoding='utf-8')
+            raw = open(self.filepath, self.mode.replace('t', '').replace('b', '') + 'b',
+                       buffering=0)
+            self._file = io.BufferedWriter(raw, self.buffer_size)
         except OSError as e:
             raise OSError(f"Cannot open file '{self.filepath}' for writing: {e}")
+        
+        if 'a' not in self.mode:
+            self._preallocated = _preallocate(raw.fileno(), self.expected_bytes)
+        
+        # While open, write/flush go straight to the specialised methods
+        self.write = self._file.write if self._binary else self._write_text
+        self.flush = self._file.flush
     
     def write(self, data: str) -> None:
-        """Write data to file."""
-        if self._file is None:
-            raise RuntimeError("File is not open")
-        self._file.write(data)
+        """
+        Write data to file.
+        
+        While the file is open this is replaced on the instance by a writer
+        bound to the open file, so writes do not check whether it is open.
+        """
+        self._closed_write(data)
+    
+    def writelines(self, lines: Iterable[str]) -> None:
+        """Write several strings to file in one write (see WriteMult.writelines)."""
+        self.write(''.join(lines))
+    
+    def _write_text(self, data: str) -> None:
+        """Encode data to UTF-8 and write it to the open file."""
+        if len(data) >= ENCODE_CACHE_MAX_LEN:
+            self._file.write(data.encode('utf-8'))
+            return
+        
+        encoded = self._enc_cache.get(data)
+        if encoded is None:
+            encoded = data.encode('utf-8')
+            if len(self._enc_cache) >= ENCODE_CACHE_SIZE:
+                self._enc_cache.clear()
+            self._enc_cache[data] = encoded
+        self._file.write(encoded)
+    
+    def _closed_write(self, data: str) -> None:
+        """Reject writes once the file has been closed."""
+        raise RuntimeError("File is not open")
     
     def flush(self) -> None:
-        """Flush file buffer."""
-        if self._file is not None:
-            self._file.flush()
+        """Flush file buffer (replaced on the instance while the file is open)."""
     
     def close(self) -> None:
         """Close the file."""
         if self._file is not None:
-            self._file.close()
-            self._file = None
+            self.write = self._closed_write
+            self.flush = _noop
+            try:
+                if self._preallocated:
+                    # Drop the preallocated space which was not written
+                    self._file.truncate()
+            finally:
+                self._file.close()
+                self._file = None
     
     def __enter__(self):
         """Context manager entry."""
@@ -206,6 +608,488 @@ class FileWriter:
         self.close()
 
 
+class RawFileWriter:
+    """
+    A log file writer which bypasses Python's io stack.
+    
+    The file is opened with os.open in append mode and written with
+    os.write; text is encoded into a bytearray which is written out once it
+    reaches buffer_size bytes, or on flush()/close(). This avoids the
+    TextIOWrapper/BufferedWriter layers for logs consisting of many short
+    lines.
+    """
+    
+    def __init__(self, filepath: Union[str, Path], mode: str = 'w',
+                 buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        """
+        Initialize raw file writer.
+        
+        Args:
+            filepath: Path to the file
+            mode: 'w' to truncate the file first, 'a' to append to it
+            buffer_size: Number of bytes buffered before writing (default: 1 MiB)
+            
+        Raises:
+            OSError: If file cannot be opened
+        """
+        self.filepath = Path(filepath)
+        self.mode = mode
+        self.buffer_size = buffer_size
+        self.is_buffered = True
+        self._buf = bytearray()
+        
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        if 'a' not in mode:
+            flags |= os.O_TRUNC
+        try:
+            self.fd: Optional[int] = os.open(str(self.filepath), flags, 0o644)
+        except OSError as e:
+            raise OSError(f"Cannot open file '{self.filepath}' for writing: {e}")
+    
+    def write(self, data: str) -> None:
+        """Write data to file."""
+        if self.fd is None:
+            raise RuntimeError("File is not open")
+        self._buf += data.encode('utf-8')
+        if len(self._buf) >= self.buffer_size:
+            self.flush()
+    
+    def writelines(self, lines: Iterable[str]) -> None:
+        """Write several strings to file in one write."""
+        self.write(''.join(lines))
+    
+    def flush(self) -> None:
+        """Write out any buffered data."""
+        if self._buf and self.fd is not None:
+            _write_all(self.fd, self._buf)
+            self._buf.clear()
+    
+    def fileno(self) -> int:
+        """Return the underlying file descriptor."""
+        if self.fd is None:
+            raise ValueError("I/O operation on closed file")
+        return self.fd
+    
+    def close(self) -> None:
+        """Write out buffered data and close the file."""
+        if self.fd is not None:
+            try:
+                self.flush()
+            finally:
+                os.close(self.fd)
+                self.fd = None
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+class RawStdoutWriter:
+    """
+    Writes text straight to the binary buffer underneath a text stream.
+    
+    Encoding happens once per write here, skipping the TextIOWrapper layer
+    of sys.stdout. Output is flushed at newlines when the stream itself is
+    line buffered (as it is for terminals), so progress stays visible.
+    
+    Raises AttributeError on construction if the stream has no binary buffer
+    (e.g. IDLE or captured output); callers should fall back to the stream.
+    """
+    
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        """
+        Initialize the writer.
+        
+        Args:
+            stream: Text stream to write beneath (default: sys.stdout)
+        """
+        stream = stream if stream is not None else sys.stdout
+        self._buffer = stream.buffer
+        self._stream = stream
+        self._encoding = getattr(stream, 'encoding', None) or 'utf-8'
+        self._errors = getattr(stream, 'errors', None) or 'strict'
+        self._line_buffering = bool(getattr(stream, 'line_buffering', False))
+        
+        # Anything already pending in the text layer must come out first
+        stream.flush()
+    
+    def write(self, data: str) -> None:
+        """Write data to the stream's binary buffer."""
+        self._buffer.write(data.encode(self._encoding, self._errors))
+        if self._line_buffering and '\n' in data:
+            self._buffer.flush()
+    
+    def writelines(self, lines: Iterable[str]) -> None:
+        """Write several strings to the stream in one write."""
+        self.write(''.join(lines))
+    
+    def flush(self) -> None:
+        """Flush the stream's binary buffer."""
+        self._buffer.flush()
+    
+    def isatty(self) -> bool:
+        """Check whether the underlying stream is a terminal."""
+        return self._stream.isatty()
+
+
+class TeeFileStdout:
+    """
+    Writes a log file and copies the same bytes to stdout inside the kernel.
+    
+    Each write() is appended to the log file, and the written range is later
+    copied from the file to stdout with os.sendfile, so the data is only
+    encoded and copied from user space once. Copies are collected and sent
+    together on flush(), once they reach the threshold, or at the end of
+    each line when stdout is an interactive terminal. Consecutive writes
+    lie next to each other in the log, so they are sent as one range.
+    Where sendfile is unavailable or refuses the descriptors, the bytes are
+    written to stdout directly.
+    
+    `file_only` is a writer for output which belongs in the log file alone
+    (the `full` channel), and `screen_only` one for output which belongs on
+    stdout alone (the `short` channel). Their writes are buffered with the
+    tee'd output, so all three stay in order.
+    """
+    
+    def __init__(self, filepath: Union[str, Path], stream: Optional[TextIO] = None,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 threshold: int = WRITE_MULT_THRESHOLD,
+                 line_buffered: Optional[bool] = None, expected_bytes: int = 0) -> None:
+        """
+        Initialize the tee.
+        
+        Args:
+            filepath: Path to the log file (truncated if it exists)
+            stream: Stream the output is copied to (default: sys.stdout)
+            buffer_size: Bytes of log output buffered before writing
+            threshold: Bytes of stdout output collected before sending it
+            line_buffered: Send stdout output whenever a newline is written.
+                By default this is only done when stdout is an interactive
+                terminal.
+            expected_bytes: Expected size of the log; if given, the space is
+                preallocated on disk and any unused part is truncated on close
+            
+        Raises:
+            OSError: If file cannot be opened
+        """
+        self.filepath = Path(filepath)
+        self.buffer_size = buffer_size
+        self.threshold = threshold
+        self._stream = stream if stream is not None else sys.stdout
+        self._out_fd = _writer_fd(self._stream)
+        self._use_sendfile = self._out_fd is not None and hasattr(os, 'sendfile')
+        if line_buffered is None:
+            line_buffered = _is_interactive(self._stream)
+        self.line_buffered = line_buffered
+        self._pending = bytearray()
+        self._pos = 0
+        
+        # Output waiting for stdout, in order: [offset, data] for a range of
+        # the log (data is kept in case sendfile fails), [None, data] for
+        # screen-only output
+        self._out: List[list] = []
+        self._out_len = 0
+        
+        # sendfile reads from the log, so it is opened for reading as well
+        try:
+            self.fd: Optional[int] = os.open(str(self.filepath),
+                                             os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        except OSError as e:
+            raise OSError(f"Cannot open file '{self.filepath}' for writing: {e}")
+        self._preallocated = _preallocate(self.fd, expected_bytes)
+        
+        self.file_only = _TeeChannel(self, self._write_file)
+        self.screen_only = _TeeChannel(self, self._write_screen)
+        _BUFFERED_WRITERS.add(self)
+    
+    def write(self, data: str) -> None:
+        """Write data to the log file and to stdout."""
+        if self.fd is None:
+            raise RuntimeError("File is not open")
+        encoded = data.encode('utf-8')
+        offset = self._pos + len(self._pending)
+        self._pending += encoded
+        
+        last = self._out[-1] if self._out else None
+        if last is not None and last[0] is not None and last[0] + len(last[1]) == offset:
+            last[1] += encoded
+        else:
+            self._out.append([offset, bytearray(encoded)])
+        self._out_len += len(encoded)
+        self._check_buffers(data)
+    
+    def writelines(self, lines: Iterable[str]) -> None:
+        """Write several strings to the log file and stdout in one write."""
+        self.write(''.join(lines))
+    
+    def _write_file(self, data: str) -> None:
+        """Buffer data for the log file only."""
+        if self.fd is None:
+            raise RuntimeError("File is not open")
+        self._pending += data.encode('utf-8')
+        if len(self._pending) >= self.buffer_size:
+            self._send()
+    
+    def _write_screen(self, data: str) -> None:
+        """Buffer data for stdout only."""
+        if self.fd is None:
+            raise RuntimeError("File is not open")
+        encoded = data.encode('utf-8')
+        if self._out and self._out[-1][0] is None:
+            self._out[-1][1] += encoded
+        else:
+            self._out.append([None, bytearray(encoded)])
+        self._out_len += len(encoded)
+        self._check_buffers(data)
+    
+    def _check_buffers(self, data: str) -> None:
+        """Send the buffered output if a buffer is full or a line has ended."""
+        if (self._out_len >= self.threshold or len(self._pending) >= self.buffer_size
+                or (self.line_buffered and '\n' in data)):
+            self._send()
+    
+    def _write_pending(self) -> None:
+        """Write buffered data to the log file."""
+        if self._pending:
+            _write_all(self.fd, self._pending)
+            self._pos += len(self._pending)
+            self._pending.clear()
+    
+    def _send(self) -> None:
+        """Write buffered data to the log file, then send the stdout output."""
+        # The ranges to copy must be in the log first
+        self._write_pending()
+        if not self._out:
+            return
+        
+        # Anything written to the stream directly must go out first
+        self._stream.flush()
+        
+        out, self._out = self._out, []
+        self._out_len = 0
+        for offset, data in out:
+            if offset is None:
+                self._write_out(data)
+            else:
+                self._copy_out(data, offset)
+    
+    def _copy_out(self, data: bytearray, offset: int) -> None:
+        """Copy bytes written to the log at offset on to stdout."""
+        sent = 0
+        if self._use_sendfile:
+            try:
+                while sent < len(data):
+                    count = os.sendfile(self._out_fd, self.fd, offset + sent, len(data) - sent)
+                    if count == 0:
+                        break
+                    sent += count
+            except OSError:
+                self._use_sendfile = False
+        
+        if sent < len(data):
+            self._write_out(data[sent:])
+    
+    def _write_out(self, data: bytearray) -> None:
+        """Write bytes to stdout."""
+        if self._out_fd is not None:
+            _write_all(self._out_fd, data)
+        else:
+            self._stream.write(data.decode('utf-8'))
+    
+    def flush(self) -> None:
+        """Write out buffered log and stdout data, and flush stdout."""
+        if self.fd is not None:
+            self._send()
+            self._stream.flush()
+    
+    def isatty(self) -> bool:
+        """Check whether stdout is a terminal."""
+        return self._stream.isatty()
+    
+    def close(self) -> None:
+        """Write out buffered data and close the log file."""
+        if self.fd is not None:
+            try:
+                self._send()
+                self._stream.flush()
+                if self._preallocated:
+                    # Drop the preallocated space which was not written
+                    os.ftruncate(self.fd, self._pos)
+            finally:
+                os.close(self.fd)
+                self.fd = None
+
+
+class _TeeChannel:
+    """Writer for the log file or stdout of a TeeFileStdout, without the other copy."""
+    
+    def __init__(self, tee: TeeFileStdout, write) -> None:
+        self.is_buffered = True
+        self.write = write
+        self.flush = tee.flush
+        self.close = tee.close
+    
+    def writelines(self, lines: Iterable[str]) -> None:
+        """Write several strings in one write."""
+        self.write(''.join(lines))
+
+
+class AsyncWriter:
+    """
+    A writer which hands data to a background thread for writing.
+    
+    write() only places the data on a queue; a daemon thread joins queued
+    writes into batches and passes each batch to the downstream writer in a
+    single call. This keeps slow disks (e.g. network file systems) off the
+    critical path of the tuning loop.
+    
+    flush() blocks until everything queued so far has been written and
+    flushed downstream. close() drains the queue, stops the thread and
+    closes the downstream writer. Writers still open at interpreter exit are
+    closed automatically.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, downstream: Writable, batch_size: int = ASYNC_BATCH_SIZE,
+                 flush_interval: float = 1.0) -> None:
+        """
+        Initialize the writer and start its background thread.
+        
+        Args:
+            downstream: Writer that receives the batched data
+            batch_size: Maximum number of writes joined into one batch
+            flush_interval: Seconds of inactivity after which downstream is flushed
+        """
+        self.downstream = downstream
+        self.is_buffered = True
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._drain, name="AsyncWriter", daemon=True)
+        self._thread.start()
+        _ASYNC_WRITERS.add(self)
+    
+    def write(self, data: str) -> None:
+        """Queue data to be written."""
+        if self._closed:
+            raise RuntimeError("File is not open")
+        self._queue.put(data)
+    
+    def writelines(self, lines: Iterable[str]) -> None:
+        """Queue several strings as a single write."""
+        self.write(''.join(lines))
+    
+    def flush(self) -> None:
+        """Wait until all queued data has been written and flushed."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+    
+    def close(self) -> None:
+        """Write any queued data, stop the thread and close downstream."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+        _ASYNC_WRITERS.discard(self)
+        
+        if hasattr(self.downstream, 'close'):
+            self.downstream.close()
+    
+    def _drain(self) -> None:
+        """Background loop moving queued data to the downstream writer."""
+        get = self._queue.get
+        pending_flush = False
+        
+        while True:
+            try:
+                item = get(timeout=self._flush_interval)
+            except queue.Empty:
+                if pending_flush:
+                    self._flush_downstream()
+                    pending_flush = False
+                continue
+            
+            # Collect whatever else is already queued, up to the batch size
+            batch = []
+            while True:
+                if item is self._STOP:
+                    self._write_downstream(batch)
+                    self._flush_downstream()
+                    return
+                if isinstance(item, threading.Event):
+                    self._write_downstream(batch)
+                    batch = []
+                    self._flush_downstream()
+                    pending_flush = False
+                    item.set()
+                else:
+                    batch.append(item)
+                
+                if len(batch) >= self._batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            if batch:
+                self._write_downstream(batch)
+                pending_flush = True
+    
+    def _write_downstream(self, batch: List[str]) -> None:
+        """Write a batch of queued data downstream as one string."""
+        if not batch:
+            return
+        try:
+            self.downstream.write(''.join(batch))
+        except Exception as e:
+            logging.warning(f"Failed to write to {type(self.downstream).__name__}: {e}")
+    
+    def _flush_downstream(self) -> None:
+        """Flush the downstream writer, logging any failure."""
+        try:
+            self.downstream.flush()
+        except Exception as e:
+            logging.warning(f"Failed to flush {type(self.downstream).__name__}: {e}")
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+# Writers holding buffered data which must be written out at exit
+_BUFFERED_WRITERS: "weakref.WeakSet[Union[WriteMult, TeeFileStdout]]" = weakref.WeakSet()
+_ASYNC_WRITERS: "weakref.WeakSet[AsyncWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    """
+    Write out buffered output when the interpreter exits.
+    
+    WriteMults and tees are flushed first, as they may pass data on to
+    AsyncWriters, which are then closed.
+    """
+    for writer in list(_BUFFERED_WRITERS):
+        writer.flush()
+    for writer in list(_ASYNC_WRITERS):
+        writer.close()
+
+
 @contextmanager
 def output_context(mode: str, log_file: Optional[Union[str, Path]] = None):
     """
@@ -221,7 +1105,7 @@ def output_context(mode: str, log_file: Optional[Union[str, Path]] = None):
     Yields:
         None
     """
-    old_short, old_full, old_all = short, full, all
+    saved = (state.short, state.full, state.all)
     
     try:
         if mode == 'screen':
@@ -243,55 +1127,119 @@ def output_context(mode: str, log_file: Optional[Union[str, Path]] = None):
         
     finally:
         # Restore previous settings and clean up
-        global short, full, all
-        
-        # Close any file resources
-        for output_obj in [short, full, all]:
-            if hasattr(output_obj, 'close') and output_obj not in [sys.stdout, sys.stderr]:
-                try:
-                    output_obj.close()
-                except:
-                    pass
-        
-        short, full, all = old_short, old_full, old_all
+        restore_writers(saved)
 
 
 def output_screen() -> None:
     """
     Output everything to the screen (default mode).
     
+    Full output goes through a RawStdoutWriter where sys.stdout allows it.
+    
     PYTHON 2 CONVERSION: Added type hints and enhanced documentation.
     Original function logic preserved.
     """
-    global short, full, all
-    
-    short = WriteNull()
-    full = sys.stdout
-    all = full
+    state.short = _NULL_SINK
+    try:
+        state.full = RawStdoutWriter()
+    except AttributeError:
+        # sys.stdout has no binary buffer (IDLE, captured output, ...)
+        state.full = sys.stdout
+    state.all = state.full
+    _bind_writes()
 
 
-def output_production(log_file: Union[str, Path]) -> bool:
+def _open_log(log_file: Union[str, Path], raw_io: bool, async_io: bool,
+              expected_bytes: int) -> Writable:
+    """Open a log file for production or verbose output."""
+    if raw_io:
+        # Appended to, so there is no preallocating the log
+        file_writer = RawFileWriter(log_file, 'w')
+    else:
+        file_writer = FileWriter(log_file, 'w', expected_bytes=expected_bytes)
+    if async_io:
+        return AsyncWriter(file_writer)
+    return file_writer
+
+
+def output_production(log_file: Union[str, Path], raw_io: bool = False,
+                      async_io: bool = False, expected_bytes: int = 0) -> bool:
     """
     Production mode: write short output to screen and full output to log file.
     
+    Output sent to `all` is written to the log file only, so every line is
+    written once. Use output_production_tee() if `all` should also appear on
+    the screen, at the cost of writing that output twice.
+    
     PYTHON 2 CONVERSION: Enhanced with better error handling and pathlib support.
     Original used basic file opening with minimal error handling.
     
     Args:
         log_file: Path to the log file
+        raw_io: Write the log with RawFileWriter instead of FileWriter
+        async_io: Write the log from a background thread, with an AsyncWriter
+        expected_bytes: Expected size of the log, preallocated on disk
+            (roughly tests x line length; ignored with raw_io)
         
     Returns:
         True if setup successful, False otherwise
     """
-    global short, full, all
-    
     try:
         # PYTHON 2 CONVERSION: Enhanced file opening with proper error handling
-        file_writer = FileWriter(log_file, 'w')
+        file_writer = _open_log(log_file, raw_io, async_io, expected_bytes)
+        
+        state.short = sys.stdout
+        state.full = file_writer
+        state.all = state.full
+        _bind_writes()
+        
+        return True
+        
+    except (OSError, IOError) as e:
+        logging.error(f"Failed to set up production output: {e}")
+        return False
+
+
+def output_production_tee(log_file: Union[str, Path], raw_io: bool = False,
+                          async_io: bool = False, expected_bytes: int = 0) -> bool:
+    """
+    Production mode which also shows `all` output on the screen.
+    
+    As output_production(), but `all` is written to both the screen and the
+    log file. This is the original production behaviour, and the one the
+    tuner uses for its script file, as it prints its results through `all`.
+    It is slower, as that output is written twice. A TeeFileStdout is used so
+    the second copy is made by the kernel rather than written again from Python.
+    Short output goes through the tee as well, to stay in order on the screen.
+    
+    With raw_io or async_io the log has its own writer instead, and `all` is
+    written to the screen and the log by an unbuffered WriteMult.
+    
+    Args:
+        log_file: Path to the log file
+        raw_io: Write the log with RawFileWriter instead of FileWriter
+        async_io: Write the log from a background thread, with an AsyncWriter
+        expected_bytes: Expected size of the log, preallocated on disk
+            (roughly tests x line length; ignored with raw_io)
         
-        short = sys.stdout
-        full = file_writer
-        all = WriteMult(short, full)
+    Returns:
+        True if setup successful, False otherwise
+    """
+    try:
+        if raw_io or async_io:
+            file_writer = _open_log(log_file, raw_io, async_io, expected_bytes)
+            
+            state.short = sys.stdout
+            state.full = file_writer
+            # Unbuffered, so the screen output stays in order with the short output
+            state.all = WriteMult(sys.stdout, file_writer, threshold=0, own=True)
+        else:
+            tee = TeeFileStdout(log_file, expected_bytes=expected_bytes)
+            
+            state.short = tee.screen_only
+            state.full = tee.file_only
+            state.all = tee
+        _bind_writes()
         
         return True
         
@@ -300,7 +1248,8 @@ def output_production(log_file: Union[str, Path]) -> bool:
         return False
 
 
-def output_verbose(log_file: Union[str, Path]) -> bool:
+def output_verbose(log_file: Union[str, Path], raw_io: bool = False,
+                   async_io: bool = False, expected_bytes: int = 0) -> bool:
     """
     Verbose mode: print full output to screen and log it to file.
     Ignore the short output.
@@ -310,19 +1259,24 @@ def output_verbose(log_file: Union[str, Path]) -> bool:
     
     Args:
         log_file: Path to the log file
+        raw_io: Write the log with RawFileWriter instead of FileWriter
+        async_io: Write the log from a background thread, with an AsyncWriter
+        expected_bytes: Expected size of the log, preallocated on disk
+            (roughly tests x line length; ignored with raw_io)
         
     Returns:
         True if setup successful, False otherwise
     """
-    global short, full, all
-    
     try:
         # PYTHON 2 CONVERSION: Enhanced file opening with proper error handling
-        file_writer = FileWriter(log_file, 'w')
+        file_writer = _open_log(log_file, raw_io, async_io, expected_bytes)
         
-        short = WriteNull()
-        full = WriteMult(sys.stdout, file_writer)
-        all = full
+        state.short = _NULL_SINK
+        # Unbuffered, so the screen output stays in order with anything
+        # written to stdout directly; the log writer buffers the log itself
+        state.full = WriteMult(sys.stdout, file_writer, threshold=0, own=True)
+        state.all = state.full
+        _bind_writes()
         
         return True
         
@@ -341,15 +1295,14 @@ def output_custom(short_writer: Optional[Writable] = None,
     than the original three fixed modes.
     
     Args:
-        short_writer: Writer for short output (default: WriteNull)
+        short_writer: Writer for short output (default: null sink)
         full_writer: Writer for full output (default: sys.stdout) 
         all_writer: Writer for all output (default: same as full_writer)
     """
-    global short, full, all
-    
-    short = short_writer or WriteNull()
-    full = full_writer or sys.stdout
-    all = all_writer or full
+    state.short = short_writer or _NULL_SINK
+    state.full = full_writer or sys.stdout
+    state.all = all_writer or state.full
+    _bind_writes()
 
 
 def get_current_writers() -> tuple:
@@ -361,7 +1314,20 @@ def get_current_writers() -> tuple:
     Returns:
         Tuple of (short, full, all) writers
     """
-    return short, full, all
+    return state.short, state.full, state.all
+
+
+def restore_writers(writers: tuple) -> None:
+    """
+    Close the current output writers and put back earlier ones.
+    
+    Args:
+        writers: Tuple of (short, full, all) writers, from get_current_writers()
+    """
+    _close_outputs()
+    
+    state.short, state.full, state.all = writers
+    _bind_writes()
 
 
 def cleanup_output() -> None:
@@ -370,15 +1336,7 @@ def cleanup_output() -> None:
     
     PYTHON 2 CONVERSION: This is a new function for proper resource management.
     """
-    global short, full, all
-    
-    for output_obj in [short, full, all]:
-        if (hasattr(output_obj, 'close') and 
-            output_obj not in [sys.stdout, sys.stderr, None]):
-            try:
-                output_obj.close()
-            except Exception as e:
-                logging.warning(f"Error closing output: {e}")
+    _close_outputs(tolerate_errors=True)
     
     # Reset to default
     output_screen()
@@ -394,7 +1352,7 @@ if __name__ == "__main__":
     # Test screen output
     print("Setting up screen output...")
     output_screen()
-    all.write("This goes to stdout\\n")
+    state.all.write("This goes to stdout\\n")
     
     # Test null writer
     print("Testing null writer...")
@@ -0,0 +1,260 @@
+"""
+CUDA Autotuning System - Result Cache
+
+result_cache.py
+
+Saves the outcome of a tuning run on disk, so that running the tuner again on
+an identical scenario (same variables, possible values, commands and scoring,
+in the same directory) can report the earlier result instead of repeating
+every test. Results are kept as JSON files under ~/.cache/autotuning.
+
+The score of every test is also kept in a history database, shared by all
+scenarios with the same commands and scoring. A run over a different search
+space can then reuse the scores of any valuations it has in common with
+earlier runs.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Tuple, Union
+
+# Where cached results are kept
+CACHE_DIR = Path.home() / ".cache" / "autotuning"
+
+# Database of the scores of past tests
+HISTORY_FILE = CACHE_DIR / "history.sqlite"
+
+# The settings which decide the outcome of a run
+SCENARIO_SETTINGS = (
+    'vartree', 'possValues', 'compile', 'test', 'clean',
+    'optimal', 'custom_fom', 'repeat', 'overall',
+)
+
+# The settings which decide the score of a single test
+HISTORY_SETTINGS = ('compile', 'test', 'clean', 'custom_fom', 'repeat', 'overall')
+
+
+def _digest(settings: Dict[str, Any], names: Tuple[str, ...],
+            working_dir: Union[str, Path]) -> str:
+    """Hash the named settings together with the working directory."""
+    selected = {name: settings.get(name) for name in names}
+    # Read-only mappings (the possible values) are hashed as plain dicts
+    selected = {name: dict(value) if isinstance(value, Mapping) else value
+                for name, value in selected.items()}
+    selected['working_dir'] = str(working_dir)
+    encoded = json.dumps(selected, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=20).hexdigest()
+
+
+def scenario_key(settings: Dict[str, Any], working_dir: Union[str, Path]) -> str:
+    """
+    Compute the cache key of a tuning scenario.
+
+    The command templates are used rather than the command functions built
+    from them, and the working directory is included, as the same commands
+    run elsewhere test different code.
+
+    Args:
+        settings: Settings dictionary from get_settings()
+        working_dir: Directory the tests are run in
+
+    Returns:
+        Hex digest identifying the scenario
+    """
+    return _digest(settings, SCENARIO_SETTINGS, working_dir)
+
+
+def write_file_atomic(path: Path, data: bytes) -> None:
+    """
+    Write a file atomically, creating its directory if needed.
+
+    The data is written under a temporary name and renamed into place, so a
+    reader never sees a partly written file.
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def _cache_file(key: str) -> Path:
+    """Path of the cache file for a scenario key."""
+    return CACHE_DIR / f"{key}.json"
+
+
+def load_result(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the cached result of a scenario.
+
+    Args:
+        key: Scenario key from scenario_key()
+
+    Returns:
+        Dictionary with 'optimalValuation', 'optimalScore' and 'numTests',
+        or None if there is no usable cached result
+    """
+    try:
+        with open(_cache_file(key), encoding='utf-8') as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(result, dict) or 'optimalValuation' not in result or 'optimalScore' not in result:
+        return None
+    return result
+
+
+def save_result(key: str, optimal_valuation: Dict[str, Any], optimal_score: Any,
+                num_tests: int) -> bool:
+    """
+    Save the result of a scenario.
+
+    Args:
+        key: Scenario key from scenario_key()
+        optimal_valuation: The optimal valuation found
+        optimal_score: Score of the optimal valuation
+        num_tests: Number of tests the run performed
+
+    Returns:
+        True if the result was saved, False otherwise
+    """
+    result = {
+        'optimalValuation': optimal_valuation,
+        'optimalScore': optimal_score,
+        'numTests': num_tests,
+    }
+
+    try:
+        write_file_atomic(_cache_file(key), json.dumps(result, sort_keys=True).encode('utf-8'))
+    except (OSError, TypeError, ValueError):
+        return False
+
+    return True
+
+
+def history_key(settings: Dict[str, Any], working_dir: Union[str, Path]) -> str:
+    """
+    Compute the key under which test scores are kept in the history.
+
+    Unlike scenario_key(), this leaves out the search space (variable tree
+    and possible values), so scenarios differing only in those share scores.
+
+    Args:
+        settings: Settings dictionary from get_settings()
+        working_dir: Directory the tests are run in
+
+    Returns:
+        Hex digest identifying the test setup
+    """
+    return _digest(settings, HISTORY_SETTINGS, working_dir)
+
+
+def _open_history() -> sqlite3.Connection:
+    """Open the history database, creating it if needed."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(HISTORY_FILE))
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS results ("
+        " setup TEXT NOT NULL,"
+        " vars TEXT NOT NULL,"
+        " valuation TEXT NOT NULL,"
+        " score REAL NOT NULL,"
+        " PRIMARY KEY (setup, valuation))"
+    )
+    db.execute("CREATE INDEX IF NOT EXISTS results_vars ON results (setup, vars)")
+    return db
+
+
+def _vars_column(variables: Iterable[str]) -> str:
+    """The value of the vars column for a set of variable names."""
+    return ",".join(sorted(variables))
+
+
+def load_history(key: str, variables: List[str],
+                 poss_values: Mapping[str, Iterable[str]]) -> List[Tuple[Dict[str, str], float]]:
+    """
+    Look up past scores of valuations in the current search space.
+
+    Only valuations of exactly these variables, using only their current
+    possible values, are returned.
+
+    Args:
+        key: History key from history_key()
+        variables: Names of the variables being tuned
+        poss_values: Possible values of each variable
+
+    Returns:
+        List of (valuation, score) pairs
+    """
+    if not HISTORY_FILE.exists():
+        return []
+
+    try:
+        db = _open_history()
+        try:
+            rows = db.execute(
+                "SELECT valuation, score FROM results WHERE setup = ? AND vars = ?",
+                (key, _vars_column(variables))
+            ).fetchall()
+        finally:
+            db.close()
+    except (OSError, sqlite3.Error):
+        return []
+
+    allowed = {var: set(poss_values[var]) for var in variables}
+    points = []
+    for valuation_json, score in rows:
+        try:
+            valuation = json.loads(valuation_json)
+        except ValueError:
+            continue
+        if all(valuation.get(var) in values for var, values in allowed.items()):
+            points.append((valuation, score))
+    return points
+
+
+def record_history(key: str, results: Iterable[Tuple[Dict[str, Any], float]]) -> bool:
+    """
+    Add test scores to the history, replacing older scores of the same valuations.
+
+    Args:
+        key: History key from history_key()
+        results: (valuation, score) pairs of successful tests
+
+    Returns:
+        True if the scores were saved, False otherwise
+    """
+    rows = [
+        (key, _vars_column(valuation), json.dumps(valuation, sort_keys=True), float(score))
+        for valuation, score in results
+    ]
+    if not rows:
+        return True
+
+    try:
+        db = _open_history()
+        try:
+            with db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO results (setup, vars, valuation, score) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows
+                )
+        finally:
+            db.close()
+    except (OSError, sqlite3.Error):
+        return False
+
+    return True
@@ -18,26 +18,68 @@ PYTHON 2 TO 3 CONVERSION NOTES:
 - Modernized configuration and argument parsing
 """
 
+from __future__ import annotations
+
 import argparse
+import os
 import sys
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Tuple
 
 # PYTHON 2 CONVERSION: Original had relative imports without dots
 # Changed "from tune_conf import" to "from .tune_conf import"
-from .tune_conf import get_settings
-from .evaluator import Evaluator
-from .evaluator_batch import BatchEvaluator
-from .optimisation import Optimisation
-from .vartree import treeprint_str, get_variables
-from .logging import writeCSV
 from .helpers import strVarVals, ordinal
 from . import output
+from . import result_cache
+
+# The settings parser, evaluators, optimiser, tree printing, CSV logging and
+# sample tests are imported where they are used, so --help and --version do not load them
+if TYPE_CHECKING:
+    from .evaluator import Evaluator
+    from .optimisation import Optimisation
+    from .logging import CSVLogWriter
 
 # Version information - modernized from global variable approach
 __version__ = "1.0.0"  # PYTHON 2 CONVERSION: Was "v0.16" global variable
 
+# Rough size of the script file output for each run of a test, used to
+# preallocate the script file, and the most space preallocated for it (64 MiB)
+SCRIPT_BYTES_PER_RUN = 256
+SCRIPT_PREALLOCATE_MAX = 1 << 26
+
+
+try:
+    from contextlib import chdir
+except ImportError:  # Python < 3.11
+    @contextmanager
+    def chdir(path):
+        """Change the working directory for the duration of the block."""
+        previous = os.getcwd()
+        os.chdir(path)
+        try:
+            yield
+        finally:
+            os.chdir(previous)
+
+
+def _config_file(value: str) -> Path:
+    """
+    Argument type for the configuration file, so a missing file is reported
+    before anything else is loaded.
+
+    Returns:
+        The absolute path of the file
+
+    Raises:
+        argparse.ArgumentTypeError: If the file does not exist
+    """
+    path = Path(value)
+    if not path.is_file():
+        raise argparse.ArgumentTypeError(f"config file not found: {value}")
+    return path.resolve()
+
 
 class AutotuningSystem:
     """
@@ -52,6 +94,13 @@ class AutotuningSystem:
         self.settings: Optional[Dict[str, Any]] = None
         self.evaluator: Optional[Evaluator] = None
         self.importance_evaluator: Optional[Evaluator] = None
+        self._vars_list: List[str] = []
+        self._history_key: Optional[str] = None
+        self.jobs = 1
+        self._opt_label = ""
+        self._verbose = False
+        self._async_log = False
+        self._raw_log = False
     
     def parse_arguments(self) -> argparse.Namespace:
         """
@@ -74,17 +123,56 @@ Press Enter to proceed with demonstration mode.
         parser.add_argument(
             "config_file",
             nargs="?",
-            type=Path,
+            type=_config_file,
             help="Path to configuration file"
         )
         
+        parser.add_argument(
+            "-v", "--verbose",
+            action="store_true",
+            help="Show the variable tree and every possible value when starting"
+        )
+        
+        parser.add_argument(
+            "-j", "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help="Compile up to N tests at once while earlier tests run (default: 1). "
+                 "Unless the test command reports its own score, the compilations "
+                 "may affect the measured times."
+        )
+        
+        parser.add_argument(
+            "--cache",
+            action="store_true",
+            help="Reuse the result of an identical earlier run, and save this run's "
+                 f"result for reuse (kept in {result_cache.CACHE_DIR})"
+        )
+        
+        parser.add_argument(
+            "--raw-log",
+            action="store_true",
+            help="Write the script file with os.write, skipping Python's file layers"
+        )
+        
+        parser.add_argument(
+            "--async-log",
+            action="store_true",
+            help="Write the script file from a background thread, so a slow disk "
+                 "does not hold up the tests"
+        )
+        
         parser.add_argument(
             "--version",
             action="version",
             version=f"Autotuning System v{self.version}"
         )
         
-        return parser.parse_args()
+        args = parser.parse_args()
+        if args.jobs < 1:
+            parser.error("--jobs must be at least 1")
+        return args
     
     def run_demonstration(self) -> None:
         """
@@ -108,7 +196,6 @@ Press Enter to proceed with demonstration mode.
             print()
             sys.exit(0)
         
-        # PYTHON 2 CONVERSION: Original used "from testing import run_testing"
         from .testing import run_testing
         
         run_testing()
@@ -125,7 +212,11 @@ Press Enter to proceed with demonstration mode.
             bool: True if setup successful, False otherwise
         """
         if script_file is not None:
-            success = output.output_production(script_file)
+            # The tuner prints through output.all, so it must reach the screen too
+            success = output.output_production_tee(
+                script_file, raw_io=self._raw_log, async_io=self._async_log,
+                expected_bytes=self._expected_script_bytes()
+            )
             if not success:
                 output.output_screen()  # Revert to safe default
                 print(f"Could not open script file '{script_file}'")
@@ -150,6 +241,17 @@ Press Enter to proceed with demonstration mode.
         
         return True
     
+    def _expected_script_bytes(self) -> int:
+        """Estimate the size of the script file from the number of test runs."""
+        if not self.settings:
+            return 0
+        
+        from .optimisation import testsRequired
+        
+        runs = testsRequired(self.settings['vartree'], self.settings['possValues']) \
+            * self.settings['repeat']
+        return min(runs * SCRIPT_BYTES_PER_RUN, SCRIPT_PREALLOCATE_MAX)
+    
     def display_settings(self) -> None:
         """
         Display configuration settings to user.
@@ -159,21 +261,42 @@ Press Enter to proceed with demonstration mode.
         """
         if not self.settings:
             return
-            
-        print("Retrieved settings from config file:")
-        print()
-        print(f"Variables:\\n{self.settings['vartree']}")
-        print()
-        
-        print("Displayed as a tree:\\n")
-        print(treeprint_str(self.settings['vartree']))
         
-        print(f"Possible values:\\n{strVarVals(self.settings['possValues'])}")
-        print()
+        lines = [
+            "Retrieved settings from config file:",
+            "",
+            "Variables:",
+            str(self.settings['vartree']),
+            "",
+        ]
+        
+        # The full tree and value lists can be very long for large search
+        # spaces, so by default only the number of values is shown
+        if self._verbose:
+            from .vartree import treeprint_str
+            
+            lines += [
+                "Displayed as a tree:",
+                "",
+                treeprint_str(self.settings['vartree']),
+                "Possible values:",
+                strVarVals({var: list(values) for var, values in self.settings['possValues'].items()}),
+                "",
+            ]
+        else:
+            counts = {var: len(values) for var, values in self.settings['possValues'].items()}
+            lines += [
+                "Number of possible values (use --verbose to list them):",
+                strVarVals(counts),
+                "",
+            ]
         
         for opt in ['compile', 'test', 'clean']:
             if opt in self.settings and self.settings[opt] is not None:
-                print(f"{opt}:\\n{self.settings[opt]}\\n")
+                lines += [f"{opt}:", self.settings[opt], ""]
+        
+        # The whole section is written at once
+        print("\n".join(lines))
     
     def setup_evaluator(self) -> None:
         """
@@ -185,14 +308,42 @@ Press Enter to proceed with demonstration mode.
         if not self.settings:
             raise ValueError("Settings must be loaded before setting up evaluator")
             
-        self.evaluator = Evaluator(
+        evaluator_args = (
             self.settings['compile_mkStr'],
             self.settings['test_mkStr'],
             self.settings['custom_fom'],
             self.settings['clean_mkStr'],
             self.settings['repeat'],
-            self.settings['aggregator']
+            self.settings['aggregator'],
         )
+        log_writer = self._open_log_writer(self.settings['log'])
+        
+        if self.jobs > 1:
+            from .evaluator_parallel import ParallelEvaluator
+            
+            # Later tests compile while earlier ones run
+            self.evaluator = ParallelEvaluator(*evaluator_args, log_writer=log_writer, jobs=self.jobs)
+        else:
+            from .evaluator import Evaluator
+            
+            self.evaluator = Evaluator(*evaluator_args, log_writer=log_writer)
+    
+    def _open_log_writer(self, filename: Optional[str]) -> Optional[CSVLogWriter]:
+        """
+        Open a CSV log which tests are written to as they are scored.
+        
+        Returns:
+            The log writer, or None if no log is wanted or it cannot be opened
+        """
+        if filename is None:
+            return None
+        
+        from .logging import CSVLogWriter
+        
+        try:
+            return CSVLogWriter(filename, self._vars_list, self.settings['repeat'])
+        except IOError:
+            return None
     
     def run_optimization(self) -> Tuple[bool, Optional[Optimisation]]:
         """
@@ -207,6 +358,8 @@ Press Enter to proceed with demonstration mode.
         if not self.settings or not self.evaluator:
             raise ValueError("Settings and evaluator must be set up before optimization")
         
+        from .optimisation import Optimisation
+        
         # Set up the optimizer
         test = Optimisation(
             self.settings['vartree'],
@@ -226,12 +379,22 @@ Press Enter to proceed with demonstration mode.
         print()
         print()
         
+        # Reuse scores of tests already run for this setup
+        if self._history_key is not None:
+            prior_points = result_cache.load_history(
+                self._history_key, self._vars_list, self.settings['possValues']
+            )
+            if prior_points:
+                test.seed(prior_points)
+                print(f"({len(prior_points)} test scores are known from earlier runs)")
+                print()
+        
         # Start timing
-        execution_start = time.time()
+        execution_start = time.perf_counter()
         
         try:
             test.calculateOptimum()
-            execution_stop = time.time()
+            execution_stop = time.perf_counter()
             
             if not test.successful():
                 print()
@@ -248,8 +411,8 @@ Press Enter to proceed with demonstration mode.
             return True, test
             
         except KeyboardInterrupt:
-            print("\\n\\nQuitting Tuner")
-            execution_stop = time.time()
+            print("\n\nQuitting Tuner")
+            execution_stop = time.perf_counter()
             
             # Write partial log if available
             if self.evaluator and len(self.evaluator.log) > 0:
@@ -267,41 +430,48 @@ Press Enter to proceed with demonstration mode.
         if not self.settings:
             return
             
-        self.importance_evaluator = Evaluator(
+        from .evaluator_batch import BatchEvaluator
+        
+        # All the tests are known up front, so they are evaluated as one
+        # batch, compiling them all before any are run
+        self.importance_evaluator = BatchEvaluator(
             self.settings['compile_mkStr'],
             self.settings['test_mkStr'],
             self.settings['custom_fom'],
             self.settings['clean_mkStr'],
             self.settings['repeat'],
             self.settings['aggregator'],
-            self.evaluator  # Pass evaluator so no tests are repeated
+            self.evaluator,  # Pass evaluator so no tests are repeated
+            log_writer=self._open_log_writer(self.settings['importance'])
         )
         
-        additional_start = time.time()
+        additional_start = time.perf_counter()
         
         # PYTHON 2 CONVERSION: Original used print >>output.full (line 309)
         # Changed to direct method call for Python 3
-        output.full.write("\\n\\n")
+        output.write_full("\n\n")
         print("Additional tests to check parameter importance:")
-        output.full.write("\\n")
+        output.write_full("\n")
         
-        vars_list = get_variables(self.settings['vartree'])
+        vars_list = self._vars_list
         poss_values = self.settings['possValues']
         
-        tests = []
+        # Each configuration differs from the optimum in at most one variable,
+        # so it is keyed by that (variable, value) pair, or None for the
+        # optimum itself. Each is kept once, in the order first produced.
+        tests = {}
         for var in vars_list:
             for val in poss_values[var]:
-                test_config = dict(optimal_valuation)  # copy
-                test_config[var] = val
-                if test_config not in tests:
-                    tests.append(test_config)
+                key = None if val == optimal_valuation[var] else (var, val)
+                if key not in tests:
+                    tests[key] = {**optimal_valuation, var: val}
         
-        self.importance_evaluator.evaluate(tests)
+        self.importance_evaluator.evaluate(list(tests.values()))
         
         if self.importance_evaluator.testsRun == 0:
             print("(None required)")
         
-        additional_stop = time.time()
+        additional_stop = time.perf_counter()
         self._additional_test_time = additional_stop - additional_start
     
     def _display_results(self, test: Optimisation, start_time: float, stop_time: float) -> None:
@@ -314,17 +484,11 @@ Press Enter to proceed with demonstration mode.
         if not self.settings:
             return
             
-        print()
-        # PYTHON 2 CONVERSION: Original used .capitalize() on optimal setting
-        optimal_type = self.settings['optimal'].capitalize()
-        print(f"{optimal_type}imal valuation:")  # Minimal or Maximal
-        print(strVarVals(test.optimalValuation(), ", "))
-        print(f"{optimal_type}imal Score:")  # Minimal or Maximal
-        print(test.optimalScore())
+        lines = self._optimum_lines(test.optimalValuation(), test.optimalScore())
         
         duration = stop_time - start_time
         minutes, seconds = divmod(duration, 60)
-        print(f"The system ran {test.numTests()} tests, taking {minutes:.0f}m{seconds:.2f}s.")
+        lines.append(f"The system ran {test.numTests()} tests, taking {minutes:.0f}m{seconds:.2f}s.")
         
         if (self.settings['importance'] is not None and 
             self.importance_evaluator and 
@@ -335,7 +499,42 @@ Press Enter to proceed with demonstration mode.
                 time_str = f", taking {add_minutes:.0f}m{add_seconds:.2f}s"
             else:
                 time_str = ""
-            print(f"(and {additional_tests} additional tests{time_str})")
+            lines.append(f"(and {additional_tests} additional tests{time_str})")
+        
+        print("\n".join(lines))
+    
+    def _record_history(self) -> None:
+        """Add the scores of this run's tests to the result history."""
+        if self._history_key is None:
+            return
+        
+        results = [
+            (t.valuation, t.overall)
+            for evaluator in (self.evaluator, self.importance_evaluator)
+            if evaluator is not None
+            for t in evaluator.log.values()
+            if t.overall is not None
+        ]
+        if not result_cache.record_history(self._history_key, results):
+            print("Failed to save the test scores to the cache.")
+    
+    def _optimum_lines(self, valuation: Dict[str, Any], score: Any) -> List[str]:
+        """Lines displaying the optimal valuation and its score."""
+        return [
+            "",
+            f"{self._opt_label} valuation:",
+            strVarVals(valuation, ", "),
+            f"{self._opt_label} Score:",
+            str(score),
+        ]
+    
+    def _display_cached_result(self, cached: Dict[str, Any]) -> None:
+        """Display a result loaded from the result cache."""
+        lines = ["An identical scenario has been tuned before; using its cached result."]
+        lines += self._optimum_lines(cached['optimalValuation'], cached['optimalScore'])
+        if 'numTests' in cached:
+            lines.append(f"(The earlier run performed {cached['numTests']} tests.)")
+        print("\n".join(lines))
     
     def _display_failures(self) -> None:
         """
@@ -347,12 +546,18 @@ Press Enter to proceed with demonstration mode.
         if not self.evaluator or len(self.evaluator.failures) == 0:
             return
             
-        print()
-        print("FAILURES:")
+        # A test failing on several repetitions is listed once per failure,
+        # always with the same valuation, which only needs formatting once
+        formatted = {}
+        lines = ["", "FAILURES:"]
         for failure_reason, failure_config in self.evaluator.failures:
-            print(f"    {failure_reason}")
-            print(f"    {strVarVals(failure_config, ', ')}")
-            print()
+            config_str = formatted.get(id(failure_config))
+            if config_str is None:
+                config_str = formatted[id(failure_config)] = strVarVals(failure_config, ', ')
+            lines += [f"    {failure_reason}", f"    {config_str}", ""]
+        
+        # print() would write the trailing newline separately
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def _write_log_file(self, partial: bool = False) -> None:
         """
@@ -361,17 +566,15 @@ Press Enter to proceed with demonstration mode.
         PYTHON 2 CONVERSION: Original used basic string concatenation (lines 268-283).
         Added better error handling and type safety.
         """
-        if not self.settings or not self.evaluator:
+        if not self.settings or not self.evaluator or self.settings['log'] is None:
             return
-            
-        if len(self.evaluator.log) > 0 and self.settings['log'] is not None:
-            success = writeCSV(
-                self.evaluator.log,
-                get_variables(self.settings['vartree']),
-                self.settings['possValues'],
-                self.settings['log']
-            )
-            
+        
+        # Tests were written to the log as they were scored; this adds any
+        # which failed and closes the file
+        log_writer = self.evaluator.log_writer
+        success = log_writer is not None and log_writer.close(self.evaluator.log)
+        
+        if len(self.evaluator.log) > 0:
             log_type = "partial" if partial else ""
             if success:
                 print(f"A {log_type} testing log was saved to '{self.settings['log']}'")
@@ -382,16 +585,14 @@ Press Enter to proceed with demonstration mode.
         """Write parameter importance data to file."""
         if (not self.settings or 
             not self.importance_evaluator or
-            self.settings['importance'] is None or
-            len(self.importance_evaluator.log) == 0):
+            self.settings['importance'] is None):
+            return
+        
+        log_writer = self.importance_evaluator.log_writer
+        success = log_writer is not None and log_writer.close(self.importance_evaluator.log)
+        
+        if len(self.importance_evaluator.log) == 0:
             return
-            
-        success = writeCSV(
-            self.importance_evaluator.log,
-            get_variables(self.settings['vartree']),
-            self.settings['possValues'],
-            self.settings['importance']
-        )
         
         if success:
             print(f"Additional data was saved to '{self.settings['importance']}'")
@@ -422,43 +623,90 @@ Press Enter to proceed with demonstration mode.
             self.run_demonstration()
             return
         
-        # Load configuration
+        self.jobs = args.jobs
+        self._verbose = args.verbose
+        self._raw_log = args.raw_log
+        self._async_log = args.async_log
+        
+        from .tune_conf import get_cached_settings, get_settings
+        from .vartree import get_variables
+        
+        # Load configuration; with --cache, a snapshot of the parsed settings
+        # is kept in the cache directory as well
         try:
-            self.settings = get_settings(str(args.config_file))
+            config_path = args.config_file
+            if args.cache:
+                self.settings = get_cached_settings(config_path)
+            else:
+                self.settings = get_settings(config_path)
         except Exception as e:
             print(f"Error loading configuration file: {e}")
             sys.exit(1)
         
+        # The variable names are needed by several later steps
+        self._vars_list = get_variables(self.settings['vartree'])
+        
+        # "Minimal" or "Maximal", for reporting the result
+        # PYTHON 2 CONVERSION: Original used .capitalize() on optimal setting
+        self._opt_label = self.settings['optimal'].capitalize() + "imal"
+        
+        # The caller's stdout and output writers, put back when the run ends
+        saved_stdout = sys.stdout
+        saved_writers = output.get_current_writers()
+        
         # Set up output handling
         script_success = self.setup_output(self.settings.get('script'))
         if script_success is False:
             self.settings['script'] = False
         
-        # Redirect stdout to output handler
-        # PYTHON 2 CONVERSION: Original assignment (line 119) is preserved
-        sys.stdout = output.all
-        
-        print()
-        print("Autotuning System".center(80))
-        print(f"v{self.version}".center(80))
-        print()
-        
-        # Change working directory to config file location
-        # PYTHON 2 CONVERSION: Original used os.path (lines 135-136)
-        # Modernized to use pathlib
-        config_path = Path(args.config_file).resolve()
-        working_dir = config_path.parent
-        import os  # Still needed for chdir
-        os.chdir(working_dir)
-        
+        try:
+            # Redirect stdout to output handler
+            # PYTHON 2 CONVERSION: Original assignment (line 119) is preserved
+            sys.stdout = output.state.all
+            
+            print()
+            print("Autotuning System".center(80))
+            print(f"v{self.version}".center(80))
+            print()
+            
+            # Work in the config file's directory, restoring the caller's afterwards
+            # PYTHON 2 CONVERSION: Original used os.path (lines 135-136)
+            # Modernized to use pathlib
+            working_dir = config_path.parent
+            with chdir(working_dir):
+                self._run_in_working_dir(args, working_dir)
+        finally:
+            # Closes the script file, if one was written
+            sys.stdout = saved_stdout
+            output.restore_writers(saved_writers)
+    
+    def _run_in_working_dir(self, args: argparse.Namespace, working_dir: Path) -> None:
+        """Display the settings, then run the tuning and report on it."""
         # Display configuration
         self.display_settings()
         
-        # Set up evaluator and run optimization
+        scenario_key = None
         try:
+            # An identical scenario tuned before needs no tests at all
+            if args.cache:
+                scenario_key = result_cache.scenario_key(self.settings, working_dir)
+                self._history_key = result_cache.history_key(self.settings, working_dir)
+                cached = result_cache.load_result(scenario_key)
+                if cached is not None:
+                    self._display_cached_result(cached)
+                    self._report_script_status()
+                    return
+            
+            # Set up evaluator and run optimization
             self.setup_evaluator()
             success, test_result = self.run_optimization()
             
+            if success and scenario_key is not None:
+                if not result_cache.save_result(scenario_key, test_result.optimalValuation(),
+                                                test_result.optimalScore(), test_result.numTests()):
+                    print("Failed to save the result to the cache.")
+            self._record_history()
+            
             # Display any failures
             self._display_failures()
             
@@ -472,6 +720,11 @@ Press Enter to proceed with demonstration mode.
         except Exception as e:
             print(f"Error during optimization: {e}")
             sys.exit(1)
+        
+        finally:
+            # Write out anything still buffered by the output writers
+            sys.stdout.flush()
+            output.state.full.flush()
 
 
 def main() -> None:
@@ -7,51 +7,167 @@ Sets up the configuration for the optimization. The settings (variable names,
 testing methods, etc.) are read from a configuration file provided.
 
 PYTHON 2 TO 3 CONVERSION NOTES:
-- Changed from ConfigParser to configparser (lowercase module name in Python 3)
-- Changed RawConfigParser to configparser.RawConfigParser  
+- Replaced ConfigParser with a small parser for the INI subset used by the
+  configuration files
 - Converted all print statements to print() functions
 - Changed .iteritems() to .items() for Python 3 dictionary iteration (lines 90, 102, 117)
 - Changed exit() to sys.exit() for better practice
 - Added comprehensive type hints throughout
 - Modernized string formatting and error handling
-- Added dataclass for configuration structure
+- Added AutotuningConfig class for configuration structure
 - Enhanced error messages with f-strings
 """
 
-import configparser
+import copy
+import hashlib
+import os
+import pickle
+import re
 import sys
-from dataclasses import dataclass, field
+import weakref
 from pathlib import Path
-from typing import Dict, List, Callable, Optional, Any, Union
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Literal, Callable, Mapping, Optional, Any, Tuple, Union
 
 from .vartree import get_variables
 from .helpers import avg, med
 
 
-@dataclass
+# Functions which can be chosen to aggregate repeated test scores
+_AGGREGATORS = MappingProxyType({
+    'max': max,
+    'min': min,
+    'med': med,
+    'avg': avg,
+})
+
+# Settings allowed for 'optimal'; the '_time' ones score by timing the test
+_VALID_OPTIMALS = frozenset({'max_time', 'min_time', 'max', 'min'})
+
+# The 'repeat' setting: a number of repetitions, then optionally a comma
+# and an aggregation method (checked against _AGGREGATORS separately, so
+# an unknown method gets its own error message)
+_REPEAT_RE = re.compile(r'\s*(\d+)\s*(?:,\s*(.*?)\s*)?')
+
+# Splits a list of possible values, removing the whitespace around each
+_COMMA_SPLIT = re.compile(r'\s*,\s*')
+
+# Sections every configuration file must have
+_REQUIRED_SECTIONS = ('variables', 'values', 'testing', 'scoring', 'output')
+
+# A compile/test/clean command string function, taking the test ID and a
+# valuation. The values must be strings; they are substituted without
+# conversion, as the evaluators convert each valuation once per test.
+_CommandFunction = Callable[[int, Dict[str, str]], str]
+
+# Parsed configuration file: option values by option name, by section name
+_ConfigSections = Dict[str, Dict[str, str]]
+
+# Settings parsed by get_config(), by absolute path of the configuration
+# file, with the modification time and size the file had when it was parsed
+_SETTINGS_CACHE: Dict[str, Tuple[Tuple[int, int], "AutotuningConfig"]] = {}
+
+# Command string functions still in use, by template, command type and
+# variables, so identical commands share one function
+_COMMAND_FUNCTIONS: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+# The settings, in the order of the get_settings() dictionary
+_SETTING_NAMES = (
+    'vartree', 'possValues', 'compile', 'compile_mkStr', 'test', 'test_mkStr',
+    'clean', 'clean_mkStr', 'optimal', 'custom_fom', 'repeat', 'overall',
+    'aggregator', 'log', 'script', 'importance',
+)
+
+# Settings which are functions, rebuilt from the other settings when a
+# settings snapshot is loaded rather than stored in it
+_CALLABLE_SETTINGS = ('compile_mkStr', 'test_mkStr', 'clean_mkStr', 'aggregator')
+
+
 class AutotuningConfig:
     """
     Configuration data structure for autotuning system.
     
     PYTHON 2 CONVERSION: Original used plain dictionary.
-    Modernized to use dataclass for better type safety and validation.
-    """
-    vartree: str
-    possValues: Dict[str, List[str]]
-    compile: Optional[str] = None
-    test: Optional[str] = None
-    clean: Optional[str] = None
-    compile_mkStr: Optional[Callable[[int, Dict[str, Any]], str]] = None
-    test_mkStr: Optional[Callable[[int, Dict[str, Any]], str]] = None
-    clean_mkStr: Optional[Callable[[int, Dict[str, Any]], str]] = None
-    optimal: str = "min"
-    custom_fom: bool = False
-    repeat: int = 1
-    overall: str = "min"
-    aggregator: Callable[[List[float]], float] = min
-    log: Optional[str] = None
-    script: Optional[str] = None
-    importance: Optional[str] = None
+    Modernized to use a class with named attributes (and __slots__, so
+    instances are small and cheap to create).
+    
+    The variable names and their possible values are worked out from the
+    parsed configuration file when first used, unless given.
+    """
+    __slots__ = (
+        'vartree', 'compile', 'test', 'clean',
+        'compile_mkStr', 'test_mkStr', 'clean_mkStr',
+        'optimal', 'custom_fom', 'repeat', 'overall', 'aggregator',
+        'log', 'script', 'importance',
+        '_raw', '_config_file', '_variables', '_possValues',
+    )
+    
+    def __init__(self, vartree: str,
+                 possValues: Optional[Mapping[str, Tuple[str, ...]]] = None,
+                 compile: Optional[str] = None,
+                 test: Optional[str] = None,
+                 clean: Optional[str] = None,
+                 compile_mkStr: Optional[_CommandFunction] = None,
+                 test_mkStr: Optional[_CommandFunction] = None,
+                 clean_mkStr: Optional[_CommandFunction] = None,
+                 optimal: str = "min",
+                 custom_fom: bool = False,
+                 repeat: int = 1,
+                 overall: str = "min",
+                 aggregator: Callable[[List[float]], float] = min,
+                 log: Optional[str] = None,
+                 script: Optional[str] = None,
+                 importance: Optional[str] = None,
+                 variables: Optional[List[str]] = None,
+                 _raw: Optional[_ConfigSections] = None,
+                 _config_file: Union[str, Path] = "") -> None:
+        self.vartree = vartree
+        self.compile = compile
+        self.test = test
+        self.clean = clean
+        self.compile_mkStr = compile_mkStr
+        self.test_mkStr = test_mkStr
+        self.clean_mkStr = clean_mkStr
+        self.optimal = optimal
+        self.custom_fom = custom_fom
+        self.repeat = repeat
+        self.overall = overall
+        self.aggregator = aggregator
+        self.log = log
+        self.script = script
+        self.importance = importance
+        self._raw = _raw
+        self._config_file = _config_file
+        self._variables = variables
+        self._possValues = possValues
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}"
+                           for name in self.__slots__ if not name.startswith('_'))
+        return f"AutotuningConfig({fields})"
+    
+    @property
+    def variables(self) -> List[str]:
+        """Names of the variables in the variable tree."""
+        if self._variables is None:
+            self._variables = get_variables(self.vartree)
+        return self._variables
+    
+    @property
+    def possValues(self) -> Mapping[str, Tuple[str, ...]]:
+        """
+        Possible values of each variable.
+        
+        Raises:
+            ConfigurationError: If a variable has no possible values given
+        """
+        if self._possValues is None:
+            self._possValues = _validate_and_extract_values(self._raw, self.variables, self._config_file)
+        return self._possValues
+    
+    @possValues.setter
+    def possValues(self, possValues: Mapping[str, Tuple[str, ...]]) -> None:
+        self._possValues = possValues
 
 
 class ConfigurationError(Exception):
@@ -60,117 +176,265 @@ class ConfigurationError(Exception):
     
     PYTHON 2 CONVERSION: Original used generic exit() calls.
     Modernized to use proper exception handling.
+    
+    The message can be given as a format string followed by the values to
+    fill in, so it is only built if the error is displayed. Lists and
+    tuples among the values are shown comma-separated. `args` and repr()
+    give the built message, as for an error raised with it directly.
     """
-    pass
+    
+    def __init__(self, message: str, *values: Any) -> None:
+        # The template and values are kept as the base class's arguments,
+        # so the error can be pickled and rebuilt
+        super().__init__(message, *values)
+        self.message = message
+        self.values = values
+    
+    @property
+    def args(self) -> Tuple[str]:
+        return (str(self),)
+    
+    def __str__(self) -> str:
+        if not self.values:
+            return self.message
+        return self.message.format(*(
+            ', '.join(value) if isinstance(value, (list, tuple)) else value
+            for value in self.values
+        ))
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self)!r})"
 
 
-def _create_command_function(template: str, command_type: str) -> Callable[[int, Dict[str, Any]], str]:
+def _create_command_function(template: str, command_type: str,
+                             known_vars: Tuple[str, ...]) -> _CommandFunction:
     """
     Create a command string function for compile/test/clean operations.
     
     PYTHON 2 CONVERSION: Original used nested function definitions with .iteritems().
     Modernized to use factory function with .items() and f-strings.
     
+    The functions are shared: while a function for the same template,
+    command type and variables is still in use, that function is returned.
+    
     Args:
         template: Command template string with placeholders
         command_type: Type of command (for error reporting)
+        known_vars: Names of the variables which may appear as placeholders
         
     Returns:
         Function that generates command strings
     """
-    def make_command_string(test_id: int, var_dict: Dict[str, Any]) -> str:
+    key = (template, command_type, known_vars)
+    make_command_string = _COMMAND_FUNCTIONS.get(key)
+    if make_command_string is None:
+        make_command_string = _COMMAND_FUNCTIONS[key] = _build_command_function(*key)
+    return make_command_string
+
+
+def _build_command_function(template: str, command_type: str,
+                            known_vars: Tuple[str, ...]) -> _CommandFunction:
+    """Build a new command string function, as _create_command_function()."""
+    # The template is split once into its literal text and placeholders, so
+    # each command is built by joining the pieces. "%%ID%%" is "%" + "%ID%"
+    # + "%", so one group captures the ID or variable name of every placeholder.
+    pattern = re.compile("%(" + "|".join(["%ID%"] + [re.escape(var) for var in known_vars]) + ")%")
+    
+    # re.split alternates literal text with the captured names, so this pairs
+    # each placeholder with the text following it
+    pieces = pattern.split(template)
+    head = pieces[0]
+    segments = list(zip(pieces[1::2], pieces[2::2]))
+    
+    def make_command_string(test_id: int, var_dict: Dict[str, str]) -> str:
         """Generate command string by substituting variables."""
-        command = template.replace("%%ID%%", str(test_id))
-        
-        # PYTHON 2 CONVERSION: Changed .iteritems() to .items()
-        for var_name, var_value in var_dict.items():
-            placeholder = f"%{var_name}%"
-            command = command.replace(placeholder, str(var_value))
-            
-        return command
+        parts = [head]
+        for name, literal in segments:
+            if name == "%ID%":
+                parts.append(str(test_id))
+            elif name in var_dict:
+                parts.append(var_dict[name])
+            else:
+                parts.append(f"%{name}%")  # Not given a value, left as it is
+            parts.append(literal)
+        return "".join(parts)
     
     make_command_string.__name__ = f"{command_type}_mkStr"
     return make_command_string
 
 
-def _validate_required_sections(config: configparser.RawConfigParser, config_file: Union[str, Path]) -> None:
+def _parse_ini(lines: Iterable[str], config_file: Union[str, Path],
+               section: Optional[str] = None) -> _ConfigSections:
+    """
+    Parse the lines of a configuration file.
+    
+    This follows RawConfigParser for the features the configuration files
+    use: option names are case-insensitive (stored in lower case), names and
+    values are separated by the first '=' or ':', lines starting with '#' or
+    ';' are comments, and more deeply indented lines continue the previous
+    value, joined with newlines.
+    
+    If a section is given, only that section is parsed; the lines of other
+    sections are skipped, and no more lines are read once it has ended.
+    
+    Raises:
+        ConfigurationError: If a line cannot be parsed, or a section or
+            option is given twice
+    """
+    # The lines of each value, by option name, by section name
+    lines_by_option: Dict[str, Dict[str, List[str]]] = {}
+    current: Optional[Dict[str, List[str]]] = None
+    option: Optional[str] = None
+    option_indent = 0
+    skipping = False
+    
+    for lineno, line in enumerate(lines, start=1):
+        stripped = line.strip()
+        if not stripped or stripped[0] in '#;':
+            # Blank lines inside a value are kept, unless they end it
+            if not stripped and option is not None:
+                current[option].append('')
+            continue
+        
+        indent = len(line) - len(line.lstrip())
+        if option is not None and indent > option_indent:
+            current[option].append(stripped)
+            continue
+        
+        option_indent = indent
+        if stripped[0] == '[' and stripped[-1] == ']':
+            name = stripped[1:-1]
+            option = None
+            if section is not None and name != section:
+                if section in lines_by_option:
+                    break  # The wanted section has ended
+                skipping = True
+                continue
+            skipping = False
+            if name in lines_by_option:
+                raise ConfigurationError(
+                    f"Configuration file '{config_file}' contains section [{name}] more than once."
+                )
+            current = lines_by_option[name] = {}
+            continue
+        
+        if skipping:
+            continue
+        
+        separator = min((stripped.find(c) for c in '=:' if c in stripped), default=-1)
+        if current is None or separator <= 0:
+            raise ConfigurationError(
+                f"Configuration file '{config_file}' could not be read, at line {lineno}: {line.rstrip()!r}"
+            )
+        
+        option = stripped[:separator].rstrip().lower()
+        if option in current:
+            raise ConfigurationError(
+                f"Configuration file '{config_file}' contains option '{option}' more than once "
+                "in the same section."
+            )
+        current[option] = [stripped[separator + 1:].strip()]
+    
+    return {
+        name: {opt: '\n'.join(value_lines).rstrip() for opt, value_lines in options.items()}
+        for name, options in lines_by_option.items()
+    }
+
+
+def _validate_required_sections(config: _ConfigSections, config_file: Union[str, Path]) -> None:
     """
     Validate that all required sections exist in the configuration file.
     
     PYTHON 2 CONVERSION: Original used print and exit() (lines 35-42).
     Modernized to use proper exception handling with detailed error messages.
     """
-    required_sections = ['variables', 'values', 'testing', 'scoring', 'output']
-    missing_sections = [section for section in required_sections if not config.has_section(section)]
+    missing_sections = [section for section in _REQUIRED_SECTIONS if section not in config]
     
     if missing_sections:
         raise ConfigurationError(
-            f"Configuration file '{config_file}' is missing required sections: {', '.join(missing_sections)}\\n"
-            f"Required sections: {', '.join(required_sections)}"
+            "Configuration file '{}' is missing required sections: {}\n"
+            "Required sections: {}",
+            config_file, missing_sections, _REQUIRED_SECTIONS
         )
 
 
-def _validate_variables_section(config: configparser.RawConfigParser, config_file: Union[str, Path]) -> str:
+def _validate_variables_section(config: _ConfigSections, config_file: Union[str, Path]) -> str:
     """
     Validate and extract the variables section.
     
     PYTHON 2 CONVERSION: Original used print and exit() (lines 46-48).
     Modernized with proper exception handling.
     """
-    if not config.has_option("variables", "variables"):
+    if "variables" not in config["variables"]:
         raise ConfigurationError(
             f"Configuration file '{config_file}' does not contain the option 'variables' "
             "in section [variables]."
         )
     
-    return config.get("variables", "variables")
+    return config["variables"]["variables"]
 
 
-def _validate_and_extract_values(config: configparser.RawConfigParser, variables: List[str], 
-                                config_file: Union[str, Path]) -> Dict[str, List[str]]:
+def _validate_and_extract_values(config: _ConfigSections, variables: List[str], 
+                                config_file: Union[str, Path]) -> Mapping[str, Tuple[str, ...]]:
     """
     Validate and extract possible values for all variables.
     
     PYTHON 2 CONVERSION: Original used list comprehension with all() (lines 60-62).
     Enhanced with better error reporting and type safety.
     """
-    missing_variables = [var for var in variables if not config.has_option("values", var)]
+    # Each variable is looked up once, both to check it is present and to
+    # read its values. Option names are stored in lower case.
+    values = config["values"]
+    poss_values = {}
+    missing_variables = []
+    for var in variables:
+        raw_values = values.get(var.lower())
+        if raw_values is None:
+            missing_variables.append(var)
+        else:
+            poss_values[var] = tuple(_COMMA_SPLIT.split(raw_values.strip()))
     
     if missing_variables:
         raise ConfigurationError(
-            f"Configuration file '{config_file}' does not contain possible values "
-            f"(in [values] section) for variables: {', '.join(missing_variables)}"
+            "Configuration file '{}' does not contain possible values "
+            "(in [values] section) for variables: {}",
+            config_file, missing_variables
         )
     
-    poss_values = {}
-    for var in variables:
-        raw_values = config.get("values", var)
-        poss_values[var] = [x.strip() for x in raw_values.split(",")]
-    
-    return poss_values
+    # Read-only, so the values can be shared and used in cache keys;
+    # callers which need to change them must take a copy
+    return MappingProxyType(poss_values)
 
 
-def _setup_commands(config: configparser.RawConfigParser, config_file: Union[str, Path]) -> tuple:
+def _setup_commands(config: _ConfigSections, config_file: Union[str, Path],
+                    variables: List[str]) -> tuple:
     """
     Set up compile, test, and clean command generators.
     
     PYTHON 2 CONVERSION: Original had inline function definitions (lines 85-122).
     Modernized to use factory function and better error handling.
     
+    Args:
+        variables: Names of the variables substituted into the commands
+    
     Returns:
         Tuple of (compile_info, test_info, clean_info) where each is (template, function)
     """
+    known_vars = tuple(variables)
+    
+    testing = config['testing']
+    
     compile_template = None
     compile_mkStr = None
-    if config.has_option("testing", "compile"):
-        compile_template = config.get('testing', 'compile')
-        compile_mkStr = _create_command_function(compile_template, "compile")
+    if 'compile' in testing:
+        compile_template = testing['compile']
+        compile_mkStr = _create_command_function(compile_template, "compile", known_vars)
     
     test_template = None
     test_mkStr = None
-    if config.has_option('testing', 'test'):
-        test_template = config.get('testing', 'test')
-        test_mkStr = _create_command_function(test_template, "test")
+    if 'test' in testing:
+        test_template = testing['test']
+        test_mkStr = _create_command_function(test_template, "test", known_vars)
     else:
         raise ConfigurationError(
             f"Configuration file '{config_file}' does not contain option 'test' "
@@ -179,9 +443,9 @@ def _setup_commands(config: configparser.RawConfigParser, config_file: Union[str
     
     clean_template = None
     clean_mkStr = None
-    if config.has_option('testing', 'clean'):
-        clean_template = config.get('testing', 'clean')
-        clean_mkStr = _create_command_function(clean_template, "clean")
+    if 'clean' in testing:
+        clean_template = testing['clean']
+        clean_mkStr = _create_command_function(clean_template, "clean", known_vars)
     
     return (
         (compile_template, compile_mkStr),
@@ -190,7 +454,7 @@ def _setup_commands(config: configparser.RawConfigParser, config_file: Union[str
     )
 
 
-def _setup_scoring(config: configparser.RawConfigParser, config_file: Union[str, Path]) -> tuple:
+def _setup_scoring(config: _ConfigSections, config_file: Union[str, Path]) -> tuple:
     """
     Set up scoring configuration (optimal direction and repetition settings).
     
@@ -204,10 +468,12 @@ def _setup_scoring(config: configparser.RawConfigParser, config_file: Union[str,
     optimal = "min"
     custom_fom = False
     
-    if config.has_option('scoring', 'optimal'):
-        optimal_setting = config.get('scoring', 'optimal').lower()
+    scoring = config['scoring']
+    
+    if 'optimal' in scoring:
+        optimal_setting = scoring['optimal'].lower()
         
-        if optimal_setting in ['max_time', 'min_time', 'max', 'min']:
+        if optimal_setting in _VALID_OPTIMALS:
             optimal = optimal_setting[:3]
             custom_fom = len(optimal_setting) == 3
         else:
@@ -222,39 +488,32 @@ def _setup_scoring(config: configparser.RawConfigParser, config_file: Union[str,
     overall = "min"
     aggregator = min
     
-    if config.has_option('scoring', 'repeat'):
-        repeat_setting = config.get('scoring', 'repeat')
+    if 'repeat' in scoring:
+        repeat_setting = scoring['repeat']
         
         # PYTHON 2 CONVERSION: Original used .partition() method (line 143)
-        parts = repeat_setting.partition(',')
+        # One match checks the format and captures both fields
+        match = _REPEAT_RE.fullmatch(repeat_setting)
+        repeat = int(match.group(1)) if match is not None else 0
         
-        try:
-            repeat = int(parts[0])
-            if repeat < 1:
-                raise ValueError("Option 'repeat' must be at least 1.")
-        except ValueError as e:
+        if repeat < 1:
             raise ConfigurationError(
                 f"Configuration file '{config_file}' contains an invalid setting for 'repeat' "
-                f"in section [scoring]. {str(e)}"
+                f"in section [scoring]. Got '{repeat_setting}', expected a number of "
+                "repetitions (at least 1), optionally followed by ', max', ', min', ', med' or ', avg'."
             )
         
-        if parts[1] == '':
+        if match.group(2) is None:
             # Only number of repetitions specified, default to 'min'
             overall = 'min'
             aggregator = min
         else:
             # Aggregation method specified
-            agg_method = parts[2].lower().strip()
-            aggregator_map = {
-                'max': max, 
-                'min': min, 
-                'med': med, 
-                'avg': avg
-            }
+            agg_method = match.group(2).lower()
             
-            if agg_method in aggregator_map:
+            if agg_method in _AGGREGATORS:
                 overall = agg_method
-                aggregator = aggregator_map[agg_method]
+                aggregator = _AGGREGATORS[agg_method]
             else:
                 raise ConfigurationError(
                     f"Configuration file '{config_file}' contains an invalid aggregation method "
@@ -265,7 +524,33 @@ def _setup_scoring(config: configparser.RawConfigParser, config_file: Union[str,
     return optimal, custom_fom, repeat, overall, aggregator
 
 
-def _get_output_settings(config: configparser.RawConfigParser) -> tuple:
+class _OutputSettings:
+    """
+    The settings of the [output] section, each looked up only when used.
+    Settings not given in the file are None.
+    """
+    __slots__ = ('_options',)
+    
+    def __init__(self, options: Dict[str, str]) -> None:
+        self._options = options
+    
+    @property
+    def log(self) -> Optional[str]:
+        """CSV file to write the test log to."""
+        return self._options.get('log')
+    
+    @property
+    def script(self) -> Optional[str]:
+        """File to write a transcript of the tuning process to."""
+        return self._options.get('script')
+    
+    @property
+    def importance(self) -> Optional[str]:
+        """CSV file to write the parameter importance tests to."""
+        return self._options.get('importance')
+
+
+def _get_output_settings(config: _ConfigSections) -> _OutputSettings:
     """
     Extract output-related settings from configuration.
     
@@ -273,13 +558,9 @@ def _get_output_settings(config: configparser.RawConfigParser) -> tuple:
     Consolidated into single function for better organization.
     
     Returns:
-        Tuple of (log_file, script_file, importance_file)
+        The output settings, with attributes log, script and importance
     """
-    log_file = config.get('output', 'log') if config.has_option('output', 'log') else None
-    script_file = config.get('output', 'script') if config.has_option('output', 'script') else None
-    importance_file = config.get('output', 'importance') if config.has_option('output', 'importance') else None
-    
-    return log_file, script_file, importance_file
+    return _OutputSettings(config['output'])
 
 
 def get_settings(config_file: Union[str, Path]) -> Dict[str, Any]:
@@ -293,66 +574,214 @@ def get_settings(config_file: Union[str, Path]) -> Dict[str, Any]:
         config_file: Path to the configuration file
         
     Returns:
-        Dictionary containing all configuration settings
+        Dictionary containing all configuration settings, keyed by the
+        AutotuningConfig attribute names (use get_config() for the settings
+        as an AutotuningConfig)
         
     Raises:
         ConfigurationError: If configuration file is invalid or missing required settings
         FileNotFoundError: If configuration file doesn't exist
     """
-    config_path = Path(config_file)
+    settings = get_config(config_file)
+    return {name: getattr(settings, name) for name in _SETTING_NAMES}
+
+
+def get_config(config_file: Union[str, Path]) -> AutotuningConfig:
+    """
+    Load and validate configuration settings, as an AutotuningConfig.
     
-    if not config_path.exists():
-        raise FileNotFoundError(f"Configuration file not found: {config_file}")
+    The settings are parsed once per version of the file; see get_settings()
+    for the arguments.
     
-    # PYTHON 2 CONVERSION: Changed from ConfigParser.RawConfigParser to configparser.RawConfigParser
-    config = configparser.RawConfigParser()
+    Returns:
+        AutotuningConfig containing all configuration settings
+        
+    Raises:
+        ConfigurationError: If configuration file is invalid or missing required settings
+        FileNotFoundError: If configuration file doesn't exist
+    """
+    config_path = Path(config_file)
     
+    # The one stat both checks the file exists and identifies its version;
+    # the absolute path is worked out without touching the file system
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_file}")
+    abs_path = os.path.abspath(config_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    
+    # Reuse the settings of an earlier call while the file is unchanged.
+    # A copy is returned so callers cannot change the cached settings.
+    cached = _SETTINGS_CACHE.get(abs_path)
+    if cached is not None and cached[0] == stamp:
+        return copy.copy(cached[1])
+    
+    settings = _parse_settings(config_path, config_file)
+    _SETTINGS_CACHE[abs_path] = (stamp, settings)
+    return copy.copy(settings)
+
+
+def _read_config(config_path: Path, config_file: Union[str, Path]) -> _ConfigSections:
+    """Read and parse a configuration file, checking it has all the required sections."""
     try:
-        config.read(str(config_path))
-    except Exception as e:
+        # The file is read in one go and parsed from memory
+        text = config_path.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_file}")
+    except (OSError, UnicodeDecodeError) as e:
         raise ConfigurationError(f"Error reading configuration file '{config_file}': {e}")
     
+    config = _parse_ini(text.splitlines(), config_file)
+    
     # Validate required sections
     _validate_required_sections(config, config_file)
+    return config
+
+
+def _parse_settings(config_path: Path, config_file: Union[str, Path]) -> AutotuningConfig:
+    """Parse and validate a configuration file, as get_config()."""
+    settings = _config_from_sections(_read_config(config_path, config_file), config_file)
     
-    # Extract and validate variables
+    # The possible values are checked now, rather than when first used
+    settings.possValues
+    return settings
+
+
+def _config_from_sections(config: _ConfigSections, config_file: Union[str, Path]) -> AutotuningConfig:
+    """
+    Build the settings from a parsed configuration file. The helpers' results
+    go straight into the AutotuningConfig, without an intermediate dictionary;
+    the possible values are left to be read when first used.
+    """
     var_tree = _validate_variables_section(config, config_file)
     variables = get_variables(var_tree)
-    poss_values = _validate_and_extract_values(config, variables, config_file)
+    (compile, compile_mkStr), (test, test_mkStr), (clean, clean_mkStr) = _setup_commands(
+        config, config_file, variables
+    )
+    optimal, custom_fom, repeat, overall, aggregator = _setup_scoring(config, config_file)
+    output = _get_output_settings(config)
     
-    # Set up commands
-    compile_info, test_info, clean_info = _setup_commands(config, config_file)
+    return AutotuningConfig(
+        vartree=var_tree, compile=compile, compile_mkStr=compile_mkStr,
+        test=test, test_mkStr=test_mkStr, clean=clean, clean_mkStr=clean_mkStr,
+        optimal=optimal, custom_fom=custom_fom, repeat=repeat, overall=overall,
+        aggregator=aggregator, log=output.log, script=output.script,
+        importance=output.importance,
+        variables=variables, _raw=config, _config_file=config_file,
+    )
+
+
+def _snapshot_file(config_path: Path) -> Path:
+    """Path of the settings snapshot for a configuration file."""
+    from .result_cache import CACHE_DIR
     
-    # Set up scoring
-    optimal, custom_fom, repeat, overall, aggregator = _setup_scoring(config, config_file)
+    digest = hashlib.blake2b(str(config_path.resolve()).encode('utf-8'), digest_size=16).hexdigest()
+    return CACHE_DIR / f"cfg-{digest}.pkl"
+
+
+def get_cached_settings(config_file: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Load configuration settings, reusing the result of an earlier parse.
     
-    # Get output settings
-    log_file, script_file, importance_file = _get_output_settings(config)
-    
-    # Build settings dictionary for backward compatibility
-    # PYTHON 2 CONVERSION: Original returned plain dictionary
-    settings = {
-        'vartree': var_tree,
-        'possValues': poss_values,
-        'compile': compile_info[0],
-        'compile_mkStr': compile_info[1],
-        'test': test_info[0],
-        'test_mkStr': test_info[1],
-        'clean': clean_info[0],
-        'clean_mkStr': clean_info[1],
-        'optimal': optimal,
-        'custom_fom': custom_fom,
-        'repeat': repeat,
-        'overall': overall,
-        'aggregator': aggregator,
-        'log': log_file,
-        'script': script_file,
-        'importance': importance_file,
-    }
+    The parsed settings are saved as a pickle in the cache directory along
+    with the file's modification time and size. While these are unchanged,
+    later calls load the snapshot instead of parsing and validating the file
+    again. The command and aggregator functions are rebuilt on loading, as
+    they cannot be pickled. The tuner only uses this when run with --cache.
+    
+    Args:
+        config_file: Path to the configuration file
+        
+    Returns:
+        Dictionary containing all configuration settings, as get_settings()
+        
+    Raises:
+        ConfigurationError: If configuration file is invalid or missing required settings
+        FileNotFoundError: If configuration file doesn't exist
+    """
+    from .result_cache import write_file_atomic
+    
+    config_path = Path(config_file)
+    try:
+        stat = config_path.stat()
+        snapshot = _snapshot_file(config_path)
+    except OSError:
+        return get_settings(config_file)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    
+    try:
+        with open(snapshot, 'rb') as f:
+            saved_stamp, data = pickle.load(f)
+        if saved_stamp == stamp:
+            return _restore_callables(data)
+    except Exception:
+        # Missing, unreadable or outdated snapshot: parse the file instead
+        pass
+    
+    settings = get_settings(config_file)
+    
+    data = {name: value for name, value in settings.items() if name not in _CALLABLE_SETTINGS}
+    data['possValues'] = dict(data['possValues'])  # A mappingproxy cannot be pickled
+    try:
+        write_file_atomic(snapshot, pickle.dumps((stamp, data), pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass
     
     return settings
 
 
+def _restore_callables(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the function settings of a settings snapshot."""
+    settings = dict(data)
+    settings['possValues'] = MappingProxyType(
+        {var: tuple(values) for var, values in settings['possValues'].items()}
+    )
+    known_vars = tuple(get_variables(settings['vartree']))
+    for command_type in ('compile', 'test', 'clean'):
+        template = settings[command_type]
+        settings[f"{command_type}_mkStr"] = (
+            _create_command_function(template, command_type, known_vars) if template is not None else None
+        )
+    settings['aggregator'] = _AGGREGATORS[settings['overall']]
+    return settings
+
+
+def load_section(config_file: Union[str, Path],
+                 section: Literal['variables', 'values', 'testing', 'scoring', 'output']) -> Dict[str, str]:
+    """
+    Load the options of a single section of a configuration file.
+    
+    Only that section is parsed, and the file is read no further than its
+    end. No settings are checked, so this is for callers which need a
+    single option, e.g. the log file name.
+    
+    Args:
+        config_file: Path to the configuration file
+        section: Name of the section
+        
+    Returns:
+        The section's option values, by option name (in lower case)
+        
+    Raises:
+        ConfigurationError: If the file cannot be parsed or has no such section
+        FileNotFoundError: If configuration file doesn't exist
+    """
+    try:
+        with open(config_file, encoding='utf-8') as f:
+            config = _parse_ini(f, config_file, section)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_file}")
+    except (OSError, UnicodeDecodeError) as e:
+        raise ConfigurationError(f"Error reading configuration file '{config_file}': {e}")
+    
+    if section not in config:
+        raise ConfigurationError(
+            f"Configuration file '{config_file}' is missing required sections: {section}"
+        )
+    return config[section]
+
+
 def load_config_as_dataclass(config_file: Union[str, Path]) -> AutotuningConfig:
     """
     Load configuration as a modern dataclass (alternative to dictionary approach).
@@ -360,32 +789,21 @@ def load_config_as_dataclass(config_file: Union[str, Path]) -> AutotuningConfig:
     PYTHON 2 CONVERSION: This is a new function providing a more modern interface.
     Original only provided dictionary-based configuration.
     
+    Unlike get_config(), the possible values are only read from the file
+    (and checked) when the possValues attribute is first used.
+    
     Args:
         config_file: Path to the configuration file
         
     Returns:
         AutotuningConfig dataclass instance
+        
+    Raises:
+        ConfigurationError: If configuration file is invalid or missing required settings
+        FileNotFoundError: If configuration file doesn't exist
     """
-    settings = get_settings(config_file)
-    
-    return AutotuningConfig(
-        vartree=settings['vartree'],
-        possValues=settings['possValues'],
-        compile=settings['compile'],
-        compile_mkStr=settings['compile_mkStr'],
-        test=settings['test'],
-        test_mkStr=settings['test_mkStr'],
-        clean=settings['clean'],
-        clean_mkStr=settings['clean_mkStr'],
-        optimal=settings['optimal'],
-        custom_fom=settings['custom_fom'],
-        repeat=settings['repeat'],
-        overall=settings['overall'],
-        aggregator=settings['aggregator'],
-        log=settings['log'],
-        script=settings['script'],
-        importance=settings['importance'],
-    )
+    config_path = Path(config_file)
+    return _config_from_sections(_read_config(config_path, config_file), config_file)
 
 
 if __name__ == "__main__":
@@ -5,11 +5,19 @@ vartree.py
 
 Defines the VarTree class.
 Provides a parser, vt_parse, for converting strings to instances of VarTree.
+
+PYTHON 2 TO 3 CONVERSION NOTES:
+- Converted print statements to print() functions
+- Changed exit() to sys.exit()
+- Changed "except E, e" to "except E as e"
+- map() and filter() results are turned into lists where lists are needed
+- Updated imports to relative imports
 """
 
+import sys
 
 # VarTree parser generated with wisent
-from vartree_parser import Parser
+from .vartree_parser import Parser
 # Built in regex based lexer
 from re import Scanner
 
@@ -99,10 +107,10 @@ def vt_parse(str):
     # check the entire string was eaten.
     
     if(tokens[1] != ''):
-        print "Could not read the variable tree given:"
-        print str
+        print("Could not read the variable tree given:")
+        print(str)
         #print "could not lex: " + tokens[1].__str__()
-        exit()
+        sys.exit()
     
     
     tokens = tokens[0] # Just the list of tokens.
@@ -110,10 +118,10 @@ def vt_parse(str):
     p = Parser()
     try:
         tree = p.parse(tokens)
-    except p.ParseErrors, e:
-        print "Could not read the variable tree given:"
-        print str
-        exit()
+    except p.ParseErrors as e:
+        print("Could not read the variable tree given:")
+        print(str)
+        sys.exit()
     
     
     
@@ -133,11 +141,9 @@ def vt_parse(str):
         
         if is_vt(tree):
             
-            vars = filter(is_var, tree[1:])
-            vars = map(lambda t: t[1], vars)
+            vars = [t[1] for t in tree[1:] if is_var(t)]
             
-            children = filter(is_vt, tree[1:])
-            children = map(pt_to_vt, children)
+            children = [pt_to_vt(t) for t in tree[1:] if is_vt(t)]
             
             return VarTree(vars,children)
             
@@ -153,10 +159,10 @@ def vt_parse(str):
     
     # Check nothing went wrong
     if vt_parse.memory[str] is None:
-        print "Could not read the variable tree given:"
-        print str
+        print("Could not read the variable tree given:")
+        print(str)
         #print "error in conversion from parse tree to vartree"
-        exit()
+        sys.exit()
     
     
     # Finally, check there is no repettition of variables in the VarTree.
@@ -165,9 +171,9 @@ def vt_parse(str):
         return len(set(xs)) != len(xs)
     
     if hasDups(vt_parse.memory[str].flatten()):
-        print "A variable was repeated in the variable tree."
-        print "Variables can only appear once."
-        exit()
+        print("A variable was repeated in the variable tree.")
+        print("Variables can only appear once.")
+        sys.exit()
     
     
     return vt_parse.memory[str]
@@ -229,7 +235,7 @@ def print_vt(vt):
     if vt.subtrees: # Recursive case
         
         # Recursively get subtrees
-        subtrees = map(print_vt, vt.subtrees)
+        subtrees = [print_vt(st) for st in vt.subtrees]
         
         # find the max height of a subtree
         subtreeheight = len(max(subtrees, key=len))
@@ -252,7 +258,7 @@ def print_vt(vt):
             
             return st3
         
-        subtrees = map(padout, subtrees)
+        subtrees = [padout(st) for st in subtrees]
         
         
         # Add connecting bars to the top of each subtree
@@ -411,4 +417,4 @@ def chars_to_use():
 
 
 if __name__ == "__main__":
-    print __doc__
+    print(__doc__)